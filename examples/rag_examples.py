@@ -22,7 +22,7 @@ def example_basic_rag_campaign():
     from core.agents import (
         background_story_with_rag,
         generate_game_plan_with_rag,
-        generate_quests_for_act_with_rag,
+        generate_quests_for_acts_with_rag,
     )
     from core.model import initialize_llm
     from core.state import GameStatus
@@ -40,9 +40,8 @@ def example_basic_rag_campaign():
     background_story_with_rag(model, state, rag, "campaign-setting")
     generate_game_plan_with_rag(model, state, rag, "campaign-rules")
 
-    # Generate quests for each act
-    for i in range(len(state["acts"])):
-        generate_quests_for_act_with_rag(model, state, i, rag, "campaign-rules")
+    # Generate quests for all acts (batched into as few LLM calls as possible)
+    generate_quests_for_acts_with_rag(model, state, None, rag, "campaign-rules")
 
     # Print results
     print(f"Campaign: {state['title']}")
@@ -168,7 +167,7 @@ def example_manage_namespaces():
 
 def example_standard_campaign():
     """Generate a campaign without RAG (original functionality)."""
-    from core.agents import background_story, generate_game_plan, generate_quests_for_act
+    from core.agents import background_story, generate_all_quests, generate_game_plan
     from core.model import initialize_llm
     from core.state import GameStatus
 
@@ -180,9 +179,8 @@ def example_standard_campaign():
     background_story(model, state)
     generate_game_plan(model, state)
 
-    # Generate quests for each act
-    for i in range(len(state["acts"])):
-        generate_quests_for_act(model, state, i)
+    # Generate quests for all acts concurrently
+    generate_all_quests(model, state)
 
     # Print results
     print(f"Campaign: {state['title']}")
@@ -198,7 +196,7 @@ def example_standard_campaign():
 def example_selective_rag():
     """Use RAG for some steps, regular generation for others."""
     from core.agents import generate_game_plan  # No RAG
-    from core.agents import background_story_with_rag, generate_quests_for_act_with_rag
+    from core.agents import background_story_with_rag, generate_quests_for_acts_with_rag
     from core.model import initialize_llm
     from core.state import GameStatus
     from services.rag import get_rag_service
@@ -215,8 +213,7 @@ def example_selective_rag():
     generate_game_plan(model, state)
 
     # Generate quests with RAG (grounded in rules)
-    for i in range(len(state["acts"])):
-        generate_quests_for_act_with_rag(model, state, i, rag, "campaign-rules")
+    generate_quests_for_acts_with_rag(model, state, None, rag, "campaign-rules")
 
 
 # =============================================================================
@@ -12,12 +12,12 @@ from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user
 from api.models import CampaignRequest, CampaignResponse, SaveCampaignRequest, StoryResponse
-from core.agents import background_story, generate_game_plan, generate_quests_for_act
+from core.agents import background_story, generate_game_plan, generate_game_plan_and_quests
 from core.model import initialize_llm
 from core.state import GameStatus
 from database.models import Campaign, User, get_db
 from services.cache import cache_response, get_cached_response
-from services.pinecone import pinecone_service
+from services.pinecone import get_pinecone_service
 
 router = APIRouter(prefix="/api", tags=["campaigns"])
 
@@ -68,12 +68,8 @@ async def generate_campaign(
         # Generate background story
         background_story(model, state)
 
-        # Generate game plan (acts)
-        generate_game_plan(model, state)
-
-        # Generate quests for each act
-        for i in range(len(state["acts"])):
-            generate_quests_for_act(model, state, i)
+        # Generate game plan (acts), starting quest generation for each act as it streams in
+        generate_game_plan_and_quests(model, state)
 
         # Calculate totals
         total_quests = sum(len(quests) for quests in state.get("quests", {}).values())
@@ -148,7 +144,7 @@ async def generate_campaign(
         # Optionally save to Pinecone if requested
         if request.save_to_pinecone:
             try:
-                pinecone_id = pinecone_service.store_campaign(
+                pinecone_id = await get_pinecone_service().astore_campaign(
                     campaign_data=campaign_response.dict(),
                     user_id=request.user_id or str(current_user.id),
                     tags=request.tags or [],
@@ -343,7 +339,7 @@ async def save_campaign(
         # Optionally save to Pinecone if requested
         if request.user_id or request.tags:
             try:
-                pinecone_id = pinecone_service.store_campaign(
+                pinecone_id = await get_pinecone_service().astore_campaign(
                     campaign_data=request.campaign_data.dict(),
                     user_id=request.user_id or str(current_user.id),
                     tags=request.tags or [],
@@ -447,7 +443,7 @@ async def get_campaign(campaign_id: str):
     This endpoint fetches campaign metadata from Pinecone
     """
     try:
-        campaign = pinecone_service.get_campaign_by_id(campaign_id)
+        campaign = get_pinecone_service().get_campaign_by_id(campaign_id)
 
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -469,7 +465,7 @@ async def delete_campaign(campaign_id: str):
     This endpoint removes campaign data from vector storage
     """
     try:
-        success = pinecone_service.delete_campaign(campaign_id)
+        success = get_pinecone_service().delete_campaign(campaign_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Campaign not found")
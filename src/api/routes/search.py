@@ -7,7 +7,7 @@ import traceback
 from fastapi import APIRouter, HTTPException
 
 from api.models import SearchRequest, SearchResponse
-from services.pinecone import pinecone_service
+from services.pinecone import get_pinecone_service
 
 router = APIRouter(prefix="/api", tags=["search"])
 
@@ -20,7 +20,7 @@ async def search_campaigns(request: SearchRequest):
     This endpoint allows finding campaigns based on semantic similarity to the query
     """
     try:
-        results = pinecone_service.search_campaigns(
+        results = get_pinecone_service().search_campaigns(
             query=request.query, user_id=request.user_id, limit=request.limit
         )
 
@@ -39,7 +39,7 @@ async def search_quests(request: SearchRequest):
     This endpoint allows finding quests based on semantic similarity to the query
     """
     try:
-        results = pinecone_service.search_quests(query=request.query, limit=request.limit)
+        results = get_pinecone_service().search_quests(query=request.query, limit=request.limit)
 
         return SearchResponse(results=results, total=len(results))
     except Exception as e:
@@ -6,10 +6,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database.models import init_db
+from services.pinecone import preload_embedding_encoder
 
 # Initialize database on startup
 init_db()
 
+# Load the embedding tokenizer in the background, so the first campaign store does not wait
+# for its download
+preload_embedding_encoder()
+
 app = FastAPI(
     title="AgenticTableTop API",
     description="AI-powered D&D Campaign Generator API",
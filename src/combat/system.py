@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
-from tools.utils import dice_roll
+from tools.utils import dice_roll, dice_roll_total, parse_dice
 
 
 class CombatStatus(Enum):
@@ -225,19 +225,13 @@ def roll_damage(damage_dice: str, damage_bonus: int = 0, is_critical: bool = Fal
     if "d" not in damage_dice:
         return int(damage_dice) + damage_bonus
 
-    num_dice, dice_size = damage_dice.split("d")
-    num_dice = int(num_dice)
-    dice_size = int(dice_size)
+    num_dice, dice_size = parse_dice(damage_dice)
 
     # Double dice for critical hits
     if is_critical:
         num_dice *= 2
 
-    total_damage = 0
-    for _ in range(num_dice):
-        total_damage += dice_roll(dice_size)
-
-    return total_damage + damage_bonus
+    return dice_roll_total(dice_size, num_dice) + damage_bonus
 
 
 def calculate_armor_class(base_ac: int, dexterity_modifier: int, armor_type: str = "none") -> int:
@@ -3,25 +3,39 @@ Core functionality for campaign generation
 """
 
 from core.agents import (
+    acollect_quest_batch,
+    agenerate_quests_for_acts,
     background_story,
     background_story_with_rag,
+    collect_quest_batch,
+    generate_all_quests,
     generate_game_plan,
+    generate_game_plan_and_quests,
     generate_game_plan_with_rag,
     generate_monsters_for_combat_quests,
     generate_monsters_for_quest,
     generate_quests_for_act,
     generate_quests_for_act_with_rag,
+    generate_quests_for_acts_with_rag,
+    submit_quest_batch,
 )
 from core.model import initialize_llm
 from core.state import GameStatus, Monster, PlayerCharacter
 
 __all__ = [
+    "agenerate_quests_for_acts",
     "background_story",
     "background_story_with_rag",
     "generate_game_plan",
+    "generate_game_plan_and_quests",
     "generate_game_plan_with_rag",
     "generate_quests_for_act",
     "generate_quests_for_act_with_rag",
+    "generate_quests_for_acts_with_rag",
+    "generate_all_quests",
+    "submit_quest_batch",
+    "collect_quest_batch",
+    "acollect_quest_batch",
     "generate_monsters_for_combat_quests",
     "generate_monsters_for_quest",
     "initialize_llm",
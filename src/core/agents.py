@@ -1,25 +1,31 @@
 # Load config.yaml from project root (one level up from src/)
-import re
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 
+from core.model import GEMINI_MAX_TOKENS, MODEL, MODEL_TYPE, OPENAI_MAX_TOKENS, TEMPERATURE
 from core.prompt import (
-    game_plan_prompt,
-    monster_generation_prompt,
-    quest_generation_prompt,
-    storyteller_prompt,
+    render_game_plan,
+    render_monster_generation,
+    render_quest_generation,
+    render_storyteller,
 )
 from core.rag_prompts import (
-    rag_game_plan_prompt,
-    rag_quest_generation_prompt,
-    rag_storyteller_prompt,
+    render_rag_game_plan,
+    render_rag_quest_generation,
+    render_rag_storyteller,
 )
+from services.batch import areap_batch, reap_batch, submit_batch
 from services.trajectory import TrajectoryLogger
 from tools.utils import (
+    expand_act,
+    get_cached_tokens,
     get_total_tokens,
+    iter_json_array_items,
     parse_acts_result,
     parse_monster_result,
     parse_quests_result,
@@ -34,6 +40,15 @@ background_story_outline = config["BackgroundStoryOutline"]
 rag_config = config.get("RAG", {})
 rag_enabled = rag_config.get("enabled", False)
 
+# Maximum number of acts whose quests are requested in a single RAG quest-generation call
+MAX_QUESTS_PER_CALL = 6
+
+# Maximum number of concurrent quest-generation requests (raise on higher rate-limit tiers)
+QUEST_GENERATION_WORKERS = 8
+
+# Times a response whose acts or quests failed schema validation is sent back for correction
+VALIDATION_RETRIES = 1
+
 
 def background_story(model, state):
     print("==================Generating background story==================")
@@ -42,10 +57,10 @@ def background_story(model, state):
     user_outline = background_story_outline
 
     # Update prompt
-    prompt = re.sub(r"<outline>", user_outline, storyteller_prompt)
+    messages = render_storyteller(user_outline)
 
     # Make LLM request
-    response = model.invoke(prompt)
+    response = model.invoke(messages)
     content = response.content
 
     # Parse response
@@ -63,11 +78,54 @@ def background_story(model, state):
     print(state["background_story"])
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
     )
     return True
 
 
+def _validation_feedback(errors):
+    """Build the follow-up message asking the LLM to fix the items that failed validation."""
+    problems = "\n".join(f"- {error}" for error in errors)
+    return (
+        "Some items in your previous response did not match the required schema and were "
+        f"dropped:\n{problems}\n\n"
+        "Return the complete corrected JSON object in the same format. No markdown, no code "
+        "blocks, no explanations - just the raw JSON."
+    )
+
+
+def _invoke_with_validation_retry(model, messages, parse):
+    """
+    Invoke the model and parse its response with parse(content, errors).
+
+    If some items fail schema validation, the errors are sent back to the model along with
+    its response, up to VALIDATION_RETRIES times. The corrected response is used unless it
+    yields fewer items than the one before.
+
+    Returns:
+        tuple: (response, items) of the attempt that was kept
+    """
+    response = model.invoke(messages)
+    errors = []
+    items = parse(response.content, errors)
+    for _ in range(VALIDATION_RETRIES):
+        if not errors:
+            break
+        print(f"Asking the model to fix {len(errors)} validation error(s)...")
+        retry_messages = [
+            *messages,
+            {"role": "assistant", "content": _chunk_text(response)},
+            {"role": "user", "content": _validation_feedback(errors)},
+        ]
+        retry_response = model.invoke(retry_messages)
+        errors = []
+        retry_items = parse(retry_response.content, errors)
+        if len(retry_items) < len(items):
+            break
+        response, items = retry_response, retry_items
+    return response, items
+
+
 def generate_game_plan(model, state):
     print("==================Generating game plan==================")
     start_time = time.time()
@@ -76,21 +134,17 @@ def generate_game_plan(model, state):
     story_title = state["title"]
     story_background = state["background_story"]
     # Update prompt
-    prompt = re.sub(r"<title>", story_title, game_plan_prompt)
-    prompt = re.sub(r"<background>", story_background, prompt)
-
-    response = model.invoke(prompt)
-    content = response.content
+    messages = render_game_plan(story_title, story_background)
 
-    # Parse the acts from the response
-    acts = parse_acts_result(content)
+    # Request and parse the acts, asking for a correction if some fail validation
+    response, acts = _invoke_with_validation_retry(model, messages, parse_acts_result)
     state["acts"] = acts
     for i in range(len(state["acts"])):
         print(state["acts"][i]["act_title"])
         print(state["acts"][i]["act_summary"])
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
     )
     return True
 
@@ -112,7 +166,127 @@ def generate_quests_for_act(model, state, act_index):
     )
     start_time = time.time()
 
-    # Get act data
+    act_title, messages = _build_quest_messages(state, act_index)
+
+    # Make LLM request, asking for a correction if some quests fail validation
+    response, quests = _invoke_with_validation_retry(model, messages, parse_quests_result)
+
+    _record_quests_for_act(state, act_title, response, start_time, quests)
+    return True
+
+
+async def agenerate_quests_for_acts(
+    model, state, act_indices=None, max_concurrency=QUEST_GENERATION_WORKERS
+):
+    """
+    Generate quests for several acts concurrently.
+
+    Quest generation for different acts is independent and bound by LLM latency, so the
+    requests are issued together with model.ainvoke, with at most max_concurrency in flight
+    to respect provider rate limits.
+
+    Args:
+        model: The LLM model instance
+        state: The game state containing acts
+        act_indices: Indices of the acts to generate quests for (defaults to all acts)
+        max_concurrency: Maximum number of concurrent LLM requests
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if act_indices is None:
+        act_indices = range(len(state["acts"]))
+
+    # Initialize quests dict up front so concurrent tasks don't race on it
+    if "quests" not in state:
+        state["quests"] = {}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate_one(act_index):
+        async with semaphore:
+            print(
+                f"==================Generating quests for {state['acts'][act_index]['act_title']}=================="
+            )
+            start_time = time.time()
+            act_title, messages = _build_quest_messages(state, act_index)
+            response = await model.ainvoke(messages)
+        _record_quests_for_act(state, act_title, response, start_time)
+
+    await asyncio.gather(*(generate_one(act_index) for act_index in act_indices))
+    return True
+
+
+def generate_all_quests(model, state, act_indices=None, max_concurrency=QUEST_GENERATION_WORKERS):
+    """
+    Generate quests for several acts concurrently from synchronous code.
+
+    See agenerate_quests_for_acts; this must not be called from a running event loop.
+    """
+    return asyncio.run(agenerate_quests_for_acts(model, state, act_indices, max_concurrency))
+
+
+def submit_quest_batch(states):
+    """
+    Submit quest generation for every act of several campaigns as one offline batch job.
+
+    The job runs on the same provider and model as the live requests (core.model), and
+    raises ValueError if that provider has no batch backend.
+
+    Args:
+        states: Mapping of a campaign key to its game state (with acts generated)
+
+    Returns:
+        str: The batch id, to be passed to collect_quest_batch or acollect_quest_batch
+    """
+    requests = {}
+    for campaign_key, state in states.items():
+        for act_index in range(len(state["acts"])):
+            _, messages = _build_quest_messages(state, act_index)
+            requests[f"{campaign_key}::{act_index}"] = messages
+    max_tokens = OPENAI_MAX_TOKENS if MODEL_TYPE == "OPENAI" else GEMINI_MAX_TOKENS
+    return submit_batch(requests, MODEL_TYPE, MODEL, max_tokens, TEMPERATURE)
+
+
+def collect_quest_batch(states, batch_id):
+    """
+    Wait for a quest batch job and store the generated quests in each campaign's state.
+
+    This blocks until the job finishes; use acollect_quest_batch from async code.
+
+    Args:
+        states: The same mapping of campaign key to game state passed to submit_quest_batch
+        batch_id: Id returned by submit_quest_batch
+
+    Returns:
+        bool: True if every act received quests, False otherwise
+    """
+    return _store_batch_quests(states, reap_batch(batch_id, MODEL_TYPE))
+
+
+async def acollect_quest_batch(states, batch_id):
+    """Async variant of collect_quest_batch that waits without blocking the event loop."""
+    return _store_batch_quests(states, await areap_batch(batch_id, MODEL_TYPE))
+
+
+def _store_batch_quests(states, results):
+    """Store the quests in a finished batch's results; True if every act received quests."""
+    complete = True
+    for campaign_key, state in states.items():
+        if "quests" not in state:
+            state["quests"] = {}
+        for act_index, act in enumerate(state["acts"]):
+            content = results.get(f"{campaign_key}::{act_index}")
+            if content is None:
+                print(f"No batch result for {campaign_key} act {act_index + 1}")
+                complete = False
+                continue
+            state["quests"][act["act_title"]] = parse_quests_result(content)
+    return complete
+
+
+def _build_quest_messages(state, act_index):
+    """Build the quest-generation messages for an act and return (act_title, messages)."""
     act = state["acts"][act_index]
     act_title = act["act_title"]
     act_summary = act["act_summary"]
@@ -121,21 +295,17 @@ def generate_quests_for_act(model, state, act_index):
     key_locations = ", ".join(act.get("key_locations", []))
     mechanics = ", ".join(act.get("mechanics_or_features_introduced", []))
 
-    # Build prompt
-    prompt = quest_generation_prompt
-    prompt = re.sub(r"<act_title>", act_title, prompt)
-    prompt = re.sub(r"<act_summary>", act_summary, prompt)
-    prompt = re.sub(r"<narrative_goal>", narrative_goal, prompt)
-    prompt = re.sub(r"<primary_conflict>", primary_conflict, prompt)
-    prompt = re.sub(r"<key_locations>", key_locations, prompt)
-    prompt = re.sub(r"<mechanics>", mechanics, prompt)
+    messages = render_quest_generation(
+        act_title, act_summary, narrative_goal, primary_conflict, key_locations, mechanics
+    )
+    return act_title, messages
 
-    # Make LLM request
-    response = model.invoke(prompt)
-    content = response.content
 
+def _record_quests_for_act(state, act_title, response, start_time, quests=None):
+    """Parse (unless already parsed), store and print the quests in an LLM response for an act."""
     # Parse the quests from the response
-    quests = parse_quests_result(content)
+    if quests is None:
+        quests = parse_quests_result(response.content)
 
     # Initialize quests dict if it doesn't exist
     if "quests" not in state:
@@ -161,7 +331,85 @@ def generate_quests_for_act(model, state, act_index):
 
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
+    )
+
+
+def _chunk_text(chunk):
+    """Return the text of a streamed message chunk."""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    # Some providers stream a list of content parts
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+    )
+
+
+def generate_game_plan_and_quests(model, state, max_workers=QUEST_GENERATION_WORKERS):
+    """
+    Generate the game plan and the quests for every act, overlapping the two stages.
+
+    The game plan is streamed from the LLM and each act is handed to a quest-generation
+    worker as soon as its JSON object is complete, so quest generation for the first acts
+    runs while the remaining acts are still being decoded.
+
+    Args:
+        model: The LLM model instance
+        state: The game state containing title and background
+        max_workers: Maximum number of concurrent quest-generation requests
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("==================Generating game plan (streaming)==================")
+    start_time = time.time()
+
+    messages = render_game_plan(state["title"], state["background_story"])
+
+    state["acts"] = []
+    state["quests"] = {}
+    response = None
+    chunks = []
+
+    def stream_text():
+        nonlocal response
+        for chunk in model.stream(messages):
+            response = chunk if response is None else response + chunk
+            text = _chunk_text(chunk)
+            chunks.append(text)
+            yield text
+
+    stream = stream_text()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for item in iter_json_array_items(stream, "acts"):
+            act = expand_act(item)
+            if act is None:
+                continue
+            state["acts"].append(act)
+            print(act.get("act_title", ""))
+            print(act.get("act_summary", ""))
+            futures.append(
+                executor.submit(generate_quests_for_act, model, state, len(state["acts"]) - 1)
+            )
+
+        # Drain the rest of the stream (the scanner stops at the end of the acts array)
+        for _ in stream:
+            pass
+
+        # Fall back to parsing the full response if no act could be parsed while streaming
+        if not state["acts"]:
+            state["acts"] = parse_acts_result("".join(chunks))
+            for act_index in range(len(state["acts"])):
+                futures.append(executor.submit(generate_quests_for_act, model, state, act_index))
+
+        for future in futures:
+            future.result()
+
+    end_time = time.time()
+    print(
+        f"Time taken for game plan and quests: {end_time - start_time} seconds, and game plan tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
     )
     return True
 
@@ -208,12 +456,10 @@ def background_story_with_rag(model, state, rag_service=None, knowledge_namespac
         knowledge_context = ""
 
     # Update prompt with knowledge
-    prompt = rag_storyteller_prompt
-    prompt = re.sub(r"{{user_outline}}", user_outline, prompt)
-    prompt = re.sub(r"{{knowledge_context}}", knowledge_context, prompt)
+    messages = render_rag_storyteller(knowledge_context, user_outline)
 
     # Make LLM request
-    response = model.invoke(prompt)
+    response = model.invoke(messages)
     content = response.content
 
     # Parse response
@@ -230,7 +476,7 @@ def background_story_with_rag(model, state, rag_service=None, knowledge_namespac
 
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
     )
     return True
 
@@ -273,16 +519,10 @@ def generate_game_plan_with_rag(model, state, rag_service=None, knowledge_namesp
         knowledge_context = ""
 
     # Update prompt with knowledge
-    prompt = rag_game_plan_prompt
-    prompt = re.sub(r"{{title}}", story_title, prompt)
-    prompt = re.sub(r"{{background}}", story_background, prompt)
-    prompt = re.sub(r"{{knowledge_context}}", knowledge_context, prompt)
-
-    response = model.invoke(prompt)
-    content = response.content
+    messages = render_rag_game_plan(knowledge_context, story_title, story_background)
 
-    # Parse the acts from the response
-    acts = parse_acts_result(content)
+    # Request and parse the acts, asking for a correction if some fail validation
+    response, acts = _invoke_with_validation_retry(model, messages, parse_acts_result)
     state["acts"] = acts
     state["rag_augmented"] = True
 
@@ -292,7 +532,7 @@ def generate_game_plan_with_rag(model, state, rag_service=None, knowledge_namesp
 
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
     )
     return True
 
@@ -310,28 +550,95 @@ def generate_quests_for_act_with_rag(
         rag_service: Optional RAGService instance
         knowledge_namespace: Optional namespace to retrieve knowledge from
     """
+    return generate_quests_for_acts_with_rag(
+        model, state, [act_index], rag_service, knowledge_namespace
+    )
+
+
+def generate_quests_for_acts_with_rag(
+    model,
+    state,
+    act_indices=None,
+    rag_service=None,
+    knowledge_namespace=None,
+    max_quests_per_call=MAX_QUESTS_PER_CALL,
+):
+    """
+    Generate quests for several acts, augmented with knowledge from vector database.
+
+    Acts are sent to the LLM in groups of up to max_quests_per_call, so the instructions,
+    schema and retrieved context are paid for once per group instead of once per act.
+    Acts missing from a grouped response are re-requested individually.
+
+    Args:
+        model: The LLM model instance
+        state: The game state containing acts
+        act_indices: Indices of the acts to generate quests for (defaults to all acts)
+        rag_service: Optional RAGService instance
+        knowledge_namespace: Optional namespace to retrieve knowledge from
+        max_quests_per_call: Maximum number of acts to batch into a single LLM call
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if act_indices is None:
+        act_indices = range(len(state["acts"]))
+    act_indices = list(act_indices)
+
     if not rag_enabled or rag_service is None:
         print("RAG not enabled. Falling back to standard generation.")
-        return generate_quests_for_act(model, state, act_index)
-
-    print(
-        f"==================Generating quests (RAG-Augmented) for {state['acts'][act_index]['act_title']}=================="
-    )
-    start_time = time.time()
+        for act_index in act_indices:
+            generate_quests_for_act(model, state, act_index)
+        return True
 
-    # Get act data
-    act = state["acts"][act_index]
-    act_title = act["act_title"]
-    act_summary = act["act_summary"]
     namespace = knowledge_namespace or rag_config.get("knowledge_base", {}).get(
         "rules_namespace", "campaign-rules"
     )
 
+    # Initialize quests dict if it doesn't exist
+    if "quests" not in state:
+        state["quests"] = {}
+
+    missing = []
+    for start in range(0, len(act_indices), max_quests_per_call):
+        batch = act_indices[start : start + max_quests_per_call]
+        quests_by_act = _generate_rag_quest_batch(model, state, batch, rag_service, namespace)
+        for act_index in batch:
+            if act_index in quests_by_act:
+                _store_act_quests(state, act_index, quests_by_act[act_index])
+            elif len(batch) > 1:
+                missing.append(act_index)
+            else:
+                _store_act_quests(state, act_index, [])
+
+    # Re-dispatch acts the batched responses skipped, one at a time
+    for act_index in missing:
+        print(f"No quest returned for act {act_index + 1}, retrying individually...")
+        quests_by_act = _generate_rag_quest_batch(model, state, [act_index], rag_service, namespace)
+        _store_act_quests(state, act_index, quests_by_act.get(act_index, []))
+
+    state["rag_augmented"] = True
+    return True
+
+
+def _generate_rag_quest_batch(model, state, act_indices, rag_service, namespace):
+    """
+    Make one RAG quest-generation call covering the given acts.
+
+    Returns:
+        dict: Mapping of act index to the list of quests returned for that act
+    """
+    acts = [state["acts"][act_index] for act_index in act_indices]
+    act_titles = ", ".join(act["act_title"] for act in acts)
+    print(f"==================Generating quests (RAG-Augmented) for {act_titles}==================")
+    start_time = time.time()
+
     # Retrieve relevant knowledge for quest generation
     print(f"Retrieving context from namespace '{namespace}'...")
     try:
         knowledge_context = rag_service.retrieve_context(
-            query=f"Quest design for act: {act_title}. {act_summary}",
+            query="Quest design for acts: "
+            + " ".join(f"{act['act_title']}. {act['act_summary']}" for act in acts),
             namespace=namespace,
             top_k=rag_config.get("retrieval", {}).get("top_k", 3),
             limit=rag_config.get("retrieval", {}).get("max_context_chars", 8000),
@@ -341,28 +648,46 @@ def generate_quests_for_act_with_rag(
         knowledge_context = ""
 
     # Build prompt
-    prompt = rag_quest_generation_prompt
-    prompt = re.sub(r"{{act_title}}", act_title, prompt)
-    prompt = re.sub(r"{{act_summary}}", act_summary, prompt)
-    prompt = re.sub(r"{{knowledge_context}}", knowledge_context, prompt)
-
-    # Make LLM request
-    response = model.invoke(prompt)
-    content = response.content
+    act_lines = []
+    for act_index, act in zip(act_indices, acts):
+        act_lines.append(f"**Act {act_index + 1}**: {act['act_title']}")
+        act_lines.append(f"  - Summary: {act['act_summary']}")
+        # Only RAG game plans have milestones; skip the line rather than send it empty
+        milestones = act.get("key_milestones")
+        if milestones:
+            act_lines.append(f"  - Key Milestones: {', '.join(milestones)}")
+    messages = render_rag_quest_generation(knowledge_context, "\n".join(act_lines))
+
+    # Make LLM request, asking for a correction if some quests fail validation
+    response, quests = _invoke_with_validation_retry(model, messages, parse_quests_result)
+
+    # Map the quests back to acts by their "act" number. The Quest schema already reads
+    # "Act 2" or "II" as 2; a quest without a readable number can only be placed when the
+    # call covered a single act
+    quests_by_act = {}
+    for quest in quests:
+        act_number = quest.get("act")
+        if act_number is not None:
+            act_index = act_number - 1
+        else:
+            act_index = act_indices[0] if len(act_indices) == 1 else None
+        if act_index in act_indices:
+            quests_by_act.setdefault(act_index, []).append(quest)
 
-    # Parse the quests from the response
-    quests = parse_quests_result(content)
+    end_time = time.time()
+    print(
+        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)} (cached prompt tokens: {get_cached_tokens(response)})"
+    )
+    return quests_by_act
 
-    # Initialize quests dict if it doesn't exist
-    if "quests" not in state:
-        state["quests"] = {}
 
-    # Store quests for this act
+def _store_act_quests(state, act_index, quests):
+    """Store and print the quests generated for a single act."""
+    act_title = state["acts"][act_index]["act_title"]
     state["quests"][act_title] = quests
-    state["rag_augmented"] = True
 
     # Print quest summaries
-    print(f"\nGenerated {len(quests)} quests:")
+    print(f"\nGenerated {len(quests)} quests for {act_title}:")
     for i, quest in enumerate(quests, 1):
         print(f"\n  Quest {i}: {quest.get('quest_title', 'Unnamed Quest')}")
         if "objectives" in quest:
@@ -370,12 +695,6 @@ def generate_quests_for_act_with_rag(
             for j, obj in enumerate(quest["objectives"], 1):
                 print(f"      {j}. {obj}")
 
-    end_time = time.time()
-    print(
-        f"Time taken for this request: {end_time - start_time} seconds, and tokens used: {get_total_tokens(response)}"
-    )
-    return True
-
 
 def generate_monsters_for_combat_quests(
     model, state, trajectory_logger: Optional[TrajectoryLogger] = None
@@ -398,14 +717,15 @@ def generate_monsters_for_combat_quests(
     Returns:
         bool: True if successful, False otherwise
     """
+    # Initialize trajectory logger if not provided, and close it (thread and file) when done
+    if trajectory_logger is None:
+        with TrajectoryLogger() as trajectory_logger:
+            print(f"Trajectory log: {trajectory_logger.get_log_path()}")
+            return generate_monsters_for_combat_quests(model, state, trajectory_logger)
+
     print("==================Generating monsters for combat quests==================")
     start_time = time.time()
 
-    # Initialize trajectory logger if not provided
-    if trajectory_logger is None:
-        trajectory_logger = TrajectoryLogger()
-        print(f"Trajectory log: {trajectory_logger.get_log_path()}")
-
     # Initialize monsters dict if it doesn't exist
     if "monsters" not in state:
         state["monsters"] = {}
@@ -618,23 +938,20 @@ def generate_monsters_for_quest(
     objectives = ", ".join(quest.get("objectives", []))
 
     # Build prompt
-    prompt = monster_generation_prompt
-    prompt = re.sub(r"<quest_name>", quest_name, prompt)
-    prompt = re.sub(r"<quest_description>", quest_description, prompt)
-    prompt = re.sub(r"<quest_type>", quest_type, prompt)
-    prompt = re.sub(r"<difficulty>", difficulty, prompt)
-    prompt = re.sub(r"<locations>", locations, prompt)
-    prompt = re.sub(r"<objectives>", objectives, prompt)
-
-    # Add quest context if provided
+    messages = render_monster_generation(
+        quest_name, quest_description, quest_type, difficulty, locations, objectives
+    )
+
+    # Add quest context if provided (to the user message, so the system prefix stays cacheable)
     if quest_context:
-        prompt += f"\n\n# Additional Context\n{quest_context}"
+        messages[-1]["content"] += f"\n\n# Additional Context\n{quest_context}"
 
     # Make LLM request with error handling
     try:
         print(f"    Making LLM request for {quest_name}...")
-        print(f"    Prompt length: {len(prompt)} characters")
-        response = model.invoke(prompt)
+        prompt_length = sum(len(message["content"]) for message in messages)
+        print(f"    Prompt length: {prompt_length} characters")
+        response = model.invoke(messages)
         print("    ✓ LLM request completed")
     except Exception as e:
         print(f"    ✗ LLM request failed: {str(e)}")
@@ -714,7 +1031,7 @@ def generate_monsters_for_quest(
 
     end_time = time.time()
     print(
-        f"Time taken for this request: {end_time - start_time:.2f} seconds, and tokens used: {tokens_used}"
+        f"Time taken for this request: {end_time - start_time:.2f} seconds, and tokens used: {tokens_used} (cached prompt tokens: {get_cached_tokens(response)})"
     )
 
     if return_response:
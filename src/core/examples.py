@@ -0,0 +1,107 @@
+"""
+Example blocks shared by the system prompts.
+
+The examples are filled into the prompt templates once at import, so the standard and RAG
+variants of a prompt show the same example and cannot drift apart.
+"""
+
+import json
+from typing import Any, Dict
+
+__all__ = [
+    "GAME_PLAN_EXAMPLE",
+    "QUEST_EXAMPLE",
+    "RAG_STORYTELLER_EXAMPLE",
+    "STORYTELLER_EXAMPLE",
+    "STORYTELLER_EXAMPLE_FIELDS",
+    "STORYTELLER_EXAMPLE_OUTLINE",
+]
+
+
+def _render_output(output: Dict[str, Any]) -> str:
+    """Render an example JSON object with one field per line, in the given key order."""
+    fields = ",\n".join(
+        f'  "{key}": {json.dumps(value, ensure_ascii=False)}' for key, value in output.items()
+    )
+    return "{\n" + fields + "\n}"
+
+
+STORYTELLER_EXAMPLE_OUTLINE = (
+    "A forgotten desert kingdom swallowed by sandstorms, ruled by a sleeping god beneath the dunes."
+)
+
+# Output fields common to the standard and RAG storyteller examples
+STORYTELLER_EXAMPLE_FIELDS = {
+    "title": "The Sands Beneath the Sleeping God",
+    "background_story": "Centuries ago, the kingdom of Arasha stood as a beacon of gold and glass... [etc]",
+    "key_themes": ["ancient ruin", "hubris of kings", "divine silence"],
+}
+
+_STORYTELLER_EXAMPLE_INPUT = f"<outline>\n{STORYTELLER_EXAMPLE_OUTLINE}\n</outline>\n\n<output>\n"
+
+STORYTELLER_EXAMPLE = _STORYTELLER_EXAMPLE_INPUT + _render_output(
+    {
+        "title": STORYTELLER_EXAMPLE_FIELDS["title"],
+        "background_story": STORYTELLER_EXAMPLE_FIELDS["background_story"],
+        "tone": "mystical tragedy",
+        "key_themes": STORYTELLER_EXAMPLE_FIELDS["key_themes"],
+    }
+)
+
+RAG_STORYTELLER_EXAMPLE = _STORYTELLER_EXAMPLE_INPUT + _render_output(
+    {
+        **STORYTELLER_EXAMPLE_FIELDS,
+        "knowledge_used": ["desert kingdoms", "divine intervention", "sandstorms"],
+    }
+)
+
+# Act title the game plan example produces and the quest example consumes
+_EXAMPLE_ACT_TITLE = json.dumps("Act I — The Cracked Smile", ensure_ascii=False)
+
+GAME_PLAN_EXAMPLE = (
+    """{
+  "title": "The Laughter of Shadows",
+  "acts": [
+    {
+      "title": """
+    + _EXAMPLE_ACT_TITLE
+    + """,
+      "goal": "Identify the origin pattern and establish safe operating rituals.",
+      "conflict": "Communities resist investigation while hysteria spreads.",
+      "stakes": "If untreated, panic destabilizes trade and neighboring villages fall.",
+      "entry": "Background brief from the Council of Matriarchs.",
+      "exit": "Provisional map of echo points and a stable warding rite.",
+      "summary": "Afflictions ripple across border villages as laughter turns to panic...",
+      "locations": ["Meadow Village", "Shrine of Joy"],
+      "mechanics": ["investigation clues", "ritual cleansing"],
+      "handoff": ["Needs 1 civic investigation site"]
+    }
+  ],
+  "progression_overview": "Acts escalate from localized outbreaks to deep-wood incursions...",
+  "core_themes": ["joy vs control", "trust and community"],
+  "open_threads_to_resolve_later": ["True nature of the Goddess's laughter"]
+}"""
+)
+
+QUEST_EXAMPLE = (
+    """{
+  "act_title": """
+    + _EXAMPLE_ACT_TITLE
+    + """,
+  "quests": [
+    {
+      "type": "Investigation (Main)",
+      "difficulty": "Easy",
+      "sessions": 1,
+      "name": "Whispers in the Market",
+      "desc": "Strange laughter echoes through the market at night. Investigate the source...",
+      "prereqs": "Arrival in Meadow Village",
+      "rewards": "Information about echo points, 100 gold",
+      "outcomes": "Learn the curse pattern and an invitation to investigate the shrine",
+      "npcs": ["Elder Mira (skeptical official)", "Tam the Healer (folk healer)"],
+      "locations": ["Meadow Village Market", "Village Square"],
+      "objectives": ["Interview three witnesses", "Discover the connection to the Shrine of Joy"]
+    }
+  ]
+}"""
+)
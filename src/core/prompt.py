@@ -1,49 +1,80 @@
-storyteller_prompt = """
-You are a world-building Dungeon Master for a new Dungeons & Dragons campaign.
-
-Your goal is to take the player’s outline and expand it into a detailed background story that sets the stage for the first session.
-
-# Instructions
-1. Read the <outline> provided by the user carefully.
-2. Interpret it as a seed idea for a campaign setting — this may include tone, location, era, theme, or conflict.
-3. Write a **background story** that:
-   - Feels immersive and consistent with D&D world-building logic.
-   - Introduces key regions, cultures, legends, and conflicts.
-   - Provides narrative hooks for future quests or characters.
-   - Uses a vivid, cinematic style without being too long-winded (around 3–5 paragraphs).
-4. Maintain a tone appropriate to the outline: dark fantasy, heroic epic, whimsical adventure, etc.
-5. Do **not** write dialogue or game stats — focus on atmosphere and story context only.
-
-# Output Format
-CRITICAL: Return ONLY valid JSON. Do NOT wrap it in markdown code blocks (no ```json). Return ONLY the raw JSON object, nothing else.
-
-The JSON must be complete, parseable, and have ALL of the following required fields:
-{
-  "title": "<short title of the story>",
-  "background_story": "<the full story text>",
-  "key_themes": ["theme1", "theme2", "theme3"]
-}
-
-IMPORTANT:
-- Start your response with { and end with }
-- Do NOT use markdown code blocks (no ```json or ```)
-- Ensure all strings are properly quoted and escaped
-- Ensure all brackets and braces are properly closed
-- The JSON must be complete - do not truncate it
-
-# Example
-<outline>
-A forgotten desert kingdom swallowed by sandstorms, ruled by a sleeping god beneath the dunes.
-</outline>
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.examples import GAME_PLAN_EXAMPLE, QUEST_EXAMPLE, STORYTELLER_EXAMPLE
+
+__all__ = [
+    "build_messages",
+    "game_plan_prompt",
+    "game_plan_user_prompt",
+    "get_prompt",
+    "monster_generation_prompt",
+    "monster_generation_user_prompt",
+    "quest_generation_prompt",
+    "quest_generation_user_prompt",
+    "render_game_plan",
+    "render_monster_generation",
+    "render_quest_generation",
+    "render_storyteller",
+    "storyteller_prompt",
+    "storyteller_user_prompt",
+]
+
+# Directory holding the static system prompts, one <name>.txt file per prompt
+_TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Matches {{name}} placeholders in prompt templates
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a prompt once into alternating static text and placeholder names.
+
+    Even indices hold static text and odd indices hold placeholder names, so rendering is
+    a single join with no regex or str.replace work per call.
+    """
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def _render_template(compiled: Tuple[str, ...], **values: str) -> str:
+    """Fill a compiled prompt template with the per-call values."""
+    parts = list(compiled)
+    for i in range(1, len(parts), 2):
+        parts[i] = values[parts[i]]
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def get_prompt(name: str) -> str:
+    """Static system prompt stored in templates/<name>.txt, read once per process."""
+    return (_TEMPLATE_DIR / f"{name}.txt").read_text(encoding="utf-8")
+
+
+def _fill_prompt(name: str, **blocks: str) -> str:
+    """Load a system prompt template and fill in its shared blocks (e.g. the example)."""
+    return _render_template(_compile_template(get_prompt(name)), **blocks)
 
-<output>
-{
-  "title": "The Sands Beneath the Sleeping God",
-  "background_story": "Centuries ago, the kingdom of Arasha stood as a beacon of gold and glass... [etc]",
-  "tone": "mystical tragedy",
-  "key_themes": ["ancient ruin", "hubris of kings", "divine silence"]
-}
 
+def build_messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+    """
+    Build chat messages with the static instructions first.
+
+    Providers cache prompts by their longest identical prefix (OpenAI and Gemini do this
+    automatically), so everything that is byte-identical across calls lives in the system
+    message and only the per-call values go into the user message.
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+storyteller_prompt = _fill_prompt("storyteller", example=STORYTELLER_EXAMPLE)
+
+storyteller_user_prompt = """
 # Your Turn
 <outline>
 {{user_outline}}
@@ -52,402 +83,124 @@ A forgotten desert kingdom swallowed by sandstorms, ruled by a sleeping god bene
 Return ONLY the JSON object, starting with { and ending with }. No markdown, no code blocks, no explanations - just the raw JSON.
 """
 
-game_plan_prompt = """
-You are a veteran Game Designer and Narrative Architect for a Dungeons & Dragons campaign.
-
-Your job: Transform the background story into a **concise macro game plan** — 3–5 Acts that describe player progression at a high level.
-Do NOT generate quests, NPCs, dialogue, or stat blocks. Keep this focused and implementation-ready.
-
-# Instructions
-1. Read title and background carefully to understand setting, tone, core conflict, and themes.
-2. Propose 3–5 **Acts (Chapters)** that take players from the opening situation to the endgame.
-3. For each Act, provide ONLY:
-   - act_title: short and evocative.
-   - act_summary: 2–4 sentences summarizing the act’s narrative focus and player experience.
-   - narrative_goal: what players are trying to achieve in this act (one sentence).
-   - primary_conflict: the main obstacle/tension opposing that goal.
-   - stakes: what is at risk if the act fails or stalls.
-   - key_locations: 2–4 place names (short labels only).
-   - mechanics_or_features_introduced: systems/ideas unlocked here (e.g., investigation, stealth rituals, reputation, relic crafting).
-   - entry_requirements: brief prerequisites to start this act (keep generic, no quest lists).
-   - exit_conditions: what must be true to move to the next act (keep generic).
-   - handoff_notes_for_next_stage: bullet notes indicating what info the **next stage** will need to generate detailed quests/NPCs for this act (e.g., “needs 1 main dungeon, 2 side investigation beats,” “needs 1 ally faction and 1 rival faction,” “requires a moral dilemma about X”).
-
-4. After listing all Acts, include:
-   - progression_overview: 3–5 sentences explaining how the Acts escalate and resolve the core conflict.
-   - core_themes: 2–4 theme keywords distilled from the background.
-   - open_threads_to_resolve_later: 2–4 seeds intentionally left for future quest/NPC generation.
+_STORYTELLER_TEMPLATE = _compile_template(storyteller_user_prompt)
+
+
+def render_storyteller(user_outline: str) -> List[Dict[str, str]]:
+    user_prompt = _render_template(_STORYTELLER_TEMPLATE, user_outline=user_outline)
+    return build_messages(storyteller_prompt, user_prompt)
+
+
+game_plan_prompt = _fill_prompt("game_plan", example=GAME_PLAN_EXAMPLE)
 
+game_plan_user_prompt = """
 ===Title===
-The title of the story is: <title>
+The title of the story is: {{title}}
 ===Background===
-The background of the story is: <background>
-
-# Output Format
-CRITICAL: Return ONLY valid JSON. Do NOT wrap it in markdown code blocks (no ```json). Return ONLY the raw JSON object, nothing else.
-
-The JSON must be complete, parseable, and have ALL of the following required fields:
-{
-  "title": "<same as input title>",
-  "acts": [
-    {
-      "act_title": "",
-      "act_summary": "",
-      "narrative_goal": "",
-      "primary_conflict": "",
-      "stakes": "",
-      "key_locations": ["", ""],
-      "mechanics_or_features_introduced": ["", ""],
-      "entry_requirements": "",
-      "exit_conditions": "",
-      "handoff_notes_for_next_stage": ["", ""]
-    }
-  ],
-  "progression_overview": "",
-  "core_themes": ["", ""],
-  "open_threads_to_resolve_later": ["", ""]
-}
-
-IMPORTANT:
-- Start your response with { and end with }
-- Do NOT use markdown code blocks (no ```json or ```)
-- Ensure all strings are properly quoted and escaped
-- Ensure all brackets and braces are properly closed
-- The JSON must be complete - do not truncate it
-
-# Example Output
-{
-  "title": "The Laughter of Shadows",
-  "acts": [
-    {
-      "act_title": "Act I — The Cracked Smile",
-      "act_summary": "Afflictions ripple across border villages as laughter turns to panic. The party learns the curse has patterns tied to shrines of joy and forest winds.",
-      "narrative_goal": "Identify the origin pattern and establish safe operating rituals.",
-      "primary_conflict": "Communities resist investigation while hysteria and false cures spread.",
-      "stakes": "If untreated, panic destabilizes trade and neighboring villages fall.",
-      "key_locations": ["Meadow Village", "Shrine of Joy", "Forest Edge"],
-      "mechanics_or_features_introduced": ["investigation clues", "ritual cleansing", "reputation with councils"],
-      "entry_requirements": "Background brief from the Council of Matriarchs.",
-      "exit_conditions": "Provisional map of echo points and a stable warding rite.",
-      "handoff_notes_for_next_stage": ["Needs 1 civic investigation site", "Needs 1 contested ritual scene", "Introduce 1 skeptical official and 1 folk healer"]
-    }
-  ],
-  "progression_overview": "Acts escalate from localized outbreaks to deep-wood incursions, then to confronting lieutenants amplifying cursed mirth, culminating in a moral resolution about sealing or redeeming the source.",
-  "core_themes": ["joy vs control", "trust and community", "power of stories"],
-  "open_threads_to_resolve_later": ["True nature of the Goddess's laughter", "Origin of the echo points network"]
-}
+The background of the story is: {{background}}
 
 Return ONLY the JSON object, starting with { and ending with }. No markdown, no code blocks, no explanations - just the raw JSON.
 """
 
-quest_generation_prompt = """
-You are an expert D&D Quest Designer creating engaging quests for a campaign act.
-
-Your job: Generate 3-5 quests for the given act that drive the story forward and provide varied gameplay experiences.
-
-# Instructions
-1. Read the act details carefully (title, summary, narrative goal, locations, etc.)
-2. Design 3-5 quests that:
-   - Align with the act's narrative goal and themes
-   - Provide variety (combat, investigation, social, exploration)
-   - Build toward the act's exit conditions
-   - Use the specified key locations
-   - Can be completed in 1-2 game sessions each
-3. Include both main story quests and optional side quests
-4. Ensure quests have clear objectives and rewards
-5. Make quests engaging and memorable
-
-# Quest Types
-- **Main Quest**: Critical to act progression
-- **Side Quest**: Optional, provides character development or resources
-- **Investigation**: Gather information, solve mysteries
-- **Combat**: Fight enemies, clear dungeons
-- **Social**: Negotiate, persuade, build relationships
-- **Exploration**: Discover new locations, find secrets
+_GAME_PLAN_TEMPLATE = _compile_template(game_plan_user_prompt)
 
+
+def render_game_plan(title: str, background: str) -> List[Dict[str, str]]:
+    user_prompt = _render_template(_GAME_PLAN_TEMPLATE, title=title, background=background)
+    return build_messages(game_plan_prompt, user_prompt)
+
+
+quest_generation_prompt = _fill_prompt("quest_generation", example=QUEST_EXAMPLE)
+
+quest_generation_user_prompt = """
 # Act Details
 ===Title===
-<act_title>
+{{act_title}}
 
 ===Summary===
-<act_summary>
+{{act_summary}}
 
 ===Narrative Goal===
-<narrative_goal>
+{{narrative_goal}}
 
 ===Primary Conflict===
-<primary_conflict>
+{{primary_conflict}}
 
 ===Key Locations===
-<key_locations>
+{{key_locations}}
 
 ===Mechanics/Features===
-<mechanics>
-
-# Output Format
-CRITICAL: Return ONLY valid JSON. Do NOT wrap it in markdown code blocks (no ```json). Return ONLY the raw JSON object, nothing else.
-
-The JSON must be complete, parseable, and have ALL of the following required fields:
-{
-  "act_title": "<same as input>",
-  "quests": [
-    {
-      "quest_name": "",
-      "quest_type": "",
-      "description": "",
-      "objectives": ["", ""],
-      "key_npcs": ["", ""],
-      "locations": ["", ""],
-      "rewards": "",
-      "difficulty": "",
-      "estimated_sessions": 1,
-      "prerequisites": "",
-      "outcomes": ""
-    }
-  ]
-}
-
-IMPORTANT:
-- Start your response with { and end with }
-- Do NOT use markdown code blocks (no ```json or ```)
-- Ensure all strings are properly quoted and escaped
-- Ensure all brackets and braces are properly closed
-- The JSON must be complete - do not truncate it
-
-# Example Output
-{
-  "act_title": "Act I - The Cracked Smile",
-  "quests": [
-    {
-      "quest_name": "Whispers in the Market",
-      "quest_type": "Investigation (Main)",
-      "description": "Strange laughter echoes through the market at night. Investigate the source and interview witnesses to understand the pattern of afflictions.",
-      "objectives": [
-        "Interview three witnesses about the laughter incidents",
-        "Investigate the market square at midnight",
-        "Discover the connection to the Shrine of Joy"
-      ],
-      "key_npcs": ["Elder Mira (skeptical official)", "Tam the Healer (folk healer)", "Afflicted merchant"],
-      "locations": ["Meadow Village Market", "Village Square"],
-      "rewards": "Information about echo points, Trust of village elders, 100 gold",
-      "difficulty": "Easy",
-      "estimated_sessions": 1,
-      "prerequisites": "Arrival in Meadow Village",
-      "outcomes": "Learn about the curse pattern and receive invitation to investigate the shrine"
-    },
-    {
-      "quest_name": "Cleansing the Shrine",
-      "quest_type": "Combat/Ritual (Main)",
-      "description": "The Shrine of Joy has become corrupted. Perform a cleansing ritual while defending against cursed spirits that emerge from the echo points.",
-      "objectives": [
-        "Gather ritual components from the forest",
-        "Defend Elder Mira during the hour-long ritual",
-        "Defeat the Laughing Shade at the ritual's climax"
-      ],
-      "key_npcs": ["Elder Mira", "Tam the Healer", "Guardian spirits"],
-      "locations": ["Shrine of Joy", "Forest Edge"],
-      "rewards": "Warding rite knowledge, Sacred amulet, 250 gold, Village alliance",
-      "difficulty": "Medium",
-      "estimated_sessions": 2,
-      "prerequisites": "Complete 'Whispers in the Market'",
-      "outcomes": "Stabilize the first echo point, gain map of other locations, progress to Act II"
-    },
-    {
-      "quest_name": "The Healer's Secret",
-      "quest_type": "Social (Side)",
-      "description": "Tam the Healer knows more than she's sharing. Gain her trust to learn about ancient remedies and the true history of the curse.",
-      "objectives": [
-        "Help Tam gather rare medicinal herbs",
-        "Protect her from suspicious villagers",
-        "Earn her confidence through dialogue"
-      ],
-      "key_npcs": ["Tam the Healer", "Suspicious villagers"],
-      "locations": ["Tam's Hut", "Deep Forest"],
-      "rewards": "Healing potion recipe, Background lore, Tam as ally",
-      "difficulty": "Easy",
-      "estimated_sessions": 1,
-      "prerequisites": "Meet Tam during main quest",
-      "outcomes": "Optional ally for future quests, additional lore about the Goddess"
-    }
-  ]
-}
+{{mechanics}}
 
 Return ONLY the JSON object, starting with { and ending with }. No markdown, no code blocks, no explanations - just the raw JSON.
 """
 
-monster_generation_prompt = """
-You are an expert D&D Monster Designer creating balanced encounters for a campaign.
+_QUEST_GENERATION_TEMPLATE = _compile_template(quest_generation_user_prompt)
 
-Your job: Generate 1-3 monsters for a specific combat quest that are thematically appropriate and balanced for the party level. Always generate at least 1 monster.
 
-# Instructions
-1. Read the quest details carefully (name, description, objectives, difficulty)
-2. Design monsters that:
-   - Fit the quest's theme and setting
-   - Are appropriate for the quest's difficulty level
-   - Provide interesting tactical challenges
-   - Have unique abilities and characteristics
-3. Ensure monsters are balanced according to D&D 5e rules
-4. Include both combat stats and roleplay elements
+def render_quest_generation(
+    act_title: str,
+    act_summary: str,
+    narrative_goal: str,
+    primary_conflict: str,
+    key_locations: str,
+    mechanics: str,
+) -> List[Dict[str, str]]:
+    user_prompt = _render_template(
+        _QUEST_GENERATION_TEMPLATE,
+        act_title=act_title,
+        act_summary=act_summary,
+        narrative_goal=narrative_goal,
+        primary_conflict=primary_conflict,
+        key_locations=key_locations,
+        mechanics=mechanics,
+    )
+    return build_messages(quest_generation_prompt, user_prompt)
 
+
+monster_generation_prompt = get_prompt("monster_generation")
+
+monster_generation_user_prompt = """
 # Quest Details
 ===Quest Name===
-<quest_name>
+{{quest_name}}
 
 ===Quest Description===
-<quest_description>
+{{quest_description}}
 
 ===Quest Type===
-<quest_type>
+{{quest_type}}
 
 ===Difficulty===
-<difficulty>
+{{difficulty}}
 
 ===Key Locations===
-<locations>
+{{locations}}
 
 ===Objectives===
-<objectives>
-
-# Monster Design Guidelines
-- **Challenge Rating (CR)**: Use appropriate CR for the difficulty level
-  - Easy: CR 1/4 to CR 1
-  - Medium: CR 1 to CR 3
-  - Hard: CR 3 to CR 6
-  - Deadly: CR 6+
-- **Hit Points**: Use average HP for the creature type
-- **Armor Class**: Appropriate for the creature's natural defenses
-- **Speed**: Include walking speed and any special movement
-- **Abilities**: Include 1-3 special abilities or attacks
-- **Resistances/Immunities**: Include if thematically appropriate
-- **Senses**: Include passive Perception and any special senses
-
-# Output Format
-CRITICAL: Return ONLY valid JSON. Do NOT wrap it in markdown code blocks (no ```json). Return ONLY the raw JSON object, nothing else.
-
-The JSON must be complete, parseable, and have ALL of the following required fields with correct data types:
-{
-  "quest_name": "<same as input>",
-  "monsters": [
-    {
-      "name": "<string>",
-      "size": "<string: Tiny, Small, Medium, Large, Huge, or Gargantuan>",
-      "type": "<string: e.g., 'undead', 'construct', 'dragon'>",
-      "alignment": "<string: e.g., 'chaotic evil', 'neutral'>",
-      "armor_class": <number: integer>,
-      "hit_points": <number: integer>,
-      "speed": "<string: e.g., '30 ft., fly 60 ft.'>",
-      "strength": <number: integer 1-30>,
-      "dexterity": <number: integer 1-30>,
-      "constitution": <number: integer 1-30>,
-      "intelligence": <number: integer 1-30>,
-      "wisdom": <number: integer 1-30>,
-      "charisma": <number: integer 1-30>,
-      "challenge_rating": "<string: e.g., '3', '1/2', '1/4'>",
-      "proficiency_bonus": <number: integer>,
-      "saving_throws": ["<string>", ...] or [],
-      "skills": ["<string>", ...] or [],
-      "damage_resistances": ["<string>", ...] or [],
-      "damage_immunities": ["<string>", ...] or [],
-      "condition_immunities": ["<string>", ...] or [],
-      "senses": "<string: e.g., 'darkvision 60 ft., passive Perception 10'>",
-      "languages": "<string: e.g., 'Common, Draconic'>",
-      "special_abilities": [
-        {
-          "name": "<string>",
-          "description": "<string>"
-        }
-      ] or [],
-      "actions": [
-        {
-          "name": "<string>",
-          "description": "<string>",
-          "attack_bonus": <number: integer>,
-          "damage": "<string: e.g., '2d6 + 3'>",
-          "damage_type": "<string: e.g., 'necrotic', 'slashing'>"
-        }
-      ] or [],
-      "legendary_actions": [] or [<array of legendary action objects>],
-      "description": "<string: lore/visual description>",
-      "tactics": "<string: combat tactics>",
-      "treasure": "<string: e.g., '1d4 gold pieces'>",
-      "environment": "<string: where this monster is found>"
-    }
-  ]
-}
-
-DATA TYPE REQUIREMENTS:
-- Numbers (armor_class, hit_points, ability scores, etc.): Use integers, NOT strings
-- Strings (name, size, type, etc.): Use quoted strings
-- Arrays (saving_throws, skills, etc.): Use [] for empty arrays, NOT null
-- challenge_rating: Must be a STRING (e.g., "3", "1/2", "1/4"), NOT a number
-- All string fields must be non-empty strings, even if brief
-- The "monsters" array must contain at least 1 monster object (generate 1-3 monsters)
-
-IMPORTANT JSON FORMAT RULES:
-- Start your response with { and end with }
-- Do NOT use markdown code blocks (no ```json or ```)
-- Escape special characters in strings: use \\n for newlines, \\" for quotes
-- Ensure all strings are properly quoted and escaped
-- Ensure all brackets and braces are properly closed
-- Arrays must be complete - do not truncate arrays mid-element
-- The JSON must be complete - do not truncate the response
-- Use [] for empty arrays, never null or undefined
-
-# Example Output
-{
-  "quest_name": "Cleansing the Shrine",
-  "monsters": [
-    {
-      "name": "Laughing Shade",
-      "size": "Medium",
-      "type": "undead",
-      "alignment": "chaotic evil",
-      "armor_class": 13,
-      "hit_points": 45,
-      "speed": "30 ft., fly 60 ft. (hover)",
-      "strength": 8,
-      "dexterity": 17,
-      "constitution": 12,
-      "intelligence": 6,
-      "wisdom": 10,
-      "charisma": 8,
-      "challenge_rating": "3",
-      "proficiency_bonus": 2,
-      "saving_throws": ["Dex +5"],
-      "skills": ["Stealth +5"],
-      "damage_resistances": ["necrotic", "psychic"],
-      "damage_immunities": ["poison"],
-      "condition_immunities": ["charmed", "exhaustion", "frightened", "poisoned"],
-      "senses": "darkvision 60 ft., passive Perception 10",
-      "languages": "understands Common but can't speak",
-      "special_abilities": [
-        {
-          "name": "Incorporeal Movement",
-          "description": "The shade can move through other creatures and objects as if they were difficult terrain. It takes 5 (1d10) force damage if it ends its turn inside an object."
-        },
-        {
-          "name": "Maddening Laughter",
-          "description": "As a bonus action, the shade can emit a burst of maddening laughter. Each creature within 10 feet must make a DC 13 Wisdom saving throw or be frightened until the end of the shade's next turn."
-        }
-      ],
-      "actions": [
-        {
-          "name": "Life Drain",
-          "description": "Melee Weapon Attack: +5 to hit, reach 5 ft., one creature. Hit: 10 (2d6 + 3) necrotic damage. The target must make a DC 13 Constitution saving throw, taking 5 (1d10) necrotic damage on a failed save, or half as much damage on a successful one.",
-          "attack_bonus": 5,
-          "damage": "2d6 + 3",
-          "damage_type": "necrotic"
-        }
-      ],
-      "legendary_actions": [],
-      "description": "A twisted spirit bound to the corrupted shrine, its form flickers between solid and ethereal. Its laughter echoes with the madness of the curse it embodies.",
-      "tactics": "The shade uses its incorporeal movement to phase through walls and attack from unexpected angles. It prioritizes isolating weaker party members and uses Maddening Laughter to control the battlefield.",
-      "treasure": "1d4 cursed gold pieces that cause nightmares",
-      "environment": "Corrupted shrines, cursed locations, places of negative energy"
-    }
-  ]
-}
+{{objectives}}
 
 Return ONLY the JSON object, starting with { and ending with }. No markdown, no code blocks, no explanations - just the raw JSON.
 """
+
+_MONSTER_GENERATION_TEMPLATE = _compile_template(monster_generation_user_prompt)
+
+
+def render_monster_generation(
+    quest_name: str,
+    quest_description: str,
+    quest_type: str,
+    difficulty: str,
+    locations: str,
+    objectives: str,
+) -> List[Dict[str, str]]:
+    user_prompt = _render_template(
+        _MONSTER_GENERATION_TEMPLATE,
+        quest_name=quest_name,
+        quest_description=quest_description,
+        quest_type=quest_type,
+        difficulty=difficulty,
+        locations=locations,
+        objectives=objectives,
+    )
+    return build_messages(monster_generation_prompt, user_prompt)
@@ -3,55 +3,68 @@ RAG-Augmented Prompts for D&D Campaign Generation
 
 These prompts incorporate retrieved knowledge from a vector database
 to provide context-aware, knowledge-grounded responses.
-"""
 
-# System prompt for RAG-augmented background story generation
-rag_storyteller_prompt = """
-You are a world-building Dungeon Master for a new Dungeons & Dragons campaign,
-augmented with a knowledge base of campaign settings, lore, and conventions.
-
-Your goal is to take the player's outline and expand it into a detailed background story
-that sets the stage for the first session, informed by the knowledge base provided.
-
-# Instructions
-1. Read the <outline> provided by the user carefully.
-2. Review the <knowledge_context> provided from the knowledge base.
-3. Interpret the outline as a seed idea for a campaign setting — this may include tone, location, era, theme, or conflict.
-4. If the knowledge base contains relevant information, integrate it naturally into the background story.
-5. Write a **background story** that:
-   - Feels immersive and consistent with D&D world-building logic and the provided knowledge base.
-   - Introduces key regions, cultures, legends, and conflicts.
-   - Provides narrative hooks for future quests or characters.
-   - Uses a vivid, cinematic style without being too long-winded (around 3–5 paragraphs).
-6. Maintain a tone appropriate to the outline: dark fantasy, heroic epic, whimsical adventure, etc.
-7. Do **not** write dialogue or game stats — focus on atmosphere and story context only.
+Each prompt is split into a static system block (role, instructions, output format and
+example) and a user block holding the retrieved knowledge context and per-call values, so
+that the instruction prefix stays byte-identical across retrievals and can be cached.
 
-# Knowledge Context
+When retrieval comes back empty, the render functions switch to a *_no_ctx variant of the
+prompt with the knowledge-base scaffolding removed, so those tokens are not sent for nothing.
+"""
+
+import itertools
+import re
+from typing import Dict, List, Tuple
+
+from core.examples import RAG_STORYTELLER_EXAMPLE
+from core.prompt import (
+    _compile_template,
+    _fill_prompt,
+    _render_template,
+    build_messages,
+    get_prompt,
+)
+
+# Knowledge context block shared by the RAG user prompts
+_KNOWLEDGE_CONTEXT_BLOCK = """# Knowledge Context
 <knowledge_context>
 {{knowledge_context}}
 </knowledge_context>
 
-# Output Format
-Return your result strictly in JSON format with the following fields:
-{
-  "title": "<short title of the story>",
-  "background_story": "<the full story text>",
-  "key_themes": ["theme1", "theme2", "theme3"],
-  "knowledge_used": ["relevant knowledge items from context", "..."]
-}
+"""
 
-# Example
-<outline>
-A forgotten desert kingdom swallowed by sandstorms, ruled by a sleeping god beneath the dunes.
-</outline>
+# Matches the number of a numbered instruction step
+_STEP_RE = re.compile(r"^\d+\. ", re.MULTILINE)
+
+
+def _without_knowledge_base(prompt: str, *clauses: str) -> str:
+    """
+    Derive the no-context variant of a RAG system prompt.
 
-<output>
-{
-  "title": "The Sands Beneath the Sleeping God",
-  "background_story": "Centuries ago, the kingdom of Arasha stood as a beacon of gold and glass... [etc]",
-  "key_themes": ["ancient ruin", "hubris of kings", "divine silence"],
-  "knowledge_used": ["desert kingdoms", "divine intervention", "sandstorms"]
-}
+    Every clause must be present, so an edit to the template cannot silently leave a
+    knowledge-base reference behind. Instruction steps are renumbered afterwards.
+    """
+    for clause in clauses:
+        if clause not in prompt:
+            raise ValueError(f"Knowledge-base clause not found in prompt: {clause!r}")
+        prompt = prompt.replace(clause, "")
+    steps = itertools.count(1)
+    return _STEP_RE.sub(lambda match: f"{next(steps)}. ", prompt)
+
+
+def _compile_no_ctx_template(user_prompt: str) -> Tuple[str, ...]:
+    """Compile a RAG user prompt without its knowledge context block."""
+    return _compile_template(user_prompt.replace(_KNOWLEDGE_CONTEXT_BLOCK, ""))
+
+
+# System prompt for RAG-augmented background story generation
+rag_storyteller_prompt = _fill_prompt("rag_storyteller", example=RAG_STORYTELLER_EXAMPLE)
+
+rag_storyteller_user_prompt = """
+# Knowledge Context
+<knowledge_context>
+{{knowledge_context}}
+</knowledge_context>
 
 # Your Turn
 <outline>
@@ -61,46 +74,40 @@ A forgotten desert kingdom swallowed by sandstorms, ruled by a sleeping god bene
 Generate the output JSON now.
 """
 
-# System prompt for RAG-augmented game plan generation
-rag_game_plan_prompt = """
-You are a veteran Game Designer and Narrative Architect for a Dungeons & Dragons campaign,
-informed by a knowledge base of campaign structures, narrative patterns, and quest design principles.
+_RAG_STORYTELLER_TEMPLATE = _compile_template(rag_storyteller_user_prompt)
+
+rag_storyteller_prompt_no_ctx = _without_knowledge_base(
+    rag_storyteller_prompt,
+    ",\naugmented with a knowledge base of campaign settings, lore, and conventions",
+    ", informed by the knowledge base provided",
+    "2. Review the <knowledge_context> provided from the knowledge base.\n",
+    "4. If the knowledge base contains relevant information, integrate it naturally into the background story.\n",
+    " and the provided knowledge base",
+    ',\n  "knowledge_used": ["relevant knowledge items from context", "..."]',
+    ',\n  "knowledge_used": ["desert kingdoms", "divine intervention", "sandstorms"]',
+)
+_RAG_STORYTELLER_NO_CTX_TEMPLATE = _compile_no_ctx_template(rag_storyteller_user_prompt)
 
-Your job: Transform the background story into a **concise macro game plan** — 3–5 Acts that describe player progression at a high level.
-Reference the provided knowledge base where relevant to inform structure and pacing.
 
-Do NOT generate quests, NPCs, dialogue, or stat blocks. Keep this focused and implementation-ready.
+def render_rag_storyteller(knowledge_context: str, user_outline: str) -> List[Dict[str, str]]:
+    if not knowledge_context.strip():
+        user_prompt = _render_template(_RAG_STORYTELLER_NO_CTX_TEMPLATE, user_outline=user_outline)
+        return build_messages(rag_storyteller_prompt_no_ctx, user_prompt)
+    user_prompt = _render_template(
+        _RAG_STORYTELLER_TEMPLATE, knowledge_context=knowledge_context, user_outline=user_outline
+    )
+    return build_messages(rag_storyteller_prompt, user_prompt)
 
+
+# System prompt for RAG-augmented game plan generation
+rag_game_plan_prompt = get_prompt("rag_game_plan")
+
+rag_game_plan_user_prompt = """
 # Knowledge Context
 <knowledge_context>
 {{knowledge_context}}
 </knowledge_context>
 
-# Instructions
-1. Examine the story title and background provided.
-2. Review relevant knowledge from the knowledge base about campaign structure and progression.
-3. Define 3-5 clear Acts, each with:
-   - **act_number**: The act number
-   - **act_title**: A compelling title for this act
-   - **act_summary**: 2-3 sentences describing player goals and progression
-   - **key_milestones**: 2-3 major events/decisions that drive the act forward
-4. Ensure Acts build naturally on each other and escalate in scope/stakes.
-5. Ground the acts in the background story's established themes and conflicts.
-
-# Output Format
-Return strictly in JSON format:
-{
-  "acts": [
-    {
-      "act_number": 1,
-      "act_title": "Act One Title",
-      "act_summary": "Summary of what happens",
-      "key_milestones": ["milestone1", "milestone2", "milestone3"]
-    }
-  ],
-  "knowledge_used": ["relevant knowledge items"]
-}
-
 # Campaign Info
 **Title**: {{title}}
 **Background**: {{background}}
@@ -108,104 +115,71 @@ Return strictly in JSON format:
 Generate the output JSON now.
 """
 
-# System prompt for RAG-augmented quest generation
-rag_quest_generation_prompt = """
-You are a master quest designer for Dungeons & Dragons, informed by a knowledge base
-of quest structures, encounter design, and narrative patterns.
-
-Your task: Design a **single, concrete quest** for the specified act that advances the campaign narrative,
-informed by relevant knowledge from the knowledge base.
-
-Do **not** generate full stat blocks or battle maps. Focus on narrative hooks, objectives, and decision points.
-
+_RAG_GAME_PLAN_TEMPLATE = _compile_template(rag_game_plan_user_prompt)
+
+rag_game_plan_prompt_no_ctx = _without_knowledge_base(
+    rag_game_plan_prompt,
+    ",\ninformed by a knowledge base of campaign structures, narrative patterns, and quest design principles",
+    "\nReference the provided knowledge base where relevant to inform structure and pacing.",
+    "2. Review relevant knowledge from the knowledge base about campaign structure and progression.\n",
+    ',\n  "knowledge_used": ["relevant knowledge items"]',
+)
+_RAG_GAME_PLAN_NO_CTX_TEMPLATE = _compile_no_ctx_template(rag_game_plan_user_prompt)
+
+
+def render_rag_game_plan(
+    knowledge_context: str, title: str, background: str
+) -> List[Dict[str, str]]:
+    if not knowledge_context.strip():
+        user_prompt = _render_template(
+            _RAG_GAME_PLAN_NO_CTX_TEMPLATE, title=title, background=background
+        )
+        return build_messages(rag_game_plan_prompt_no_ctx, user_prompt)
+    user_prompt = _render_template(
+        _RAG_GAME_PLAN_TEMPLATE,
+        knowledge_context=knowledge_context,
+        title=title,
+        background=background,
+    )
+    return build_messages(rag_game_plan_prompt, user_prompt)
+
+
+# System prompt for RAG-augmented quest generation (one quest per act, several acts per call)
+rag_quest_generation_prompt = get_prompt("rag_quest_generation")
+
+rag_quest_generation_user_prompt = """
 # Knowledge Context
 <knowledge_context>
 {{knowledge_context}}
 </knowledge_context>
 
-# Instructions
-1. Examine the act summary and key milestones provided.
-2. Reference the knowledge base for quest design best practices and relevant context.
-3. Create a quest that:
-   - Feels connected to the campaign's tone and themes
-   - Offers clear objectives but multiple paths to success
-   - Includes decision points that affect future quests
-   - References locations, NPCs, or lore established in the background story
-4. The quest should take 1-2 sessions to complete (roughly 4-6 hours of play).
-
-# Output Format
-Return strictly in JSON format:
-{
-  "quest_title": "Quest Title",
-  "act": {{act_number}},
-  "objectives": [
-    "Primary objective",
-    "Secondary objective (optional but encouraged)"
-  ],
-  "hooks": ["How players learn of this quest", "Alternative discovery methods"],
-  "key_locations": ["Location 1", "Location 2"],
-  "key_npcs": ["NPC 1", "NPC 2"],
-  "complication": "A twist or challenge that complicates the straightforward path",
-  "resolution_paths": [
-    "Path A: How quest might resolve",
-    "Path B: Alternative resolution"
-  ],
-  "rewards": ["Narrative", "Gold", "Items", "Clues"],
-  "knowledge_used": ["relevant knowledge items"]
-}
-
-# Campaign Act
-**Act Title**: {{act_title}}
-**Act Summary**: {{act_summary}}
-**Key Milestones**: {{key_milestones}}
+# Campaign Acts
+{{acts}}
 
 Generate the output JSON now.
 """
 
-# System prompt for RAG-augmented character generation
-rag_character_generation_prompt = """
-You are an expert NPC and character designer for Dungeons & Dragons 5th Edition,
-informed by a knowledge base of character archetypes, motivations, and role conventions.
+_RAG_QUEST_GENERATION_TEMPLATE = _compile_template(rag_quest_generation_user_prompt)
 
-Your task: Design a **compelling NPC** for the campaign, grounded in the setting and informed by the knowledge base.
+rag_quest_generation_prompt_no_ctx = _without_knowledge_base(
+    rag_quest_generation_prompt,
+    ", informed by a knowledge base\nof quest structures, encounter design, and narrative patterns",
+    ",\ninformed by relevant knowledge from the knowledge base",
+    "2. Reference the knowledge base for quest design best practices and relevant context.\n",
+    '      "knowledge_used": ["relevant knowledge items"],\n',
+)
+_RAG_QUEST_GENERATION_NO_CTX_TEMPLATE = _compile_no_ctx_template(rag_quest_generation_user_prompt)
 
-Focus on personality, motivations, and narrative role—not stat blocks.
 
-# Knowledge Context
-<knowledge_context>
-{{knowledge_context}}
-</knowledge_context>
+def render_rag_quest_generation(knowledge_context: str, acts: str) -> List[Dict[str, str]]:
+    if not knowledge_context.strip():
+        user_prompt = _render_template(_RAG_QUEST_GENERATION_NO_CTX_TEMPLATE, acts=acts)
+        return build_messages(rag_quest_generation_prompt_no_ctx, user_prompt)
+    user_prompt = _render_template(
+        _RAG_QUEST_GENERATION_TEMPLATE, knowledge_context=knowledge_context, acts=acts
+    )
+    return build_messages(rag_quest_generation_prompt, user_prompt)
 
-# Instructions
-1. Review the campaign context and act information provided.
-2. Reference the knowledge base for character archetypes and design patterns.
-3. Create an NPC that:
-   - Has a clear role in the campaign (ally, antagonist, quest-giver, etc.)
-   - Possesses distinct personality traits and motivations
-   - Can be voiced distinctly in roleplay
-   - Has potential for character growth or moral ambiguity
-   - Fits the established world and tone
-
-# Output Format
-Return strictly in JSON format:
-{
-  "name": "Character Name",
-  "race": "Race",
-  "role": "Role in campaign (ally/antagonist/quest-giver/etc)",
-  "appearance": "Brief visual description",
-  "personality": "Key personality traits and quirks",
-  "background": "Brief backstory or history",
-  "motivations": "What drives this character",
-  "plot_hooks": ["How players interact with them", "Potential quests or conflicts"],
-  "secrets": "Hidden information that could come out",
-  "suggested_voice": "Vocal or accent hints for roleplay",
-  "knowledge_used": ["relevant knowledge items"]
-}
-
-# Campaign Context
-**Setting**: {{setting}}
-**Act**: {{act}}
-**Role Needed**: {{character_role}}
 
-Generate the output JSON now.
-"""
+# System prompt for RAG-augmented character generation
+rag_character_generation_prompt = get_prompt("rag_character_generation")
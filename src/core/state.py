@@ -1,18 +1,119 @@
-from typing import Any, Dict, List
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List
 
-from typing_extensions import TypedDict
 
+class SlottedState(MutableMapping):
+    """
+    Base class for pipeline state records stored in __slots__ instead of a per-instance dict.
+
+    Records are mutable mappings, so they keep working wherever the old dicts were used:
+    state["title"], "quests" in state, .get(), .update(), .setdefault(), .items(), dict(state)
+    and **state. Fields that have not been assigned yet are simply unset. Keys that are not
+    declared fields (e.g. "class" in a character sheet) are kept in a small overflow dict
+    created on first use. Use to_dict() where a plain dict is needed (e.g. JSON serialization).
+    """
+
+    __slots__ = ("_extras",)
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        try:
+            return self._extras[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.__slots__:
+            setattr(self, key, value)
+            return
+        try:
+            self._extras[key] = value
+        except AttributeError:
+            self._extras = {key: value}
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.__slots__:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        try:
+            del self._extras[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+        yield from getattr(self, "_extras", ())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.__slots__:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return key in getattr(self, "_extras", ())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class GameStatus(SlottedState):
+    __slots__ = (
+        "title",
+        "background_story",
+        "key_themes",
+        "acts",
+        "quests",
+        "monsters",
+        "rag_augmented",
+    )
 
-class GameStatus(TypedDict):
     title: str
     background_story: str
-    key_themes: list[str]
-    acts: list[Dict[str, Any]]
+    key_themes: List[str]
+    acts: List[Dict[str, Any]]
     quests: Dict[str, List[Dict[str, Any]]]  # Key: act_title, Value: list of quests
     monsters: Dict[str, List[Dict[str, Any]]]  # Key: quest_name, Value: list of monsters
+    rag_augmented: bool
 
 
-class Monster(TypedDict):
+class Monster(SlottedState):
+    __slots__ = (
+        "name",
+        "size",
+        "type",
+        "alignment",
+        "armor_class",
+        "hit_points",
+        "speed",
+        "strength",
+        "dexterity",
+        "constitution",
+        "intelligence",
+    )
+
     name: str
     size: str
     type: str
@@ -26,7 +127,21 @@ class Monster(TypedDict):
     intelligence: int
 
 
-class PlayerCharacter(TypedDict):
+class PlayerCharacter(SlottedState):
+    __slots__ = (
+        "name",
+        "advancement",
+        "level",
+        "race",
+        "background",
+        "alignment",
+        "experience_points",
+        "inventory",
+        "equipment",
+        "spells",
+        "feats",
+    )
+
     name: str
     advancement: str
     level: int
@@ -38,3 +153,38 @@ class PlayerCharacter(TypedDict):
     equipment: List[str]
     spells: List[str]
     feats: List[str]
+
+
+# Short fields drawn from small vocabularies ("Medium", "undead", "30 ft.", "Combat", ...).
+# Interning them at ingestion makes repeated values share one string object.
+MONSTER_INTERN_FIELDS = ("size", "type", "alignment", "challenge_rating", "speed")
+QUEST_INTERN_FIELDS = ("quest_type", "difficulty")
+ACT_INTERN_FIELDS = ("act_title",)
+CHARACTER_INTERN_FIELDS = ("race", "background", "alignment", "advancement")
+
+
+def _intern_fields(record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Intern the string values of the given fields of a parsed record in place."""
+    if isinstance(record, dict):
+        for field in fields:
+            value = record.get(field)
+            if type(value) is str:
+                record[field] = sys.intern(value)
+    return record
+
+
+def intern_monster(monster: Dict[str, Any]) -> Dict[str, Any]:
+    return _intern_fields(monster, MONSTER_INTERN_FIELDS)
+
+
+def intern_quest(quest: Dict[str, Any]) -> Dict[str, Any]:
+    return _intern_fields(quest, QUEST_INTERN_FIELDS)
+
+
+def intern_act(act: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern an act's title, which is also the key of its quests in GameStatus.quests."""
+    return _intern_fields(act, ACT_INTERN_FIELDS)
+
+
+def intern_character(character: Dict[str, Any]) -> Dict[str, Any]:
+    return _intern_fields(character, CHARACTER_INTERN_FIELDS)
@@ -3,17 +3,25 @@ Data schemas and models
 """
 
 from schemas.models import (
+    Act,
+    GamePlanResponse,
     Monster,
     MonsterAction,
     MonsterGenerationResponse,
     MonsterRegistry,
+    Quest,
+    QuestGenerationResponse,
     SpecialAbility,
 )
 
 __all__ = [
+    "Act",
+    "GamePlanResponse",
     "Monster",
     "MonsterAction",
     "MonsterGenerationResponse",
     "MonsterRegistry",
+    "Quest",
+    "QuestGenerationResponse",
     "SpecialAbility",
 ]
@@ -3,9 +3,58 @@ Pydantic schemas for game entities.
 These provide automatic validation and type conversion from JSON.
 """
 
-from typing import List, Optional
+import re
+from typing import Any, List, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator
+
+# Values of the roman numerals an LLM may number acts with ("Act II")
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50}
+_ACT_NUMBER_RE = re.compile(r"\b(\d+|[ivxl]+)\b", re.IGNORECASE)
+
+
+def _to_text(v: Any) -> Any:
+    """Coerce a value an LLM sent for a text field (a list of lines, a number, null) to str"""
+    if v is None:
+        return ""
+    if isinstance(v, (list, tuple)):
+        return ", ".join(str(item) for item in v)
+    if isinstance(v, (int, float)):
+        return str(v)
+    return v
+
+
+def _to_text_list(v: Any) -> Any:
+    """Coerce a value an LLM sent for a list-of-text field (a single string, null) to a list"""
+    if v is None:
+        return []
+    if isinstance(v, str):
+        return [v] if v.strip() else []
+    if isinstance(v, (list, tuple)):
+        return [item if isinstance(item, str) else str(item) for item in v]
+    return v
+
+
+def _to_act_number(v: Any) -> Optional[int]:
+    """Read an act number like 2, "2", "Act 2" or "Act II"; None if there is none"""
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float):
+        return int(v) if v.is_integer() else None
+    match = _ACT_NUMBER_RE.search(str(v))
+    if match is None:
+        return None
+    token = match.group(1).lower()
+    if token.isdigit():
+        return int(token)
+    total = 0
+    for i, numeral in enumerate(token):
+        value = _ROMAN_VALUES[numeral]
+        following = _ROMAN_VALUES[token[i + 1]] if i + 1 < len(token) else 0
+        total += -value if value < following else value
+    return total or None
 
 
 class SpecialAbility(BaseModel):
@@ -138,6 +187,177 @@ class MonsterGenerationResponse(BaseModel):
         return cls.model_validate_json(json_str)
 
 
+class Act(BaseModel):
+    """
+    Act of a game plan.
+
+    Covers both the standard and the RAG game plan schemas, so only act_title is required.
+    The game plan prompt asks for short keys to save completion tokens; they are accepted
+    as aliases and dumped under the full field names.
+    """
+
+    act_title: str = Field(validation_alias=AliasChoices("act_title", "title"))
+    act_number: Optional[int] = None
+    narrative_goal: str = Field(default="", validation_alias=AliasChoices("narrative_goal", "goal"))
+    primary_conflict: str = Field(
+        default="", validation_alias=AliasChoices("primary_conflict", "conflict")
+    )
+    stakes: str = ""
+    entry_requirements: str = Field(
+        default="", validation_alias=AliasChoices("entry_requirements", "entry")
+    )
+    exit_conditions: str = Field(
+        default="", validation_alias=AliasChoices("exit_conditions", "exit")
+    )
+    act_summary: str = Field(default="", validation_alias=AliasChoices("act_summary", "summary"))
+    key_locations: List[str] = Field(
+        default_factory=list, validation_alias=AliasChoices("key_locations", "locations")
+    )
+    mechanics_or_features_introduced: List[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices("mechanics_or_features_introduced", "mechanics"),
+    )
+    key_milestones: List[str] = Field(default_factory=list)
+    handoff_notes_for_next_stage: List[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices("handoff_notes_for_next_stage", "handoff"),
+    )
+
+    # Keep extra fields the LLM adds
+    model_config = ConfigDict(extra="allow")
+
+    @field_validator(
+        "act_title",
+        "narrative_goal",
+        "primary_conflict",
+        "stakes",
+        "entry_requirements",
+        "exit_conditions",
+        "act_summary",
+        mode="before",
+    )
+    @classmethod
+    def ensure_text(cls, v):
+        """Accept numbers and lists of lines for text fields"""
+        return _to_text(v)
+
+    @field_validator(
+        "key_locations",
+        "mechanics_or_features_introduced",
+        "key_milestones",
+        "handoff_notes_for_next_stage",
+        mode="before",
+    )
+    @classmethod
+    def ensure_list(cls, v):
+        """Accept a single string (or null) for list fields"""
+        return _to_text_list(v)
+
+    @field_validator("act_number", mode="before")
+    @classmethod
+    def ensure_act_number(cls, v):
+        """Accept act numbers written as "Act 2" or "II" """
+        return _to_act_number(v)
+
+
+class GamePlanResponse(BaseModel):
+    """Response schema for game plan generation"""
+
+    title: str = ""
+    # Acts are validated one at a time (see Act), so one malformed act is skipped
+    # instead of failing the whole plan
+    acts: List[Any]
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class Quest(BaseModel):
+    """
+    Quest generated for an act.
+
+    Covers both the standard quest schema (quest_name, ...) and the RAG one (act,
+    quest_title, ...), so every field is optional. Short keys from the quest prompt are
+    accepted as aliases and dumped under the full field names.
+    """
+
+    act: Optional[int] = None
+    quest_type: str = Field(default="", validation_alias=AliasChoices("quest_type", "type"))
+    difficulty: str = ""
+    estimated_sessions: Optional[Union[int, str]] = Field(
+        default=None, validation_alias=AliasChoices("estimated_sessions", "sessions")
+    )
+    quest_name: str = Field(default="", validation_alias=AliasChoices("quest_name", "name"))
+    quest_title: str = ""
+    description: str = Field(default="", validation_alias=AliasChoices("description", "desc"))
+    prerequisites: str = Field(
+        default="", validation_alias=AliasChoices("prerequisites", "prereqs")
+    )
+    rewards: Union[str, List[str]] = ""
+    outcomes: str = ""
+    key_npcs: List[str] = Field(
+        default_factory=list, validation_alias=AliasChoices("key_npcs", "npcs")
+    )
+    locations: List[str] = Field(default_factory=list)
+    objectives: List[str] = Field(default_factory=list)
+
+    # Keep extra fields the LLM adds
+    model_config = ConfigDict(extra="allow")
+
+    @field_validator(
+        "quest_type",
+        "difficulty",
+        "quest_name",
+        "quest_title",
+        "description",
+        "prerequisites",
+        "outcomes",
+        mode="before",
+    )
+    @classmethod
+    def ensure_text(cls, v):
+        """Accept numbers and lists of lines for text fields"""
+        return _to_text(v)
+
+    @field_validator("key_npcs", "locations", "objectives", mode="before")
+    @classmethod
+    def ensure_list(cls, v):
+        """Accept a single string (or null) for list fields"""
+        return _to_text_list(v)
+
+    @field_validator("rewards", mode="before")
+    @classmethod
+    def ensure_rewards(cls, v):
+        """Accept a number or null for rewards"""
+        if v is None or isinstance(v, list):
+            return _to_text_list(v)
+        return _to_text(v)
+
+    @field_validator("estimated_sessions", mode="before")
+    @classmethod
+    def ensure_sessions(cls, v):
+        """Keep whole numbers as int and anything else ("2-3", 1.5) as text"""
+        if isinstance(v, float):
+            return int(v) if v.is_integer() else str(v)
+        return v
+
+    @field_validator("act", mode="before")
+    @classmethod
+    def ensure_act_number(cls, v):
+        """Accept act numbers written as "Act 2" or "II" """
+        return _to_act_number(v)
+
+
+class QuestGenerationResponse(BaseModel):
+    """Response schema for quest generation"""
+
+    act_title: str = ""
+    # Quests are validated one at a time (see Quest), so one malformed quest is skipped
+    # instead of failing the whole batch
+    quests: List[Any]
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class MonsterRegistry:
     """
     Registry for looking up monsters by various identifiers.
@@ -2,6 +2,7 @@
 Service layer for external integrations and utilities
 """
 
+from services.batch import areap_batch, reap_batch, submit_batch
 from services.cache import (
     cache_response,
     cleanup_expired_cache,
@@ -10,11 +11,14 @@ from services.cache import (
     get_cached_response,
 )
 from services.character import generate_npc_portrait
-from services.pinecone import PineconeService, pinecone_service
+from services.pinecone import PineconeService, get_pinecone_service
 from services.rag import RAGService, get_rag_service
 from services.trajectory import TrajectoryLogger
 
 __all__ = [
+    "areap_batch",
+    "reap_batch",
+    "submit_batch",
     "cache_response",
     "cleanup_expired_cache",
     "clear_llm_cache",
@@ -22,7 +26,7 @@ __all__ = [
     "get_cached_response",
     "generate_npc_portrait",
     "PineconeService",
-    "pinecone_service",
+    "get_pinecone_service",
     "RAGService",
     "get_rag_service",
     "TrajectoryLogger",
@@ -0,0 +1,267 @@
+"""
+Offline batch generation through the provider batch APIs.
+
+Bulk jobs (regenerating every campaign's quests overnight, precomputing variants, ...) are
+throughput-bound rather than latency-bound. The OpenAI Batch API and the Gemini Batch Mode
+run the same requests at roughly half the price and outside the regular rate limits, with
+results delivered within the completion window.
+
+Both are used through one interface (BatchBackend), picked by the same provider name as the
+live model (core.model.MODEL_TYPE), so batched and live responses come from the same model.
+"""
+
+import asyncio
+import io
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import orjson
+from openai import OpenAI
+
+# Batch settings
+BATCH_POLL_INTERVAL = 60  # Seconds between status checks while waiting for a batch
+
+# OpenAI Batch API settings
+OPENAI_BATCH_ENDPOINT = "/v1/chat/completions"
+OPENAI_BATCH_COMPLETION_WINDOW = "24h"
+OPENAI_BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Gemini Batch Mode job states after which a job no longer changes
+GEMINI_BATCH_TERMINAL_STATES = (
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+)
+
+
+class BatchBackend:
+    """Common interface of the provider batch APIs"""
+
+    def submit(
+        self,
+        requests: Dict[str, List[Dict[str, str]]],
+        model: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Submit chat requests (custom_id -> messages) as one job and return its id"""
+        raise NotImplementedError
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Check a job once without waiting.
+
+        Returns None while the job is still running, and the mapping of custom_id to
+        response text once it has finished. Requests that failed are reported and left out.
+        """
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Batch jobs through the OpenAI Batch API (JSONL file of chat completions)"""
+
+    def __init__(self):
+        self.client = OpenAI()
+
+    def submit(self, requests, model, max_tokens=None, temperature=None):
+        lines = []
+        for custom_id, messages in requests.items():
+            body = {"model": model, "messages": messages}
+            if max_tokens is not None:
+                body["max_tokens"] = max_tokens
+            if temperature is not None:
+                body["temperature"] = temperature
+            lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": OPENAI_BATCH_ENDPOINT,
+                        "body": body,
+                    }
+                )
+            )
+
+        input_file = self.client.files.create(
+            file=("batch_requests.jsonl", io.BytesIO(b"\n".join(lines))), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=OPENAI_BATCH_ENDPOINT,
+            completion_window=OPENAI_BATCH_COMPLETION_WINDOW,
+        )
+        print(f"Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+
+    def poll(self, batch_id):
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status not in OPENAI_BATCH_TERMINAL_STATUSES:
+            return None
+        if batch.status != "completed":
+            print(f"Batch {batch_id} ended with status '{batch.status}'")
+
+        results = {}
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id).content
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    print(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                    continue
+                choices = response.get("body", {}).get("choices", [])
+                if choices:
+                    results[record["custom_id"]] = choices[0]["message"]["content"]
+
+        if batch.error_file_id:
+            print(f"Batch {batch_id} has per-request errors in file {batch.error_file_id}")
+        return results
+
+
+class GeminiBatchBackend(BatchBackend):
+    """Batch jobs through Gemini Batch Mode (inline generateContent requests)"""
+
+    def __init__(self):
+        # Installed with langchain-google-genai; only needed when batching on Gemini
+        from google import genai
+
+        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY", ""))
+
+    @staticmethod
+    def _request(
+        custom_id: str,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+    ) -> Dict[str, Any]:
+        """Convert chat messages to an inline generateContent request tagged with custom_id"""
+        config: Dict[str, Any] = {}
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        if system:
+            config["system_instruction"] = system
+        if max_tokens is not None:
+            config["max_output_tokens"] = max_tokens
+        if temperature is not None:
+            config["temperature"] = temperature
+        contents = [
+            {
+                "role": "model" if m["role"] == "assistant" else "user",
+                "parts": [{"text": m["content"]}],
+            }
+            for m in messages
+            if m["role"] != "system"
+        ]
+        return {"contents": contents, "config": config, "metadata": {"custom_id": custom_id}}
+
+    def submit(self, requests, model, max_tokens=None, temperature=None):
+        inline_requests = [
+            self._request(custom_id, messages, max_tokens, temperature)
+            for custom_id, messages in requests.items()
+        ]
+        job = self.client.batches.create(model=model, src=inline_requests)
+        print(f"Submitted batch {job.name} with {len(inline_requests)} requests")
+        return job.name
+
+    def poll(self, batch_id):
+        job = self.client.batches.get(name=batch_id)
+        if job.state not in GEMINI_BATCH_TERMINAL_STATES:
+            return None
+        if job.state != "JOB_STATE_SUCCEEDED":
+            print(f"Batch {batch_id} ended with state '{job.state}'")
+
+        results = {}
+        responses = (job.dest.inlined_responses if job.dest else None) or []
+        for inline_response in responses:
+            custom_id = (inline_response.metadata or {}).get("custom_id")
+            if inline_response.error or inline_response.response is None:
+                print(f"Batch request {custom_id} failed: {inline_response.error}")
+                continue
+            results[custom_id] = inline_response.response.text
+        return results
+
+
+# Batch backend for each provider name used by core.model.MODEL_TYPE
+BATCH_BACKENDS = {"OPENAI": OpenAIBatchBackend, "GEMINI": GeminiBatchBackend}
+
+_backends: Dict[str, BatchBackend] = {}
+
+
+def get_batch_backend(provider: str) -> BatchBackend:
+    """Get or create the batch backend for a provider, e.g. core.model.MODEL_TYPE"""
+    backend = _backends.get(provider)
+    if backend is None:
+        if provider not in BATCH_BACKENDS:
+            raise ValueError(
+                f"No batch backend for provider '{provider}'. "
+                f"Supported providers: {', '.join(BATCH_BACKENDS)}"
+            )
+        backend = _backends[provider] = BATCH_BACKENDS[provider]()
+    return backend
+
+
+def submit_batch(
+    requests: Dict[str, List[Dict[str, str]]],
+    provider: str,
+    model: str,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+) -> str:
+    """
+    Submit chat requests as a single batch job.
+
+    Args:
+        requests: Mapping of custom_id to chat messages (e.g. from core.prompt.render_*)
+        provider: Provider to run the job on ("OPENAI" or "GEMINI", as core.model.MODEL_TYPE)
+        model: Model to run the requests on
+        max_tokens: Optional completion token limit per request
+        temperature: Optional sampling temperature
+
+    Returns:
+        The batch id, to be passed to reap_batch or areap_batch with the same provider
+    """
+    return get_batch_backend(provider).submit(requests, model, max_tokens, temperature)
+
+
+def reap_batch(
+    batch_id: str, provider: str, poll_interval: float = BATCH_POLL_INTERVAL
+) -> Dict[str, str]:
+    """
+    Wait for a batch job to finish and collect its responses.
+
+    This blocks the calling thread; use areap_batch from async code.
+
+    Args:
+        batch_id: Id returned by submit_batch
+        provider: Provider the job was submitted to
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Mapping of custom_id to the response text. Requests that failed inside the batch
+        are reported and left out.
+    """
+    backend = get_batch_backend(provider)
+    results = backend.poll(batch_id)
+    while results is None:
+        time.sleep(poll_interval)
+        results = backend.poll(batch_id)
+    return results
+
+
+async def areap_batch(
+    batch_id: str, provider: str, poll_interval: float = BATCH_POLL_INTERVAL
+) -> Dict[str, str]:
+    """
+    Async variant of reap_batch: status checks run in a worker thread and the wait between
+    them yields to the event loop.
+    """
+    backend = get_batch_backend(provider)
+    results = await asyncio.to_thread(backend.poll, batch_id)
+    while results is None:
+        await asyncio.sleep(poll_interval)
+        results = await asyncio.to_thread(backend.poll, batch_id)
+    return results
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
+
 
 class LLMCache:
     """File-based cache for LLM responses"""
@@ -51,8 +53,8 @@ class LLMCache:
             return None
 
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
+            # Cache hits are read on every LLM call, so parse the raw bytes with orjson
+            cached_data = orjson.loads(cache_file.read_bytes())
 
             # Check if cache is expired
             cached_time = datetime.fromisoformat(cached_data["timestamp"])
@@ -65,7 +67,7 @@ class LLMCache:
 
             return cached_data["response"]
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
             # Corrupted cache file, remove it
             print(f"Warning: Corrupted cache file {cache_file}, removing: {e}")
             cache_file.unlink()
@@ -10,12 +10,19 @@ It provides vector storage capabilities for:
 - Session notes and outcomes
 """
 
+import asyncio
 import os
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from openai import OpenAI
+import httpx
+import numpy as np
+import tiktoken
+from openai import AsyncOpenAI, OpenAI
 from pinecone import Pinecone
 from pydantic import BaseModel
 
@@ -36,8 +43,58 @@ PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT", "us-east-1")
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "agentictabletop-campaigns")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Initialize OpenAI client for embeddings
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Embedding configuration. text-embedding-3-small can return shortened vectors, so a
+# smaller EMBEDDING_DIM (e.g. 512) cuts storage and query cost. The index dimension must
+# match: existing 1536-d indexes keep the default, new deployments can opt into 512.
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1536"))
+
+# Number of query embeddings kept in memory (stored as float32); 0 disables the cache
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
+# OpenAI embedding request limits
+EMBEDDING_MAX_INPUT_TOKENS = 8191
+EMBEDDING_MAX_REQUEST_TOKENS = 250_000
+EMBEDDING_MAX_REQUEST_ITEMS = 2048
+
+# Maximum texts per embedding request on the async path
+EMBEDDING_BATCH_SIZE = 256
+
+# Connection pool sizes shared by the OpenAI HTTP client and the Pinecone index
+HTTP_POOL_SIZE = 50
+PINECONE_POOL_THREADS = 30
+
+# Initialize OpenAI client for embeddings on a persistent HTTP/2 keep-alive pool
+openai_client = (
+    OpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE
+            ),
+            timeout=30,
+        ),
+    )
+    if OPENAI_API_KEY
+    else None
+)
+
+# Async client for embedding requests issued from the event loop
+async_openai_client = (
+    AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE
+            ),
+            timeout=30,
+        ),
+    )
+    if OPENAI_API_KEY
+    else None
+)
 
 # Initialize Pinecone
 if PINECONE_API_KEY:
@@ -45,6 +102,29 @@ if PINECONE_API_KEY:
 else:
     pc = None
 
+# Maximum number of vectors sent per upsert request
+UPSERT_BATCH_SIZE = 100
+
+# Vector ID prefixes per record type
+CAMPAIGN_ID_PREFIX = "campaign_"
+QUEST_ID_PREFIX = "quest_"
+
+# Record types stored per campaign, removed together by delete_campaign
+CAMPAIGN_RECORD_TYPES = ["campaign", "quest", "npc", "session"]
+
+# Base query filters per record type. Never mutate these: they are passed to the client
+# as-is (a plain dict, since the client's request models type-check the filter)
+_CAMPAIGN_FILTER = {"type": "campaign"}
+_QUEST_FILTER = {"type": "quest"}
+
+# Metadata preview size in bytes; the full text is already encoded in the vector
+METADATA_PREVIEW_BYTES = 128
+
+
+def _metadata_preview(text: str) -> str:
+    """Truncate text to METADATA_PREVIEW_BYTES without splitting a multibyte character"""
+    return text.encode("utf-8")[:METADATA_PREVIEW_BYTES].decode("utf-8", errors="ignore")
+
 
 class CampaignDocument(BaseModel):
     """Document model for storing campaign data in Pinecone"""
@@ -116,37 +196,168 @@ class SessionDocument(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
+def _read_tags(tags: Any) -> List[str]:
+    """Read tags metadata, accepting legacy comma-joined strings from older records"""
+    if isinstance(tags, str):
+        return tags.split(",") if tags else []
+    return list(tags) if tags else []
+
+
+# Return shape of pc.list_indexes() for the installed client version, detected once
+_LIST_INDEXES_STYLE: Optional[str] = None
+
+
+def _detect_list_indexes_style(index_list: Any) -> str:
+    """Detect (and memoize) how to read index names from a list_indexes() result"""
+    global _LIST_INDEXES_STYLE
+    if _LIST_INDEXES_STYLE is None:
+        if hasattr(index_list, "names"):
+            _LIST_INDEXES_STYLE = "names_method"
+        elif isinstance(index_list, list):
+            _LIST_INDEXES_STYLE = "list_of_objs"
+        elif hasattr(index_list, "__iter__"):
+            _LIST_INDEXES_STYLE = "iterable"
+        else:
+            _LIST_INDEXES_STYLE = "unknown"
+    return _LIST_INDEXES_STYLE
+
+
+def _index_names(index_list: Any) -> List[str]:
+    """Extract index names from a list_indexes() result (compatible with v3.x and v5.x)"""
+    style = _detect_list_indexes_style(index_list)
+    if style == "names_method":
+        return index_list.names()
+    if style in ("list_of_objs", "iterable"):
+        return [idx.name if hasattr(idx, "name") else str(idx) for idx in index_list]
+    return []
+
+
+def _dedupe_for_embedding(texts: List[str]) -> Dict[str, int]:
+    """
+    Assign each distinct text a position, so repeated texts are embedded once and fanned
+    back out. Texts are compared and embedded exactly as given: stored vectors were
+    embedded from the original text, so queries must be too.
+    """
+    unique: Dict[str, int] = {}
+    for text in texts:
+        unique.setdefault(text, len(unique))
+    return unique
+
+
+@lru_cache(maxsize=1)
+def _get_encoder() -> Optional["tiktoken.Encoding"]:
+    """
+    Tokenizer for the embedding model, loaded once.
+
+    tiktoken downloads the BPE file on first use; if that fails (e.g. offline), None is
+    returned and token counts are estimated instead.
+    """
+    try:
+        return tiktoken.encoding_for_model(EMBEDDING_MODEL)
+    except Exception as e:
+        print(f"Warning: Could not load the {EMBEDDING_MODEL} tokenizer, estimating tokens: {e}")
+        return None
+
+
+def preload_embedding_encoder() -> None:
+    """Load the embedding tokenizer in a background thread, e.g. at server startup"""
+    threading.Thread(target=_get_encoder, name="tiktoken-preload", daemon=True).start()
+
+
+def _pack_batches(
+    texts: List[str],
+    max_tokens: int = EMBEDDING_MAX_REQUEST_TOKENS,
+    max_items: int = EMBEDDING_MAX_REQUEST_ITEMS,
+) -> List[List[str]]:
+    """
+    Greedily pack texts, in order, into batches that fit the embedding request limits.
+
+    Texts longer than EMBEDDING_MAX_INPUT_TOKENS are truncated, since the API would
+    otherwise reject the whole request. Without the tokenizer, a text's UTF-8 length is
+    used as its token count, which never undercounts (every token is at least one byte).
+    """
+    encoder = _get_encoder()
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    batch_tokens = 0
+
+    for text in texts:
+        if encoder is not None:
+            # encode_ordinary skips the special-token scan; these are plain texts
+            tokens = encoder.encode_ordinary(text)
+            if len(tokens) > EMBEDDING_MAX_INPUT_TOKENS:
+                tokens = tokens[:EMBEDDING_MAX_INPUT_TOKENS]
+                text = encoder.decode(tokens)
+            token_count = len(tokens)
+        else:
+            data = text.encode("utf-8")
+            if len(data) > EMBEDDING_MAX_INPUT_TOKENS:
+                data = data[:EMBEDDING_MAX_INPUT_TOKENS]
+                text = data.decode("utf-8", errors="ignore")
+            token_count = len(data)
+
+        if batch and (batch_tokens + token_count > max_tokens or len(batch) >= max_items):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+
+        batch.append(text)
+        batch_tokens += token_count
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+# Searchable text builders keyed by document class (avoids an isinstance chain per call)
+_SEARCHABLE_TEXT_FORMATTERS = {
+    CampaignDocument: lambda d: f"{d.title} {d.background} {d.theme} {' '.join(d.tags)}",
+    QuestDocument: lambda d: (
+        f"{d.quest_name} {d.description} {d.quest_type} {' '.join(d.objectives)}"
+    ),
+    NPCDocument: lambda d: f"{d.name} {d.description} {d.role} {' '.join(d.motivations)}",
+    SessionDocument: lambda d: f"{d.summary} {d.notes} {' '.join(d.outcomes)}",
+}
+
+
 class PineconeService:
     """Service class for managing Pinecone operations"""
 
     def __init__(self):
-        self.index = None
-        self._initialize_index()
+        # Shared by request threads, so every access holds _emb_cache_lock
+        self._emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._emb_cache_lock = threading.Lock()
+        self._index = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def index(self):
+        """
+        Pinecone index, connected on first use rather than at construction.
+
+        Only a successful connection is kept; after a failure the next access tries again.
+        """
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = self._initialize_index()
+        return self._index
 
     def _initialize_index(self):
         """Initialize Pinecone index"""
         if not pc:
             print("Warning: Pinecone not configured. Set PINECONE_API_KEY environment variable.")
-            return
+            return None
 
         try:
             # Check if index exists (compatible with both v3.x and v5.x)
-            index_list = pc.list_indexes()
-            index_names = []
-
-            # Handle different return types from list_indexes()
-            if hasattr(index_list, "names"):
-                index_names = index_list.names()
-            elif isinstance(index_list, list):
-                index_names = [idx.name if hasattr(idx, "name") else str(idx) for idx in index_list]
-            elif hasattr(index_list, "__iter__"):
-                index_names = [idx.name if hasattr(idx, "name") else str(idx) for idx in index_list]
+            index_names = _index_names(pc.list_indexes())
 
             if PINECONE_INDEX_NAME not in index_names:
                 # Create index if it doesn't exist (compatible with both v3.x and v5.x)
                 create_params = {
                     "name": PINECONE_INDEX_NAME,
-                    "dimension": 1536,  # OpenAI embedding dimension
+                    "dimension": EMBEDDING_DIM,  # Must match the requested embedding size
                     "metric": "cosine",
                 }
 
@@ -161,59 +372,207 @@ class PineconeService:
                 pc.create_index(**create_params)
                 print(f"Created Pinecone index: {PINECONE_INDEX_NAME}")
 
-            self.index = pc.Index(PINECONE_INDEX_NAME)
+            # pool_threads backs the async_req upserts in store_campaign_bulk
+            index = pc.Index(PINECONE_INDEX_NAME, pool_threads=PINECONE_POOL_THREADS)
             print(f"Connected to Pinecone index: {PINECONE_INDEX_NAME}")
+            return index
 
         except Exception as e:
             print(f"Error initializing Pinecone: {e}")
             import traceback
 
             traceback.print_exc()
-            self.index = None
+            return None
 
     def _get_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI"""
         if not openai_client:
             raise ValueError("OpenAI API key not configured")
 
+        with self._emb_cache_lock:
+            cached = self._emb_cache.get(text)
+            if cached is not None:
+                self._emb_cache.move_to_end(text)
+        if cached is not None:
+            return cached.tolist()
+
         try:
-            response = openai_client.embeddings.create(model="text-embedding-3-small", input=text)
-            return response.data[0].embedding
+            response = openai_client.embeddings.create(
+                model=EMBEDDING_MODEL, input=text, dimensions=EMBEDDING_DIM
+            )
+            embedding = response.data[0].embedding
         except Exception as e:
             print(f"Error generating embedding: {e}")
             raise
 
+        # Round to float32, the precision Pinecone stores, so a miss returns exactly the
+        # values a later cache hit will
+        vector = np.asarray(embedding, dtype=np.float32)
+        self._cache_embedding(text, vector)
+        return vector.tolist()
+
+    def _cache_embedding(self, text: str, vector: np.ndarray) -> None:
+        """Store a float32 embedding in the bounded LRU cache"""
+        if EMBEDDING_CACHE_SIZE <= 0:
+            return
+
+        # float32 takes 4 bytes per value versus ~32 for a boxed Python float
+        with self._emb_cache_lock:
+            self._emb_cache[text] = vector
+            self._emb_cache.move_to_end(text)
+            if len(self._emb_cache) > EMBEDDING_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+
+    def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts using as few OpenAI requests as the limits allow"""
+        if not openai_client:
+            raise ValueError("OpenAI API key not configured")
+
+        if not texts:
+            return []
+
+        unique = _dedupe_for_embedding(texts)
+
+        # Batches are packed in input order, so concatenating results preserves positions
+        embeddings = []
+        try:
+            for batch in _pack_batches(list(unique)):
+                response = openai_client.embeddings.create(
+                    model=EMBEDDING_MODEL, input=batch, dimensions=EMBEDDING_DIM
+                )
+                embeddings.extend(
+                    item.embedding for item in sorted(response.data, key=lambda item: item.index)
+                )
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            raise
+
+        return [embeddings[unique[text]] for text in texts]
+
+    async def _aget_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings concurrently, one request per token-packed batch of texts"""
+        if not async_openai_client:
+            raise ValueError("OpenAI API key not configured")
+
+        if not texts:
+            return []
+
+        unique = _dedupe_for_embedding(texts)
+        # Tokenizing (and a first-use tokenizer download) is blocking work; keep it off the loop
+        chunks = await asyncio.to_thread(
+            _pack_batches, list(unique), EMBEDDING_MAX_REQUEST_TOKENS, EMBEDDING_BATCH_SIZE
+        )
+
+        try:
+            responses = await asyncio.gather(
+                *(
+                    async_openai_client.embeddings.create(
+                        model=EMBEDDING_MODEL, input=chunk, dimensions=EMBEDDING_DIM
+                    )
+                    for chunk in chunks
+                )
+            )
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            raise
+
+        # gather preserves chunk order; within a chunk, order by each result's input position
+        embeddings = []
+        for response in responses:
+            embeddings.extend(
+                item.embedding for item in sorted(response.data, key=lambda item: item.index)
+            )
+        return [embeddings[unique[text]] for text in texts]
+
     def _create_searchable_text(self, document: BaseModel) -> str:
         """Create searchable text from document"""
-        if isinstance(document, CampaignDocument):
-            return (
-                f"{document.title} {document.background} {document.theme} {' '.join(document.tags)}"
-            )
-        elif isinstance(document, QuestDocument):
-            return f"{document.quest_name} {document.description} {document.quest_type} {' '.join(document.objectives)}"
-        elif isinstance(document, NPCDocument):
-            return f"{document.name} {document.description} {document.role} {' '.join(document.motivations)}"
-        elif isinstance(document, SessionDocument):
-            return f"{document.summary} {document.notes} {' '.join(document.outcomes)}"
-        else:
-            return str(document)
+        return _SEARCHABLE_TEXT_FORMATTERS.get(type(document), str)(document)
 
-    def store_campaign(
+    def _create_quest_document(
+        self,
+        quest_data: Dict[str, Any],
+        campaign_id: str,
+        act_title: str,
+        created_at: Optional[datetime] = None,
+    ) -> QuestDocument:
+        """Build a quest document from raw quest data"""
+        return QuestDocument(
+            id=str(uuid.uuid4()),
+            campaign_id=campaign_id,
+            act_title=act_title,
+            quest_name=quest_data.get("name", "Unnamed Quest"),
+            quest_type=quest_data.get("type", ""),
+            description=quest_data.get("description", ""),
+            objectives=quest_data.get("objectives", []),
+            difficulty=quest_data.get("difficulty", ""),
+            estimated_time=str(quest_data.get("estimated_time", "")),
+            npcs=quest_data.get("npcs", []),
+            locations=quest_data.get("locations", []),
+            rewards=quest_data.get("rewards", ""),
+            prerequisites=quest_data.get("prerequisites", ""),
+            outcomes=quest_data.get("outcomes", ""),
+            created_at=created_at or datetime.utcnow(),
+            metadata=quest_data.get("metadata", {}),
+        )
+
+    def _campaign_vector(
+        self,
+        campaign_doc: CampaignDocument,
+        searchable_text: str,
+        embedding: List[float],
+        created_at_iso: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the Pinecone vector record for a campaign"""
+        return {
+            "id": CAMPAIGN_ID_PREFIX + campaign_doc.id,
+            "values": embedding,
+            "metadata": {
+                "type": "campaign",
+                "campaign_id": campaign_doc.id,
+                "title": campaign_doc.title,
+                "theme": campaign_doc.theme,
+                "created_at": created_at_iso or campaign_doc.created_at.isoformat(),
+                "user_id": campaign_doc.user_id or "",
+                # Stored as a native string list so it can be filtered with $in
+                "tags": list(campaign_doc.tags),
+                "preview": _metadata_preview(searchable_text),
+            },
+        }
+
+    def _quest_vector(
+        self,
+        quest_doc: QuestDocument,
+        searchable_text: str,
+        embedding: List[float],
+        created_at_iso: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the Pinecone vector record for a quest"""
+        return {
+            "id": QUEST_ID_PREFIX + quest_doc.id,
+            "values": embedding,
+            "metadata": {
+                "type": "quest",
+                "quest_id": quest_doc.id,
+                "campaign_id": quest_doc.campaign_id,
+                "act_title": quest_doc.act_title,
+                "quest_name": quest_doc.quest_name,
+                "quest_type": quest_doc.quest_type,
+                "difficulty": quest_doc.difficulty,
+                "created_at": created_at_iso or quest_doc.created_at.isoformat(),
+                "preview": _metadata_preview(searchable_text),
+            },
+        }
+
+    def _create_campaign_document(
         self,
         campaign_data: Dict[str, Any],
         user_id: Optional[str] = None,
         tags: Optional[List[str]] = None,
-    ) -> str:
-        """Store campaign data in Pinecone"""
-        if not self.index:
-            raise RuntimeError("Pinecone not initialized")
-
-        campaign_id = str(uuid.uuid4())
+    ) -> CampaignDocument:
+        """Build a campaign document from raw campaign data"""
         now = datetime.utcnow()
-
-        # Create campaign document
-        campaign_doc = CampaignDocument(
-            id=campaign_id,
+        return CampaignDocument(
+            id=str(uuid.uuid4()),
             title=campaign_data.get("title", "Untitled Campaign"),
             background=campaign_data.get("background", ""),
             theme=campaign_data.get("theme", ""),
@@ -226,90 +585,116 @@ class PineconeService:
             metadata=campaign_data.get("metadata", {}),
         )
 
-        # Create searchable text
-        searchable_text = self._create_searchable_text(campaign_doc)
+    def _prepare_campaign_records(
+        self, campaign_doc: CampaignDocument
+    ) -> Tuple[List[QuestDocument], List[str], str]:
+        """Build quest documents and the searchable texts to embed for a campaign"""
+        # One clock read and one ISO conversion for the whole campaign
+        now = campaign_doc.created_at
+        now_iso = now.isoformat()
+
+        # Quest ids use the same str(uuid4()) format as store_quest
+        quest_docs = [
+            self._create_quest_document(quest_data, campaign_doc.id, act_title, created_at=now)
+            for act_title, quests in campaign_doc.quests.items()
+            for quest_data in quests
+        ]
 
-        # Generate embedding
-        embedding = self._get_embedding(searchable_text)
+        texts = [self._create_searchable_text(campaign_doc)]
+        texts.extend(self._create_searchable_text(quest_doc) for quest_doc in quest_docs)
+        return quest_docs, texts, now_iso
 
-        # Store in Pinecone
-        self.index.upsert(
-            vectors=[
-                {
-                    "id": f"campaign_{campaign_id}",
-                    "values": embedding,
-                    "metadata": {
-                        "type": "campaign",
-                        "campaign_id": campaign_id,
-                        "title": campaign_doc.title,
-                        "theme": campaign_doc.theme,
-                        "created_at": now.isoformat(),
-                        "user_id": user_id or "",
-                        "tags": ",".join(campaign_doc.tags),
-                        "searchable_text": searchable_text[:1000],  # Truncate for metadata
-                    },
-                }
-            ]
+    def _upsert_campaign_records(
+        self,
+        campaign_doc: CampaignDocument,
+        quest_docs: List[QuestDocument],
+        texts: List[str],
+        embeddings: List[List[float]],
+        now_iso: str,
+    ) -> None:
+        """Upsert the campaign vector and its quest vectors in pipelined batches"""
+        vectors = [self._campaign_vector(campaign_doc, texts[0], embeddings[0], now_iso)]
+        vectors.extend(
+            self._quest_vector(quest_doc, text, embedding, now_iso)
+            for quest_doc, text, embedding in zip(quest_docs, texts[1:], embeddings[1:])
         )
 
-        # Store individual quests
-        for act_title, quests in campaign_doc.quests.items():
-            for quest_data in quests:
-                self.store_quest(quest_data, campaign_id, act_title)
+        # The client rejects async_req together with batch_size, so chunk here and
+        # let the index thread pool pipeline the requests
+        futures = [
+            self.index.upsert(vectors=vectors[i : i + UPSERT_BATCH_SIZE], async_req=True)
+            for i in range(0, len(vectors), UPSERT_BATCH_SIZE)
+        ]
+        for future in futures:
+            future.get()
 
-        return campaign_id
+    def store_campaign(
+        self,
+        campaign_data: Dict[str, Any],
+        user_id: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> str:
+        """Store campaign data in Pinecone"""
+        if not self.index:
+            raise RuntimeError("Pinecone not initialized")
 
-    def store_quest(self, quest_data: Dict[str, Any], campaign_id: str, act_title: str) -> str:
-        """Store individual quest data"""
+        campaign_doc = self._create_campaign_document(campaign_data, user_id, tags)
+        return self.store_campaign_bulk(campaign_doc)
+
+    def store_campaign_bulk(self, campaign_doc: CampaignDocument) -> str:
+        """
+        Store a campaign and all of its quests in one pass.
+
+        All searchable texts are embedded with a single OpenAI request, and the
+        resulting vectors are upserted in pipelined batches.
+        """
         if not self.index:
             raise RuntimeError("Pinecone not initialized")
 
-        quest_id = str(uuid.uuid4())
-        now = datetime.utcnow()
+        quest_docs, texts, now_iso = self._prepare_campaign_records(campaign_doc)
+        embeddings = self._get_embeddings_batch(texts)
+        self._upsert_campaign_records(campaign_doc, quest_docs, texts, embeddings, now_iso)
 
-        quest_doc = QuestDocument(
-            id=quest_id,
-            campaign_id=campaign_id,
-            act_title=act_title,
-            quest_name=quest_data.get("name", "Unnamed Quest"),
-            quest_type=quest_data.get("type", ""),
-            description=quest_data.get("description", ""),
-            objectives=quest_data.get("objectives", []),
-            difficulty=quest_data.get("difficulty", ""),
-            estimated_time=str(quest_data.get("estimated_time", "")),
-            npcs=quest_data.get("npcs", []),
-            locations=quest_data.get("locations", []),
-            rewards=quest_data.get("rewards", ""),
-            prerequisites=quest_data.get("prerequisites", ""),
-            outcomes=quest_data.get("outcomes", ""),
-            created_at=now,
-            metadata=quest_data.get("metadata", {}),
+        return campaign_doc.id
+
+    async def astore_campaign(
+        self,
+        campaign_data: Dict[str, Any],
+        user_id: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Async variant of store_campaign for use from request handlers.
+
+        Embedding chunks are requested concurrently, and both the first connection to the
+        index and the blocking Pinecone upserts run in a worker thread, so the event loop
+        is never blocked.
+        """
+        if not await asyncio.to_thread(lambda: self.index):
+            raise RuntimeError("Pinecone not initialized")
+
+        campaign_doc = self._create_campaign_document(campaign_data, user_id, tags)
+        quest_docs, texts, now_iso = self._prepare_campaign_records(campaign_doc)
+        embeddings = await self._aget_embeddings_batch(texts)
+        await asyncio.to_thread(
+            self._upsert_campaign_records, campaign_doc, quest_docs, texts, embeddings, now_iso
         )
 
+        return campaign_doc.id
+
+    def store_quest(self, quest_data: Dict[str, Any], campaign_id: str, act_title: str) -> str:
+        """Store individual quest data"""
+        if not self.index:
+            raise RuntimeError("Pinecone not initialized")
+
+        quest_doc = self._create_quest_document(quest_data, campaign_id, act_title)
+
         searchable_text = self._create_searchable_text(quest_doc)
         embedding = self._get_embedding(searchable_text)
 
-        self.index.upsert(
-            vectors=[
-                {
-                    "id": f"quest_{quest_id}",
-                    "values": embedding,
-                    "metadata": {
-                        "type": "quest",
-                        "quest_id": quest_id,
-                        "campaign_id": campaign_id,
-                        "act_title": act_title,
-                        "quest_name": quest_doc.quest_name,
-                        "quest_type": quest_doc.quest_type,
-                        "difficulty": quest_doc.difficulty,
-                        "created_at": now.isoformat(),
-                        "searchable_text": searchable_text[:1000],
-                    },
-                }
-            ]
-        )
+        self.index.upsert(vectors=[self._quest_vector(quest_doc, searchable_text, embedding)])
 
-        return quest_id
+        return quest_doc.id
 
     def search_campaigns(
         self, query: str, user_id: Optional[str] = None, limit: int = 10
@@ -321,10 +706,8 @@ class PineconeService:
         # Generate embedding for query
         query_embedding = self._get_embedding(query)
 
-        # Build filter
-        filter_dict = {"type": "campaign"}
-        if user_id:
-            filter_dict["user_id"] = user_id
+        # Build filter (the shared constant is only copied when a user filter is needed)
+        filter_dict = {**_CAMPAIGN_FILTER, "user_id": user_id} if user_id else _CAMPAIGN_FILTER
 
         # Search
         results = self.index.query(
@@ -338,9 +721,7 @@ class PineconeService:
                 "theme": match.metadata["theme"],
                 "created_at": match.metadata["created_at"],
                 "score": match.score,
-                "tags": (
-                    match.metadata.get("tags", "").split(",") if match.metadata.get("tags") else []
-                ),
+                "tags": _read_tags(match.metadata.get("tags")),
             }
             for match in results.matches
         ]
@@ -354,9 +735,9 @@ class PineconeService:
 
         query_embedding = self._get_embedding(query)
 
-        filter_dict = {"type": "quest"}
-        if campaign_id:
-            filter_dict["campaign_id"] = campaign_id
+        filter_dict = (
+            {**_QUEST_FILTER, "campaign_id": campaign_id} if campaign_id else _QUEST_FILTER
+        )
 
         results = self.index.query(
             vector=query_embedding, filter=filter_dict, top_k=limit, include_metadata=True
@@ -384,7 +765,7 @@ class PineconeService:
         # This would require storing the full campaign data separately
         # For now, we'll implement a basic version
         results = self.index.query(
-            vector=[0.0] * 1536,  # Dummy vector
+            vector=[0.0] * EMBEDDING_DIM,  # Dummy vector
             filter={"type": "campaign", "campaign_id": campaign_id},
             top_k=1,
             include_metadata=True,
@@ -401,11 +782,10 @@ class PineconeService:
             raise RuntimeError("Pinecone not initialized")
 
         try:
-            # Delete campaign vector
-            self.index.delete(filter={"type": "campaign", "campaign_id": campaign_id})
-
-            # Delete related quest vectors
-            self.index.delete(filter={"type": "quest", "campaign_id": campaign_id})
+            # Delete the campaign vector and every related record in one request
+            self.index.delete(
+                filter={"campaign_id": campaign_id, "type": {"$in": CAMPAIGN_RECORD_TYPES}}
+            )
 
             return True
         except Exception as e:
@@ -413,5 +793,18 @@ class PineconeService:
             return False
 
 
-# Global service instance
-pinecone_service = PineconeService()
+# Global service instance, created on first use so importing this module stays offline
+_pinecone_instance: Optional[PineconeService] = None
+
+
+def get_pinecone_service() -> PineconeService:
+    """
+    Get or create the global Pinecone service instance.
+
+    Returns:
+        PineconeService instance
+    """
+    global _pinecone_instance
+    if _pinecone_instance is None:
+        _pinecone_instance = PineconeService()
+    return _pinecone_instance
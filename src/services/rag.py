@@ -17,6 +17,13 @@ from pinecone import Pinecone, ServerlessSpec
 # Load environment variables
 load_dotenv()
 
+# PDF text cleanup patterns, compiled once: hyphenated line breaks, soft line breaks inside
+# sentences, runs of spaces/tabs, and runs of blank lines
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(\w)")
+_SOFT_BREAK_RE = re.compile(r"(?<![.!?;:])\n(?!\n)")
+_SPACE_RUN_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 
 class RAGService:
     """
@@ -105,10 +112,10 @@ class RAGService:
         raw = "\n".join(page.get_text() for page in doc)
 
         # Fix hyphenations and unwrap soft breaks
-        text = re.sub(r"(\w)-\n(\w)", r"\1\2", raw)
-        text = re.sub(r"(?<![.!?;:])\n(?!\n)", " ", text)
-        text = re.sub(r"[ \t]+", " ", text).strip()
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = _HYPHEN_BREAK_RE.sub(r"\1\2", raw)
+        text = _SOFT_BREAK_RE.sub(" ", text)
+        text = _SPACE_RUN_RE.sub(" ", text).strip()
+        text = _BLANK_LINES_RE.sub("\n\n", text)
 
         # Split into paragraphs, wrap to 120 chars
         paras = [p.strip() for p in text.split("\n\n") if p.strip()]
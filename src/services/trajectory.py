@@ -5,33 +5,152 @@ Logs all generated content (campaigns, quests, monsters) to timestamped files
 in a trajectory folder for analysis and debugging.
 """
 
-import json
-from datetime import datetime
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+# Pretty-printed like json.dumps(indent=2); non-string keys are written as strings
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# One compact record per line for the jsonl format
+_JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+# Log formats and the extension of their files: readable text blocks, or one JSON record
+# per event for analysis tools
+LOG_FORMATS = {"text": "log", "jsonl": "jsonl"}
+
+# Timestamp shown in the header and on each entry
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Longest part of a raw LLM response copied into an entry
+_RAW_RESPONSE_CHARS = 2000
+
+# Fixed lines of the text format, built once
+_SEPARATOR = "=" * 60
+_RAW_RESPONSE_HEADING = f"\n--- Raw Response (first {_RAW_RESPONSE_CHARS} chars) ---\n"
+
+# Log file flags: every write lands at the current end of the file, even when another
+# process (a session started in the same second) appends to the same log
+_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+# Bytes collected by the writer thread before they are written out; larger chunks bypass it
+_BUFFER_SIZE = 1 << 16
+
+# Entries that may wait for the writer thread before log calls start to block
+_QUEUE_SIZE = 1024
+
+# Longest time, in seconds, written entries wait in the file buffer before a flush
+_FLUSH_INTERVAL = 0.5
+
+# Queue markers, sent after the entries they apply to
+_FLUSH = object()
+_CLOSE = object()
 
 
 class TrajectoryLogger:
     """Logs generation trajectory to timestamped files"""
 
-    def __init__(self, trajectory_dir: str = "trajectory"):
+    def __init__(
+        self,
+        trajectory_dir: str = "trajectory",
+        enabled: bool = True,
+        dump_json: bool = True,
+        min_chars_response: int = 0,
+        log_format: str = "text",
+        in_memory: bool = False,
+        in_memory_capacity: int = 1000,
+    ):
+        """
+        Args:
+            trajectory_dir: Folder the session's log file is created in
+            enabled: Whether log calls record anything; can be switched at any time
+            dump_json: Whether entries include the full JSON of the parsed monsters
+            min_chars_response: Raw responses shorter than this are left out of the log
+            log_format: "text" for readable entries or "jsonl" for one JSON record per event
+            in_memory: Keep the most recent entries in memory instead of writing a file, e.g.
+                in tests and benchmarks; dump_to_disk saves them on demand
+            in_memory_capacity: Number of entries an in-memory logger keeps
+        """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(
+                f"Unknown log format {log_format!r}, expected one of {list(LOG_FORMATS)}"
+            )
+        self.log_format = log_format
+
+        # Create timestamp for this session; the header shows the same clock reading
+        self._started = time.localtime()
+        self.session_timestamp = time.strftime("%Y%m%d_%H%M%S", self._started)
+
+        self.enabled = enabled
+        self.dump_json = dump_json
+        self.min_chars_response = min_chars_response
+        # Hash of the last raw response written, so retries that get the same reply back
+        # do not dump it again
+        self._last_response_hash: Optional[int] = None
+
+        self._fd: Optional[int] = None
+        self._writer: Optional[threading.Thread] = None
+        if in_memory:
+            # No file, thread or system call: entries are kept in a bounded deque
+            self.trajectory_dir = None
+            self.log_file = None
+            self._ring: Optional[deque] = deque(maxlen=in_memory_capacity)
+            self._header = self._build_header()
+            return
+        self._ring = None
+
         self.trajectory_dir = Path(trajectory_dir)
         self.trajectory_dir.mkdir(parents=True, exist_ok=True)
+        self.log_file = (
+            self.trajectory_dir / f"generation_{self.session_timestamp}.{LOG_FORMATS[log_format]}"
+        )
+        self._header = self._build_header()
 
-        # Create timestamp for this session
-        self.session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = self.trajectory_dir / f"generation_{self.session_timestamp}.log"
+        # Keep a raw descriptor open for the whole session; entries collect in a 64 KiB
+        # buffer and reach the file in one write() per flush. Bytes are written as is, so
+        # orjson output needs no decode and re-encode.
+        self._fd = os.open(self.log_file, _OPEN_FLAGS, 0o644)
+        self._buffer = bytearray()
+        # Last error the writer thread hit, reported once and cleared by a good write
+        self._write_error: Optional[Exception] = None
+        atexit.register(self.close)
 
         # Initialize log file
-        self._write_header()
+        self._write_out(self._header)
 
-    def _write_header(self):
-        """Write header to log file"""
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write("=== AgenticTableTop Generation Trajectory ===\n")
-            f.write(f"Session Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Log File: {self.log_file}\n")
-            f.write("=" * 60 + "\n\n")
+        # Entries are built by the caller and written by one background thread, so
+        # generation code never waits on file I/O. Each queued entry is a tuple of byte
+        # chunks, so a large JSON dump is handed to the file without being copied into
+        # the rest of its entry.
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._drain, name="trajectory-writer", daemon=True)
+        self._writer.start()
+
+    def _build_header(self) -> bytes:
+        """Build the header that starts the log"""
+        if self.log_format == "jsonl":
+            header = orjson.dumps(
+                {
+                    "event": "session_start",
+                    "timestamp": time.mktime(self._started),
+                    "log_file": self.get_log_path(),
+                },
+                option=_JSONL_OPTIONS,
+            )
+        else:
+            header = (
+                "=== AgenticTableTop Generation Trajectory ===\n"
+                f"Session Started: {time.strftime(_TIMESTAMP_FORMAT, self._started)}\n"
+                f"Log File: {self.get_log_path()}\n"
+                f"{_SEPARATOR}\n\n"
+            ).encode()
+        return header
 
     def log_monster_generation(
         self,
@@ -45,48 +164,91 @@ class TrajectoryLogger:
         time_taken: Optional[float] = None,
     ):
         """Log monster generation attempt"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(f"\n{'=' * 60}\n")
-            f.write(f"MONSTER GENERATION - {timestamp}\n")
-            f.write(f"{'=' * 60}\n")
-            f.write(f"Quest: {quest_name}\n")
-            f.write(f"Quest Type: {quest_data.get('quest_type', 'Unknown')}\n")
-            f.write(f"Difficulty: {quest_data.get('difficulty', 'Unknown')}\n")
-            f.write(f"Success: {success}\n")
-
-            if tokens_used:
-                f.write(f"Tokens Used: {tokens_used}\n")
-            if time_taken:
-                f.write(f"Time Taken: {time_taken:.2f} seconds\n")
-
-            if success:
-                f.write(f"Monsters Generated: {len(monsters)}\n")
-                for i, monster in enumerate(monsters, 1):
-                    f.write(f"\n  Monster {i}:\n")
-                    f.write(f"    Name: {monster.get('name', 'Unknown')}\n")
-                    f.write(
-                        f"    Type: {monster.get('size', 'Unknown')} {monster.get('type', 'Unknown')}\n"
-                    )
-                    f.write(f"    CR: {monster.get('challenge_rating', 'Unknown')}\n")
-                    f.write(f"    HP: {monster.get('hit_points', 0)}\n")
-                    f.write(f"    AC: {monster.get('armor_class', 0)}\n")
-            else:
-                f.write(f"Error: {error}\n")
+        if not self.enabled:
+            return
+        response_chars = len(response_content)
+        repeated_response = False
+        if response_chars >= self.min_chars_response:
+            response_hash = hash(response_content)
+            repeated_response = response_hash == self._last_response_hash
+            self._last_response_hash = response_hash
+        if self.log_format == "jsonl":
+            record = {
+                "event": "monster_generation",
+                "timestamp": time.time(),
+                "quest": quest_name,
+                "quest_type": quest_data.get("quest_type"),
+                "difficulty": quest_data.get("difficulty"),
+                "success": success,
+                "error": error,
+                "tokens_used": tokens_used,
+                "time_taken": time_taken,
+                "monster_count": len(monsters) if success else 0,
+            }
+            if response_chars >= self.min_chars_response:
+                if repeated_response:
+                    record["response_repeated"] = True
+                else:
+                    record["response"] = response_content[:_RAW_RESPONSE_CHARS]
+                record["response_chars"] = response_chars
+            if self.dump_json and success and monsters:
+                record["monsters"] = monsters
+            self._put_record(record)
+            return
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
+
+        # Build the entry text first and queue it as one chunk
+        parts = []
+        append = parts.append
+        append(f"\n{_SEPARATOR}\nMONSTER GENERATION - {timestamp}\n{_SEPARATOR}\n")
+        append(f"Quest: {quest_name}\n")
+        append(f"Quest Type: {quest_data.get('quest_type', 'Unknown')}\n")
+        append(f"Difficulty: {quest_data.get('difficulty', 'Unknown')}\n")
+        append(f"Success: {success}\n")
 
-            f.write("\n--- Raw Response (first 2000 chars) ---\n")
-            f.write(response_content[:2000])
-            if len(response_content) > 2000:
-                f.write(f"\n... (truncated, {len(response_content)} total chars)")
-            f.write("\n")
+        if tokens_used:
+            append(f"Tokens Used: {tokens_used}\n")
+        if time_taken:
+            append(f"Time Taken: {time_taken:.2f} seconds\n")
 
-            if success and monsters:
-                f.write("\n--- Parsed Monster Data (JSON) ---\n")
-                f.write(json.dumps(monsters, indent=2, ensure_ascii=False))
-                f.write("\n")
+        if success:
+            append(f"Monsters Generated: {len(monsters)}\n")
+            for i, monster in enumerate(monsters, 1):
+                get = monster.get
+                append(
+                    f"\n  Monster {i}:\n"
+                    f"    Name: {get('name', 'Unknown')}\n"
+                    f"    Type: {get('size', 'Unknown')} {get('type', 'Unknown')}\n"
+                    f"    CR: {get('challenge_rating', 'Unknown')}\n"
+                    f"    HP: {get('hit_points', 0)}\n"
+                    f"    AC: {get('armor_class', 0)}\n"
+                )
+        else:
+            append(f"Error: {error}\n")
 
-            f.write("\n")
+        if response_chars >= self.min_chars_response:
+            append(_RAW_RESPONSE_HEADING)
+            if repeated_response:
+                append("(response identical to previous entry)")
+            elif response_chars > _RAW_RESPONSE_CHARS:
+                append(response_content[:_RAW_RESPONSE_CHARS])
+                append(f"\n... (truncated, {response_chars} total chars)")
+            else:
+                append(response_content)
+            append("\n")
+
+        if self.dump_json and success and monsters:
+            append("\n--- Parsed Monster Data (JSON) ---\n")
+            self._emit(
+                (
+                    "".join(parts).encode(),
+                    orjson.dumps(monsters, option=_JSON_DUMP_OPTIONS),
+                    b"\n\n",
+                )
+            )
+        else:
+            append("\n")
+            self._emit(("".join(parts).encode(),))
 
     def log_campaign_summary(
         self,
@@ -97,25 +259,191 @@ class TrajectoryLogger:
         monsters_by_quest: Dict[str, List[Dict[str, Any]]],
     ):
         """Log final campaign summary"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if not self.enabled:
+            return
+        if self.log_format == "jsonl":
+            record = {
+                "event": "campaign_summary",
+                "timestamp": time.time(),
+                "campaign": campaign_title,
+                "total_acts": total_acts,
+                "total_quests": total_quests,
+                "total_monsters": total_monsters,
+                "monster_counts": {
+                    quest_name: len(monsters) for quest_name, monsters in monsters_by_quest.items()
+                },
+            }
+            if self.dump_json:
+                record["monsters_by_quest"] = monsters_by_quest
+            self._put_record(record)
+            self.flush()
+            return
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
+
+        # Build the entry text first and queue it as one chunk
+        parts = []
+        append = parts.append
+        append(f"\n{_SEPARATOR}\nCAMPAIGN SUMMARY - {timestamp}\n{_SEPARATOR}\n")
+        append(f"Campaign: {campaign_title}\n")
+        append(f"Total Acts: {total_acts}\n")
+        append(f"Total Quests: {total_quests}\n")
+        append(f"Total Monsters: {total_monsters}\n")
+        append("\nMonsters by Quest:\n")
+
+        for quest_name, monsters in monsters_by_quest.items():
+            append(f"  {quest_name}: {len(monsters)} monster(s)\n")
+
+        if self.dump_json:
+            # The full dump can run to megabytes, so it is queued as its own chunk
+            append("\n--- Full Monster Data ---\n")
+            self._emit(
+                (
+                    "".join(parts).encode(),
+                    orjson.dumps(monsters_by_quest, option=_JSON_DUMP_OPTIONS),
+                    b"\n",
+                )
+            )
+        else:
+            self._emit(("".join(parts).encode(),))
+        # The summary closes a generation run, so make the whole log readable on disk now
+        self.flush()
+
+    def _put_record(self, record: Dict[str, Any]):
+        """Queue one event as a single JSON line"""
+        self._emit((orjson.dumps(record, option=_JSONL_OPTIONS),))
+
+    def _emit(self, chunks: Tuple[bytes, ...]):
+        """Hand an entry's byte chunks to the writer thread, or keep them in memory"""
+        if self._ring is not None:
+            self._ring.append(chunks)
+        elif self._writer.is_alive():
+            # Entries logged after close() are dropped instead of filling a queue nobody reads
+            self._queue.put(chunks)
+
+    def _write_out(self, data):
+        """Write bytes to the log file, continuing after partial writes"""
+        offset = 0
+        with memoryview(data) as view:
+            while offset < len(view):
+                offset += os.write(self._fd, view[offset:])
+
+    def _flush_buffer(self):
+        """Write out the bytes collected by the writer thread"""
+        if self._buffer:
+            self._write_out(self._buffer)
+            self._buffer.clear()
+            self._write_error = None
+
+    def _drain(self):
+        """
+        Collect queued entries in the write buffer until closed. Chunks of at least
+        _BUFFER_SIZE bytes are written straight to the file.
+
+        Written entries are flushed to the file at most _FLUSH_INTERVAL seconds after the
+        first of them, so the log on disk trails generation by no more than that.
+        """
+        log_queue = self._queue
+        unflushed_since = None
+        while True:
+            timeout = None
+            if unflushed_since is not None:
+                timeout = max(0.0, unflushed_since + _FLUSH_INTERVAL - time.monotonic())
+            try:
+                batch = [log_queue.get(timeout=timeout)]
+            except queue.Empty:
+                try:
+                    self._flush_buffer()
+                except Exception as e:
+                    self._buffer.clear()
+                    self._report_write_error(e)
+                unflushed_since = None
+                continue
+            while True:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            closing = _CLOSE in batch
+            try:
+                written = False
+                buffer = self._buffer
+                for item in batch:
+                    if type(item) is tuple:
+                        for chunk in item:
+                            if len(chunk) >= _BUFFER_SIZE:
+                                self._flush_buffer()
+                                self._write_out(chunk)
+                            else:
+                                buffer += chunk
+                                if len(buffer) >= _BUFFER_SIZE:
+                                    self._flush_buffer()
+                        written = True
+                if written and unflushed_since is None:
+                    unflushed_since = time.monotonic()
+                if (
+                    closing
+                    or _FLUSH in batch
+                    or (
+                        unflushed_since is not None
+                        and time.monotonic() - unflushed_since >= _FLUSH_INTERVAL
+                    )
+                ):
+                    self._flush_buffer()
+                    unflushed_since = None
+            except Exception as e:
+                # Drop what could not be written and keep draining, so log calls never
+                # block on a full queue and later entries still get a chance to land
+                self._buffer.clear()
+                unflushed_since = None
+                self._report_write_error(e)
+            finally:
+                # Mark the batch done even if the write failed, so flush() cannot hang on it
+                for _ in batch:
+                    log_queue.task_done()
+            if closing:
+                return
+
+    def _report_write_error(self, error: Exception):
+        """Warn about a failed log write once, until a later write succeeds"""
+        if self._write_error is None:
+            print(f"Warning: Could not write trajectory log {self.log_file}: {error}")
+        self._write_error = error
+
+    def flush(self):
+        """Wait until every logged entry is written and flushed to the log file"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def close(self):
+        """Write any queued entries, stop the writer thread and close the log file"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            # Closed loggers need no exit hook; dropping it lets them be freed
+            atexit.unregister(self.close)
 
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(f"\n{'=' * 60}\n")
-            f.write(f"CAMPAIGN SUMMARY - {timestamp}\n")
-            f.write(f"{'=' * 60}\n")
-            f.write(f"Campaign: {campaign_title}\n")
-            f.write(f"Total Acts: {total_acts}\n")
-            f.write(f"Total Quests: {total_quests}\n")
-            f.write(f"Total Monsters: {total_monsters}\n")
-            f.write("\nMonsters by Quest:\n")
+    def __enter__(self) -> "TrajectoryLogger":
+        return self
 
-            for quest_name, monsters in monsters_by_quest.items():
-                f.write(f"  {quest_name}: {len(monsters)} monster(s)\n")
+    def __exit__(self, *exc_info):
+        self.close()
 
-            f.write("\n--- Full Monster Data ---\n")
-            f.write(json.dumps(monsters_by_quest, indent=2, ensure_ascii=False))
-            f.write("\n")
+    def dump_to_disk(self, path: str):
+        """Write the header and the entries an in-memory logger has kept to a file"""
+        if self._ring is None:
+            raise ValueError("Only in-memory trajectory loggers keep their entries")
+        with open(path, "wb") as f:
+            f.write(self._header)
+            for chunks in self._ring:
+                f.writelines(chunks)
 
     def get_log_path(self) -> str:
         """Get the path to the current log file"""
+        if self.log_file is None:
+            return "(in memory)"
         return str(self.log_file)
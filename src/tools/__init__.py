@@ -4,11 +4,17 @@ Utility tools and helpers
 
 from tools.utils import (
     dice_roll,
+    dice_roll_many,
+    dice_roll_total,
+    expand_act,
     extract_json_from_response,
+    get_cached_tokens,
     get_monster_stat_block,
     get_total_tokens,
     interactive_combat_testing,
+    iter_json_array_items,
     parse_acts_result,
+    parse_dice,
     parse_monster_result,
     parse_quests_result,
     parse_storyteller_result,
@@ -17,11 +23,17 @@ from tools.utils import (
 
 __all__ = [
     "dice_roll",
+    "dice_roll_many",
+    "dice_roll_total",
+    "expand_act",
     "extract_json_from_response",
+    "get_cached_tokens",
     "get_monster_stat_block",
     "get_total_tokens",
     "interactive_combat_testing",
+    "iter_json_array_items",
     "parse_acts_result",
+    "parse_dice",
     "parse_monster_result",
     "parse_quests_result",
     "parse_storyteller_result",
@@ -1,68 +1,356 @@
 import json
+import os
 import random
 import re
-from typing import Any, Dict, List, Optional
+import sys
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+import numpy as np
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+from core.state import (
+    PlayerCharacter,
+    intern_act,
+    intern_character,
+    intern_monster,
+    intern_quest,
+)
+from schemas.models import (
+    Act,
+    GamePlanResponse,
+    Monster,
+    MonsterGenerationResponse,
+    Quest,
+    QuestGenerationResponse,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Uniform integer in [0, n) from the shared module RNG (so random.seed still applies); the
+# single-argument form skips most of the argument handling random.randint adds per roll
+_randrange = random.randrange
+
+# Generator for batched rolls; one integers() call replaces a Python call per die
+_rng = np.random.default_rng()
+
+# Dice counts below this are summed one stdlib roll at a time, which beats the fixed cost
+# of a numpy call until around two dozen dice
+_BATCH_ROLL_MIN = 32
+
+# Validates a whole list of monsters in one pydantic-core call, schema built once
+_MONSTER_LIST_ADAPTER = TypeAdapter(List[Monster])
+
+# Regex patterns used on the LLM response parse path, compiled once
+# Structural characters and string bodies, for single-pass JSON scanning
+_JSON_STRUCTURAL_RE = re.compile(r'[{}\[\]",:]')
+_JSON_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s*")
+# Brackets and quotes only, for depth scans that do not need commas or colons
+_JSON_BRACKET_RE = re.compile(r'[{}\[\]"]')
+# Characters that matter to the streaming array scanner outside strings
+_STREAM_TOKEN_RE = re.compile(r'[{}\]"]')
+_JSON_STRING_RE = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")', re.DOTALL)
+_ANGLE_VALUE_RE = re.compile(r":\s*<([^>]+)>")
+# Truncated arrays such as `"saving_throws": ["` that are rewritten to `"key": []`
+_UNTERMINATED_ARRAY_EOL_RE = re.compile(r'("\w+")\s*:\s*\[\s*"$', re.MULTILINE)
+_UNTERMINATED_ARRAY_END_RE = re.compile(r'("\w+")\s*:\s*\[\s*"\s*$', re.MULTILINE)
+_UNTERMINATED_ARRAY_NEWLINE_RE = re.compile(r'("\w+")\s*:\s*\[\s*"\s*\n', re.MULTILINE)
+_UNTERMINATED_ARRAY_NEXT_LINE_RE = re.compile(r'("\w+")\s*:\s*\[\s*\n\s*"', re.MULTILINE)
+# Escapes for the control characters JSON does not allow raw inside a string
+_CONTROL_CHAR_ESCAPES = str.maketrans(
+    {
+        **{chr(code): f"\\u{code:04x}" for code in range(0x20)},
+        "\b": "\\b",
+        "\t": "\\t",
+        "\n": "\\n",
+        "\f": "\\f",
+        "\r": "\\r",
+    }
+)
+# Monster recovery from broken JSON
+_MONSTERS_KEY_RE = re.compile(r'"monsters"\s*:\s*\[')
+_NAME_RE = re.compile(r'"name"\s*:\s*"([^"]+)"')
+
+# Monster fields recovered from the raw key/value pairs when an object cannot be parsed at all
+_MONSTER_INT_FIELDS = frozenset(
+    (
+        "armor_class",
+        "hit_points",
+        "strength",
+        "dexterity",
+        "constitution",
+        "intelligence",
+        "wisdom",
+        "charisma",
+    )
+)
+_MONSTER_RECOVERED_FIELDS = frozenset(
+    (
+        "size",
+        "type",
+        "alignment",
+        "armor_class",
+        "hit_points",
+        "challenge_rating",
+        "strength",
+        "dexterity",
+        "constitution",
+        "intelligence",
+        "wisdom",
+        "charisma",
+    )
+)
+# Bit per field that tells recovered monsters apart from their actions and special abilities
+_MONSTER_FIELD_BITS = {"armor_class": 1, "hit_points": 2, "size": 4, "type": 8, "attack_bonus": 16}
+_MONSTER_STAT_BITS = 1 | 2
+_MONSTER_DESCRIPTOR_BITS = 1 | 2 | 4 | 8
+_ACTION_BIT = 16
+# "key": value pairs, with the value either a whole string or a bare token
+_KEY_VALUE_RE = re.compile(r'"(\w+)"\s*:\s*(?:"([^"]*)"|([^,}\]]+))')
 
-from core.state import PlayerCharacter
 
+def loads_json(json_str: Union[str, bytes], strict: bool = True) -> Any:
+    """
+    Parse JSON text from an LLM response or a file read in binary mode.
+
+    Uses orjson for the common well-formed case and falls back to the standard library
+    parser (e.g. for control characters inside strings when strict=False, or NaN), so
+    anything json.loads accepted is still accepted. Raises json.JSONDecodeError on failure.
+    """
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
+        return json.loads(json_str, strict=strict)
+
+
+def validate_json(schema: Type[ModelT], json_str: Union[str, bytes]) -> ModelT:
+    """
+    Decode and validate an LLM JSON response against a pydantic schema in one pass.
+
+    JSON the pydantic parser rejects is retried through loads_json, so anything the plain
+    parser accepted still validates. Schema errors raise ValidationError with the field path.
+    """
+    try:
+        return schema.model_validate_json(json_str)
+    except ValidationError as e:
+        if any(error["type"] != "json_invalid" for error in e.errors()):
+            raise
+    return schema.model_validate(loads_json(json_str))
 
+
+def loads_partial_json(json_str: str) -> Any:
+    """
+    Parse JSON that may be cut off part-way, as a truncated LLM response is.
+
+    pydantic-core's partial mode closes the open containers and keeps a truncated final
+    string. Input it rejects for other reasons (e.g. trailing commas or raw control
+    characters) is repaired with fix_incomplete_json and sanitize_json_string instead.
+    Raises json.JSONDecodeError if that fails too.
+    """
+    try:
+        return from_json(json_str, allow_partial="trailing-strings")
+    except ValueError:
+        pass
+    fixed_json = sanitize_json_string(fix_incomplete_json(json_str))
+    return loads_json(fixed_json, strict=False)
+
+
+@lru_cache(maxsize=128)
 def extract_json_from_response(response: str) -> Optional[str]:
     """
     Extract JSON string from LLM response, handling various formats.
 
+    Results are cached per response text, so re-parsing the same response (e.g. the fix
+    path of a parser, or a retried call) does not repeat the extraction.
+
     Args:
         response: Raw response string from LLM
 
     Returns:
         Extracted JSON string or None if not found
     """
-    if not response or not response.strip():
+    if not response:
         return None
-
-    # Try to extract from ```json code blocks
-    if "```json" in response:
-        parts = response.split("```json")
-        if len(parts) > 1:
-            json_part = parts[1].split("```")[0]
-            return json_part.strip()
-
-    # Try to extract from ``` code blocks (without json label)
-    if "```" in response:
-        parts = response.split("```")
-        if len(parts) > 1:
-            # Find the part that looks like JSON (starts with { or [)
-            for part in parts[1:]:
-                stripped = part.strip()
-                if stripped.startswith("{") or stripped.startswith("["):
-                    return stripped
-
-    # Try to find JSON object/array in the response
     response_stripped = response.strip()
-    if response_stripped.startswith("{") or response_stripped.startswith("["):
+    if not response_stripped:
+        return None
+
+    # Bare JSON is the common case, so check it before scanning for code fences
+    if response_stripped[0] in "{[":
         return response_stripped
 
+    first_fence = response_stripped.find("```")
+    if first_fence != -1:
+        # Try to extract from ```json code blocks
+        fence = response_stripped.find("```json", first_fence)
+        if fence != -1:
+            start = fence + len("```json")
+            end = response_stripped.find("```", start)
+            return response_stripped[start : end if end != -1 else None].strip()
+
+        # Try to extract from ``` code blocks (without json label)
+        # Find the part that looks like JSON (starts with { or [), walking the fences by index
+        # instead of splitting and stripping every part
+        fence = first_fence
+        while fence != -1:
+            start = _WHITESPACE_RE.match(response_stripped, fence + 3).end()
+            end = response_stripped.find("```", start)
+            if response_stripped[start : start + 1] in ("{", "["):
+                return response_stripped[start : end if end != -1 else None].rstrip()
+            fence = end
+
     # Try to find JSON after potential prefix text
-    json_match = re.search(r"\{.*\}", response, re.DOTALL)
-    if json_match:
-        return json_match.group(0)
+    return _find_balanced_json(response)
 
-    return None
 
+def _find_balanced_json(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object in text, found with one forward scan that skips
+    over string contents. If the text ends before the object is closed, the rest of the
+    text from its opening brace is returned so fix_incomplete_json can repair it.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    end = _balanced_json_end(text, start)
+    return text[start:end] if end != -1 else text[start:]
+
+
+def _balanced_json_end(text: str, start: int) -> int:
+    """
+    Return the index just past the object or array opened at text[start], or -1 if the text
+    ends first. Brackets inside string values are skipped, so they never affect the depth.
+    """
+    depth = 0
+    pos = start
+    while True:
+        match = _JSON_BRACKET_RE.search(text, pos)
+        if match is None:
+            return -1
+        i = match.start()
+        char = text[i]
+        if char == '"':
+            body = _JSON_STRING_BODY_RE.match(text, i + 1)
+            if body is None:
+                return -1
+            pos = body.end()
+            continue
+        if char == "{" or char == "[":
+            depth += 1
+        elif char == "}" or char == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        pos = i + 1
+
+
+def _split_json_objects(text: str, pos: int = 0) -> List[str]:
+    """
+    Split text from pos on into its top-level JSON objects with a single string-aware scan.
+    An object left open at the end of the text is returned unclosed for fix_incomplete_json
+    to repair.
+    """
+    objects = []
+    start = text.find("{", pos)
+    while start != -1:
+        end = _balanced_json_end(text, start)
+        if end == -1:
+            objects.append(text[start:].rstrip())
+            break
+        objects.append(text[start:end])
+        start = text.find("{", end)
+    return objects
+
+
+def _monster_objects(json_str: str) -> List[str]:
+    """
+    Return the whole monster objects, nested actions included, from the "monsters" array of
+    a monster response, or from the quest-keyed arrays if there is no "monsters" key.
+    """
+    monsters_key = _MONSTERS_KEY_RE.search(json_str)
+    if monsters_key:
+        return _split_json_objects(json_str, monsters_key.end())
+    return _split_json_objects(json_str, json_str.find("{") + 1)
+
+
+def _extract_clean_json(response: Union[str, bytes]) -> Optional[str]:
+    """Extract the JSON text from an LLM response and quote bare `: <placeholder>` values."""
+    if isinstance(response, bytes):
+        response = response.decode("utf-8", errors="replace")
+    json_str = extract_json_from_response(response)
+    # Placeholders are rare, so skip the regex pass when there is no '<' at all
+    if json_str and "<" in json_str:
+        json_str = _ANGLE_VALUE_RE.sub(r': "\1"', json_str)
+    return json_str
+
+
+def _extract_and_parse(response: Union[str, bytes], schema: Optional[Type[ModelT]] = None) -> Any:
+    """
+    Extract, clean and parse the JSON in an LLM response in one step.
+
+    With a schema the JSON text is validated straight into the model (see validate_json),
+    otherwise the decoded JSON is returned. Returns None if the response holds no JSON;
+    decode and validation errors are raised to the caller.
 
-def load_player_character(json_str: str):
+    A raw bytes response that is bare JSON with no placeholders goes to the parser as is,
+    without being decoded to str first; anything else is decoded once for extraction.
     """
-    Load the player character from the file.
+    if not response:
+        return None
+    if isinstance(response, bytes):
+        json_bytes = response.strip()
+        if json_bytes[:1] in (b"{", b"[") and b"<" not in json_bytes:
+            if schema is not None:
+                return validate_json(schema, json_bytes)
+            return loads_json(json_bytes)
+    json_str = _extract_clean_json(response)
+    if not json_str:
+        return None
+    if schema is not None:
+        return validate_json(schema, json_str)
+    return loads_json(json_str)
+
+
+# File the player character is loaded from when no JSON is passed in
+PLAYER_CHARACTER_FILE = "player_character.json"
+
+# (mtime_ns, raw JSON) of the last read of PLAYER_CHARACTER_FILE
+_player_cache: Optional[Tuple[int, bytes]] = None
+
+
+def load_player_character(json_str: Optional[str] = None) -> PlayerCharacter:
+    """
+    Load the player character from json_str, or from the file if no JSON is given.
+
+    The file is only re-read when its modification time changes. Each call still parses
+    into a new PlayerCharacter, so callers can modify the result without affecting others.
     """
+    global _player_cache
 
-    with open("player_character.json", "r", encoding="utf-8") as f:
-        player_data = json.load(f)
-    return PlayerCharacter(**player_data)
+    if json_str:
+        return PlayerCharacter(**intern_character(loads_json(json_str)))
+
+    mtime = os.stat(PLAYER_CHARACTER_FILE).st_mtime_ns
+    if _player_cache is None or _player_cache[0] != mtime:
+        with open(PLAYER_CHARACTER_FILE, "rb") as f:
+            _player_cache = (mtime, f.read())
+    return PlayerCharacter(**intern_character(loads_json(_player_cache[1])))
 
 
 def fix_incomplete_json(json_str: str) -> str:
     """
     Attempt to fix common JSON issues like unterminated strings, missing brackets, trailing commas.
 
+    The string is scanned once, jumping between structural characters and over string
+    bodies, while a stack records the open objects/arrays. Trailing commas found on the way
+    are dropped, and at the end of the input a truncated string, a key or colon left without
+    a value, and the open containers are closed in the correct nesting order.
+
     Args:
         json_str: Potentially incomplete JSON string
 
@@ -72,228 +360,103 @@ def fix_incomplete_json(json_str: str) -> str:
     if not json_str:
         return "{}"
 
-    # First, escape any control characters that might be in string values
-    # This needs to be done carefully to avoid breaking valid JSON
-    # We'll handle this during the parsing phase
-
-    # Remove trailing commas (common issue)
-    fixed_json = re.sub(r",(\s*[}\]])", r"\1", json_str)
-
-    # Count brackets to see if we need to close them
-    open_braces = fixed_json.count("{")
-    close_braces = fixed_json.count("}")
-    open_brackets = fixed_json.count("[")
-    close_brackets = fixed_json.count("]")
-
-    # Find the last complete structure before truncation
-    # Look for patterns like: "key": [" or "key": "value that's cut
-    lines = fixed_json.split("\n")
-    fixed_lines = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-
-        # Skip empty lines
-        if not stripped:
-            fixed_lines.append(line)
-            i += 1
+    # JSON that already parses needs no repair; an orjson parse is cheaper than the scan
+    try:
+        orjson.loads(json_str)
+        return json_str
+    except orjson.JSONDecodeError:
+        pass
+
+    closers = []  # Closing characters of the open containers, innermost last
+    drop = []  # Positions of trailing commas to remove
+    last = ""  # Last structural character outside strings ('"' for a closed string)
+    last_pos = -1
+    key_pending = False  # The last closed string is an object key without its value
+    unterminated_key = None  # Set to whether the string cut off by the end is a key
+    pos = 0
+
+    while True:
+        match = _JSON_STRUCTURAL_RE.search(json_str, pos)
+        if match is None:
+            break
+        i = match.start()
+        char = json_str[i]
+
+        if char == '"':
+            is_key = bool(closers) and closers[-1] == "}" and last in ("{", ",")
+            body = _JSON_STRING_BODY_RE.match(json_str, i + 1)
+            if body is None:
+                unterminated_key = is_key
+                break
+            pos = body.end()
+            last, last_pos = '"', pos - 1
+            key_pending = is_key
             continue
 
-        # Check for unterminated array strings like: "saving_throws": ["
-        if '":' in stripped:
-            # Check if line ends with an opening bracket and quote (various formats)
-            if (
-                stripped.endswith('["')
-                or stripped.endswith('["')
-                or (
-                    stripped.endswith("[")
-                    and i + 1 < len(lines)
-                    and lines[i + 1].strip().startswith('"')
-                )
-            ):
-                # This is an unterminated array string - close it
-                # Extract the key part before the colon
-                if '":' in line:
-                    key_part = line.split('":')[0] + '":'
-                    line = key_part + " []"
-                else:
-                    # Fallback: remove the incomplete array element and close properly
-                    line = re.sub(r':\s*\[\s*"?\s*$', ": []", line.rstrip())
-                fixed_lines.append(line)
-                i += 1
-                continue
+        if char == "}" or char == "]":
+            if last == "," and _WHITESPACE_RE.fullmatch(json_str, last_pos + 1, i):
+                drop.append(last_pos)
+            if closers:
+                closers.pop()
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        last, last_pos = char, i
+        pos = i + 1
+
+    # Only whitespace follows the last structural character (checked without slicing)
+    at_end = (
+        unterminated_key is None and _WHITESPACE_RE.fullmatch(json_str, last_pos + 1) is not None
+    )
+    if at_end and last == ",":
+        drop.append(last_pos)
+
+    parts = []
+    start = 0
+    for comma_pos in drop:
+        parts.append(json_str[start:comma_pos])
+        start = comma_pos + 1
+    tail = json_str[start:]
+
+    if unterminated_key is not None:
+        # Drop a dangling escape so it does not swallow the closing quote
+        backslashes = 0
+        while backslashes < len(tail) and tail[-1 - backslashes] == "\\":
+            backslashes += 1
+        if backslashes % 2:
+            tail = tail[:-1]
+        parts.append(tail + '"')
+        if unterminated_key:
+            parts.append(": null")
+    else:
+        parts.append(tail)
+        if at_end:
+            if last == ":":
+                parts.append(" null")
+            elif last == '"' and key_pending:
+                parts.append(": null")
 
-        # Check for unterminated string values (key: "value that's not closed)
-        if ":" in line and '"' in line:
-            # Count unescaped quotes properly
-            quote_positions = []
-            escaped = False
-            for idx, char in enumerate(line):
-                if char == "\\" and not escaped:
-                    escaped = True
-                    continue
-                if char == '"' and not escaped:
-                    quote_positions.append(idx)
-                escaped = False
-
-            # If odd number of quotes, string is likely unterminated
-            if len(quote_positions) % 2 == 1:
-                last_quote_pos = quote_positions[-1]
-                after_quote = line[last_quote_pos + 1 :].strip()
-
-                # Check if this is an array element that's cut off: "key": ["
-                if after_quote.startswith("[") and i + 1 < len(lines):
-                    next_stripped = lines[i + 1].strip()
-                    if not next_stripped or (
-                        next_stripped.startswith("}") or next_stripped.startswith("]")
-                    ):
-                        # Close the array properly
-                        line = line[: last_quote_pos + 1] + ": []"
-                        fixed_lines.append(line)
-                        i += 1
-                        continue
-
-                # If nothing meaningful after the quote, close the string
-                if not after_quote or after_quote in [",", "}", "]"]:
-                    if not line.rstrip().endswith('"'):
-                        line = line[: last_quote_pos + 1] + after_quote
-                elif after_quote.startswith("["):
-                    # Array starting - check if it's incomplete
-                    if i + 1 < len(lines):
-                        next_stripped = lines[i + 1].strip()
-                        if (
-                            not next_stripped
-                            or next_stripped.startswith("}")
-                            or next_stripped.startswith("]")
-                        ):
-                            # Close the array
-                            line = line[: last_quote_pos + 1] + ": []"
-                            fixed_lines.append(line)
-                            i += 1
-                            continue
-                elif not after_quote.startswith(",") and not after_quote.startswith("}"):
-                    # Check if next line suggests we should close this string
-                    if i + 1 < len(lines):
-                        next_stripped = lines[i + 1].strip()
-                        if next_stripped:
-                            if next_stripped.startswith("}") or next_stripped.startswith("]"):
-                                # Close the string and add comma if needed
-                                if not line.rstrip().endswith(","):
-                                    line = line[: last_quote_pos + 1] + '",'
-                            elif next_stripped.startswith('"') or next_stripped.startswith("{"):
-                                # Close the string with comma
-                                line = line[: last_quote_pos + 1] + '",'
-
-        # Check for lines ending with just an opening bracket and quote
-        if stripped.endswith('["') or (
-            stripped.endswith(":") and i + 1 < len(lines) and lines[i + 1].strip().startswith('"')
-        ):
-            # This is likely an incomplete array - try to close it
-            if '":' in stripped:
-                # Extract the key part
-                key_part = stripped.split('":')[0] + '":'
-                line = key_part + " []"
-
-        fixed_lines.append(line)
-        i += 1
-
-    fixed_json = "\n".join(fixed_lines)
-
-    # Remove any new trailing commas we might have introduced
-    fixed_json = re.sub(r",(\s*[}\]])", r"\1", fixed_json)
-
-    # Close unclosed brackets and braces
-    if open_braces > close_braces:
-        fixed_json += "\n" + "}" * (open_braces - close_braces)
-    if open_brackets > close_brackets:
-        fixed_json += "\n" + "]" * (open_brackets - close_brackets)
-
-    # Fix truncated string values - find strings that end without closing quotes
-    # Pattern: "key": "value that's incomplete (no closing quote before end of JSON or next key)
-    # This handles cases like: "description": "Melee Weapon Attack... Hit: 7 (1d10 + 2) bludgeon
-    # We need to find the last incomplete string and close it
-
-    # Find all string patterns that might be incomplete
-    # Look for ": " followed by text that doesn't end with a quote
-    lines_list = fixed_json.split("\n")
-    fixed_lines_list = []
-    for i, line in enumerate(lines_list):
-        # Check if line has an incomplete string (has : " but no closing quote on same line)
-        # And it's not the start of a multi-line string (which would be valid)
-        if '": "' in line or ': "' in line:
-            # Count quotes after the colon
-            colon_pos = line.find(': "')
-            if colon_pos != -1:
-                after_colon = line[colon_pos + 3 :]
-                quote_count = after_colon.count('"')
-                # If odd number of quotes (or zero and line doesn't end with comma/brace), might be incomplete
-                if quote_count == 0 and not (
-                    line.rstrip().endswith(",") or line.rstrip().endswith("}")
-                ):
-                    # Check if next line starts with a quote or new key (suggesting this string was cut off)
-                    if i + 1 < len(lines_list):
-                        next_line = lines_list[i + 1].strip()
-                        if (
-                            next_line.startswith('"')
-                            or next_line.startswith("}")
-                            or next_line.startswith("]")
-                        ):
-                            # Close the string
-                            line = line.rstrip() + '",'
-                    elif i == len(lines_list) - 1:
-                        # Last line, definitely incomplete
-                        line = line.rstrip() + '"'
-
-        fixed_lines_list.append(line)
-
-    fixed_json = "\n".join(fixed_lines_list)
-
-    # Final pass: Fix any remaining unclosed strings at the end of JSON
-    # Find the last "key": "value pattern and ensure it's closed
-    # Look backwards from the end to find the last incomplete string
-    if (
-        fixed_json
-        and not fixed_json.rstrip().endswith("}")
-        and not fixed_json.rstrip().endswith("]")
-    ):
-        # Find the last occurrence of ": " that might be incomplete
-        last_colon_quote = fixed_json.rfind(': "')
-        if last_colon_quote != -1:
-            after_colon = fixed_json[last_colon_quote + 3 :]
-            # If no closing quote found, add one
-            if '"' not in after_colon or (after_colon.count('"') % 2 == 1):
-                # Find the end of the JSON (last } or ])
-                last_brace = max(fixed_json.rfind("}"), fixed_json.rfind("]"))
-                if last_brace != -1 and last_colon_quote < last_brace:
-                    # Insert closing quote before the last brace
-                    fixed_json = fixed_json[:last_brace] + '"' + fixed_json[last_brace:]
-
-    return fixed_json
+    parts.extend(reversed(closers))
+    return "".join(parts)
 
 
 def parse_storyteller_result(response):
     """
     Parse the storyteller result from the LLM response with robust error handling.
     """
-    if not response or not response.strip():
+    if not response or response.isspace():
         print("Error parsing storyteller result: Empty response")
         return None
 
     try:
-        json_str = extract_json_from_response(response)
-        if not json_str:
-            print("Error parsing storyteller result: Could not extract JSON")
-            print(f"Response content (first 500 chars): {response[:500] if response else 'Empty'}")
-            return None
-
-        # Clean up the response and try to parse as JSON
-        json_str = re.sub(r":\s*<([^>]+)>", r': "\1"', json_str)
-
-        # Try to parse directly first
         try:
-            json_data = json.loads(json_str)
+            json_data = _extract_and_parse(response)
+            if json_data is None:
+                print("Error parsing storyteller result: Could not extract JSON")
+                print(f"Response content (first 500 chars): {response[:500]}")
+                return None
+
             title = json_data.get("title")
             background_story = json_data.get("background_story")
             key_themes = json_data.get("key_themes")
@@ -310,10 +473,10 @@ def parse_storyteller_result(response):
             print("Attempting to fix incomplete JSON...")
 
             # Try to fix common issues
-            fixed_json = fix_incomplete_json(json_str)
+            json_str = _extract_clean_json(response)
 
             try:
-                json_data = json.loads(fixed_json)
+                json_data = loads_partial_json(json_str)
                 title = json_data.get("title")
                 background_story = json_data.get("background_story")
                 key_themes = json_data.get("key_themes")
@@ -339,71 +502,247 @@ def parse_storyteller_result(response):
         return None
 
 
-def parse_acts_result(response):
+def _validate_items(
+    items: List[Any],
+    model: Type[BaseModel],
+    label: str,
+    intern: Any,
+    errors: Optional[List[str]],
+) -> List[Dict[str, Any]]:
+    """
+    Validate each item of a parsed array against model and dump it under the full field
+    names. Invalid items are skipped, and their problems are added to errors if given.
+    """
+    results = []
+    for i, item in enumerate(items, 1):
+        try:
+            results.append(intern(model.model_validate(item).model_dump(exclude_unset=True)))
+        except ValidationError as e:
+            print(f"Skipping invalid {label} {i}: {e}")
+            if errors is not None:
+                for error in e.errors():
+                    field = ".".join(str(part) for part in error["loc"]) or "(item)"
+                    errors.append(f"{label} {i}, field {field}: {error['msg']}")
+    return results
+
+
+def parse_acts_result(response, errors: Optional[List[str]] = None):
     """
     Parse the acts from the LLM response.
+
+    Each act is validated on its own, so a malformed act is skipped rather than failing the
+    whole plan. If errors is given, a description of each skipped act's problems is
+    appended to it (e.g. to ask the LLM for a corrected response).
     """
     try:
-        json_str = extract_json_from_response(response)
-        if not json_str:
+        plan = _extract_and_parse(response, GamePlanResponse)
+        if plan is None:
             print("Error parsing acts result: Could not extract JSON")
             return []
 
-        # Clean up the response and try to parse as JSON
-        json_str = re.sub(r":\s*<([^>]+)>", r': "\1"', json_str)
-        json_data = json.loads(json_str)
-        acts = json_data.get("acts", [])
-        return acts
+        return _validate_items(plan.acts, Act, "act", intern_act, errors)
+    except ValidationError as e:
+        print(f"Error parsing acts result: {e}")
+        return []
     except Exception as e:
         print(f"Error parsing acts result: {e}")
         print(f"Response content (first 500 chars): {response[:500] if response else 'Empty'}")
         return []
 
 
-def parse_quests_result(response):
+def expand_act(act: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate a single act object (e.g. one streamed by iter_json_array_items) and expand its
+    short keys to the full field names. Returns None if the act is invalid.
+    """
+    try:
+        return intern_act(Act.model_validate(act).model_dump(exclude_unset=True))
+    except ValidationError as e:
+        print(f"Error parsing act: {e}")
+        return None
+
+
+def iter_json_array_items(chunks: Iterable[str], key: str) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse a streamed JSON response, yielding each object of the array stored
+    under `key` as soon as it is complete.
+
+    This lets a caller act on the first items (e.g. acts of a game plan) while the LLM is
+    still generating the rest of the response.
+
+    Args:
+        chunks: Iterable of text chunks as they arrive from the LLM
+        key: Name of the array field whose items should be yielded
+
+    Yields:
+        Each complete object in the array, in order
+    """
+    marker = f'"{key}"'
+    buf = ""
+    pos = 0
+    in_array = False
+    depth = 0
+    in_string = False
+    item_start = 0
+
+    for chunk in chunks:
+        buf += chunk
+        if not in_array:
+            key_pos = buf.find(marker)
+            if key_pos == -1:
+                continue
+            bracket_pos = buf.find("[", key_pos + len(marker))
+            if bracket_pos == -1:
+                continue
+            in_array = True
+            pos = bracket_pos + 1
+
+        while True:
+            if in_string:
+                # Jump to the closing quote, skipping quotes escaped by an odd run of backslashes
+                quote = buf.find('"', pos)
+                while quote != -1 and _is_escaped(buf, quote):
+                    quote = buf.find('"', quote + 1)
+                if quote == -1:
+                    pos = len(buf)
+                    break
+                in_string = False
+                pos = quote + 1
+                continue
+
+            match = _STREAM_TOKEN_RE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            i = match.start()
+            char = buf[i]
+            pos = i + 1
+            if char == '"':
+                in_string = True
+            elif char == "{":
+                if depth == 0:
+                    item_start = i
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        yield loads_json(buf[item_start:pos])
+                    except json.JSONDecodeError as e:
+                        print(f"Skipping malformed streamed {key} item: {e}")
+            elif depth == 0:
+                return
+
+
+def _is_escaped(text: str, index: int) -> bool:
+    """Whether the character at index is escaped, i.e. preceded by an odd run of backslashes."""
+    start = index
+    while start > 0 and text[start - 1] == "\\":
+        start -= 1
+    return (index - start) % 2 == 1
+
+
+def parse_quests_result(response, errors: Optional[List[str]] = None):
     """
     Parse the quests from the LLM response.
+
+    Each quest is validated on its own, so a malformed quest is skipped rather than failing
+    the whole batch. If errors is given, a description of each skipped quest's problems is
+    appended to it.
     """
     try:
-        json_str = extract_json_from_response(response)
-        if not json_str:
+        result = _extract_and_parse(response, QuestGenerationResponse)
+        if result is None:
             print("Error parsing quests result: Could not extract JSON")
             return []
 
-        # Clean up the response and try to parse as JSON
-        json_str = re.sub(r":\s*<([^>]+)>", r': "\1"', json_str)
-        json_data = json.loads(json_str)
-        quests = json_data.get("quests", [])
-        return quests
+        return _validate_items(result.quests, Quest, "quest", intern_quest, errors)
+    except ValidationError as e:
+        print(f"Error parsing quests result: {e}")
+        return []
     except Exception as e:
         print(f"Error parsing quests result: {e}")
         print(f"Response content (first 500 chars): {response[:500] if response else 'Empty'}")
         return []
 
 
+# Where responses report usage, in order of preference, and the total-count keys within it
+_USAGE_SOURCES = ("usage_metadata", "usage", "llm_output")
+_TOTAL_TOKEN_KEYS = ("total_tokens", "total")
+
+
 def get_total_tokens(resp):
-    # dict-style
+    """
+    Return the total token count reported by an LLM response (dict or object), if any.
+    """
+    is_dict = isinstance(resp, dict)
+    for source in _USAGE_SOURCES:
+        usage = resp.get(source) if is_dict else getattr(resp, source, None)
+        if not usage:
+            continue
+        usage_is_dict = isinstance(usage, dict)
+        for key in _TOTAL_TOKEN_KEYS:
+            total = usage.get(key) if usage_is_dict else getattr(usage, key, None)
+            if total:
+                return total
+    return None
+
+
+def get_cached_tokens(resp):
+    """
+    Return how many prompt tokens the provider served from its prefix cache, if reported.
+    """
+    # LangChain normalizes this to usage_metadata["input_token_details"]["cache_read"]
     if isinstance(resp, dict):
-        return resp.get("usage_metadata", {}).get("total_tokens") or resp.get("usage", {}).get(
-            "total_tokens"
-        )
-    # object-style
-    um = (
-        getattr(resp, "usage_metadata", None)
-        or getattr(resp, "usage", None)
-        or getattr(resp, "llm_output", None)
-    )
+        um = resp.get("usage_metadata")
+    else:
+        um = getattr(resp, "usage_metadata", None)
     if isinstance(um, dict):
-        return um.get("total_tokens") or um.get("total")
-    # attribute-style access
-    return getattr(um, "total_tokens", None) or getattr(um, "total", None)
+        return (um.get("input_token_details") or {}).get("cache_read")
+    # Raw OpenAI responses report usage.prompt_tokens_details.cached_tokens
+    usage = resp.get("usage") if isinstance(resp, dict) else getattr(resp, "usage", None)
+    if isinstance(usage, dict):
+        return (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None)
 
 
 def dice_roll(dice_type):
     """
     Roll a dice and return the result.
     """
-    return random.randint(1, dice_type)
+    if dice_type < 1:
+        raise ValueError(f"A die needs at least one side, got {dice_type}")
+    return _randrange(dice_type) + 1
+
+
+def dice_roll_many(dice_type: int, count: int) -> np.ndarray:
+    """
+    Roll count dice of the same type and return the results as an array.
+    """
+    return _rng.integers(1, dice_type + 1, size=count, dtype=np.int16)
+
+
+@lru_cache(maxsize=64)
+def parse_dice(dice: str) -> Tuple[int, int]:
+    """
+    Parse a dice string such as "2d6" (or "d8" for one die) into (count, sides).
+
+    Results are cached per string, since combat re-parses the same few damage dice every round.
+    """
+    count, _, sides = dice.lower().partition("d")
+    return int(count or 1), int(sides)
+
+
+def dice_roll_total(dice_type: int, count: int) -> int:
+    """
+    Roll count dice of the same type and return their sum, batching large rolls.
+    """
+    if dice_type < 1:
+        raise ValueError(f"A die needs at least one side, got {dice_type}")
+    if count < _BATCH_ROLL_MIN:
+        return sum([_randrange(dice_type) + 1 for _ in range(count)])
+    return int(dice_roll_many(dice_type, count).sum())
 
 
 def sanitize_json_string(json_str: str) -> str:
@@ -411,28 +750,22 @@ def sanitize_json_string(json_str: str) -> str:
     Sanitize JSON string by escaping control characters in string values.
     This helps handle cases where the LLM includes unescaped newlines or tabs.
     """
-    # Find string values and escape control characters
-    # We need to be careful - only escape in actual string values, not in keys
-
-    # Pattern to match string values: "key": "value with potential control chars"
-    # We'll use a regex to find and fix string values
-    def escape_control_chars(match):
-        full_match = match.group(0)
-        # Check if this is a key or value by looking at the context
-        if ': "' in full_match or '": "' in full_match:
-            # This is likely a value
-            # Escape control characters but preserve already escaped ones
-            value = match.group(1) if match.lastindex else ""
-            # Replace unescaped newlines, tabs, etc.
-            value = value.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
-            return f'"{value}"'
-        return full_match
-
     # First, try to fix common truncation patterns
     # Pattern: "key": ["  -> "key": []
-    json_str = re.sub(r'("\w+")\s*:\s*\[\s*"$', r"\1: []", json_str, flags=re.MULTILINE)
+    json_str = _UNTERMINATED_ARRAY_EOL_RE.sub(r"\1: []", json_str)
     # Pattern: "key": ["\n  -> "key": []
-    json_str = re.sub(r'("\w+")\s*:\s*\[\s*"\s*\n', r"\1: []\n", json_str, flags=re.MULTILINE)
+    json_str = _UNTERMINATED_ARRAY_NEWLINE_RE.sub(r"\1: []\n", json_str)
+
+    # Escape control characters inside strings only; whitespace between tokens is left as is.
+    # Splitting on the capturing string pattern puts the strings at the odd indexes.
+    # Most strings have no control characters (isprintable is False for all of them), so
+    # they skip translate, which maps one character at a time for multi-character escapes.
+    parts = _JSON_STRING_RE.split(json_str)
+    parts[1::2] = [
+        string if string.isprintable() else string.translate(_CONTROL_CHAR_ESCAPES)
+        for string in parts[1::2]
+    ]
+    json_str = "".join(parts)
 
     return json_str
 
@@ -442,33 +775,67 @@ def parse_monster_result(response):
     Parse the monsters from the LLM response using Pydantic schema.
     This provides automatic validation and type conversion.
     """
-    if not response or not response.strip():
+    return [intern_monster(monster) for monster in _parse_monsters(response)]
+
+
+def _looks_like_monster(data: Dict[str, Any]) -> bool:
+    """
+    Whether a recovered dict is a monster: it sets armor_class, hit_points, size or type, and
+    is not an action or special ability (attack_bonus without armor_class or hit_points).
+    """
+    bits = 0
+    for field in data.keys() & _MONSTER_FIELD_BITS.keys():
+        if data[field] is not None:
+            bits |= _MONSTER_FIELD_BITS[field]
+    if bits & _ACTION_BIT and not bits & _MONSTER_STAT_BITS:
+        return False
+    return bool(bits & _MONSTER_DESCRIPTOR_BITS)
+
+
+def _validate_monsters(monsters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate monster dicts against the Monster schema, as one batch when they all pass.
+
+    If the batch fails, each monster is validated on its own; one that still fails is kept
+    as the raw dict when it has armor_class or hit_points, and dropped otherwise.
+    """
+    try:
+        return _MONSTER_LIST_ADAPTER.dump_python(_MONSTER_LIST_ADAPTER.validate_python(monsters))
+    except ValidationError:
+        pass
+
+    validated_monsters = []
+    for monster_data in monsters:
+        try:
+            monster = Monster.model_validate(monster_data)
+            validated_monsters.append(monster.model_dump())
+        except Exception as e:
+            print(f"Warning: Could not validate monster {monster_data.get('name', 'Unknown')}: {e}")
+            # Include anyway as dict (partial data) if it has monster fields
+            has_monster_fields = (
+                monster_data.get("armor_class") is not None
+                or monster_data.get("hit_points") is not None
+            )
+            if has_monster_fields:
+                validated_monsters.append(monster_data)
+    return validated_monsters
+
+
+def _parse_monsters(response):
+    """Extract the monster records from the LLM response, trying progressively looser parsing."""
+    if not response or response.isspace():
         print("Error parsing monster result: Empty response")
         return []
 
     try:
-        # Import Pydantic schema
-        from schemas.models import Monster, MonsterGenerationResponse
-
         # Extract JSON from response
-        json_str = extract_json_from_response(response)
+        json_str = _extract_clean_json(response)
 
         if not json_str:
             print("Error parsing monster result: Could not extract JSON from response")
             print(f"Response content (first 500 chars): {response[:500]}")
             return []
 
-        # Clean up common issues
-        json_str = re.sub(r":\s*<([^>]+)>", r': "\1"', json_str)
-
-        # Fix specific truncation patterns before parsing
-        # Pattern: "saving_throws": [" or "key": [" with newline after (handle various spacing)
-        json_str = re.sub(
-            r'("[\w_]+")\s*:\s*\[\s*"\s*\n', r"\1: []\n", json_str, flags=re.MULTILINE
-        )
-        json_str = re.sub(r'("[\w_]+")\s*:\s*\[\s*"\s*$', r"\1: []", json_str, flags=re.MULTILINE)
-        json_str = re.sub(r'("[\w_]+")\s*:\s*\[\s*\n\s*"', r"\1: []", json_str, flags=re.MULTILINE)
-
         # Try to parse using Pydantic schema (automatic validation and type conversion)
         try:
             response_obj = MonsterGenerationResponse.from_json(json_str)
@@ -480,30 +847,21 @@ def parse_monster_result(response):
             print(f"Pydantic schema validation failed: {schema_error}")
             print("Falling back to manual parsing...")
 
+            # Fix specific truncation patterns only now: well-formed responses skip these
+            # line-based passes, which can also match valid multi-line string arrays
+            # Pattern: "saving_throws": [" or "key": [" with newline after (handle various spacing)
+            json_str = _UNTERMINATED_ARRAY_NEWLINE_RE.sub(r"\1: []\n", json_str)
+            json_str = _UNTERMINATED_ARRAY_END_RE.sub(r"\1: []", json_str)
+            json_str = _UNTERMINATED_ARRAY_NEXT_LINE_RE.sub(r"\1: []", json_str)
+
             # Fallback to manual parsing if Pydantic fails
             try:
-                json_data = json.loads(json_str, strict=False)
+                json_data = loads_json(json_str, strict=False)
 
                 # Check if structure is {"monsters": [...]} - expected format
                 monsters = json_data.get("monsters", [])
                 if monsters:
-                    # Try to validate each monster individually
-                    validated_monsters = []
-                    for monster_data in monsters:
-                        try:
-                            monster = Monster.model_validate(monster_data)
-                            validated_monsters.append(monster.model_dump())
-                        except Exception as e:
-                            print(
-                                f"Warning: Could not validate monster {monster_data.get('name', 'Unknown')}: {e}"
-                            )
-                            # Include anyway as dict (partial data) if it has monster fields
-                            has_monster_fields = (
-                                monster_data.get("armor_class") is not None
-                                or monster_data.get("hit_points") is not None
-                            )
-                            if has_monster_fields:
-                                validated_monsters.append(monster_data)
+                    validated_monsters = _validate_monsters(monsters)
                     if validated_monsters:
                         return validated_monsters
 
@@ -514,36 +872,12 @@ def parse_monster_result(response):
                     if isinstance(value, list):
                         # Check if items in list are monsters (have armor_class or hit_points)
                         for item in value:
-                            if isinstance(item, dict):
-                                has_monster_fields = (
-                                    item.get("armor_class") is not None
-                                    or item.get("hit_points") is not None
-                                    or item.get("size") is not None
-                                    or item.get("type") is not None
-                                )
-                                is_action = (
-                                    item.get("attack_bonus") is not None
-                                    and item.get("armor_class") is None
-                                    and item.get("hit_points") is None
-                                )
-                                if has_monster_fields and not is_action:
-                                    all_monsters.append(item)
+                            if isinstance(item, dict) and _looks_like_monster(item):
+                                all_monsters.append(item)
 
                 if all_monsters:
                     print(f"Found {len(all_monsters)} monster(s) in quest-name-keyed structure")
-                    # Try to validate each
-                    validated_monsters = []
-                    for monster_data in all_monsters:
-                        try:
-                            monster = Monster.model_validate(monster_data)
-                            validated_monsters.append(monster.model_dump())
-                        except Exception:
-                            # Include if it has required fields
-                            if (
-                                monster_data.get("armor_class") is not None
-                                or monster_data.get("hit_points") is not None
-                            ):
-                                validated_monsters.append(monster_data)
+                    validated_monsters = _validate_monsters(all_monsters)
                     if validated_monsters:
                         return validated_monsters
 
@@ -553,7 +887,7 @@ def parse_monster_result(response):
 
         # If Pydantic parsing failed, try the old method
         try:
-            json_data = json.loads(json_str, strict=False)
+            json_data = loads_json(json_str, strict=False)
             monsters = json_data.get("monsters", [])
             if monsters:
                 return monsters
@@ -562,14 +896,8 @@ def parse_monster_result(response):
             print(f"Initial JSON parse failed: {e}")
             print("Attempting to fix incomplete JSON...")
 
-            # Try to fix common issues
-            fixed_json = fix_incomplete_json(json_str)
-
-            # Also sanitize control characters
-            fixed_json = sanitize_json_string(fixed_json)
-
             try:
-                json_data = json.loads(fixed_json, strict=False)
+                json_data = loads_partial_json(json_str)
                 monsters = json_data.get("monsters", [])
                 if monsters:
                     print("Successfully parsed after fixing JSON")
@@ -581,8 +909,7 @@ def parse_monster_result(response):
                 # Look for complete monster objects even if the overall JSON is broken
                 # IMPORTANT: Must have monster-specific fields (armor_class, hit_points) to be a monster
                 # This prevents actions/special_abilities from being parsed as monsters
-                monster_pattern = r'\{[^{}]*"name"\s*:\s*"[^"]+"[^{}]*\}'
-                monster_matches = re.findall(monster_pattern, json_str, re.DOTALL)
+                monster_matches = _monster_objects(json_str)
 
                 if monster_matches:
                     print(
@@ -592,86 +919,44 @@ def parse_monster_result(response):
                     for monster_str in monster_matches:
                         try:
                             # Try to fix common issues in individual monster objects
-                            fixed_monster = fix_incomplete_json(monster_str)
-                            fixed_monster = sanitize_json_string(fixed_monster)
-                            monster = json.loads(fixed_monster, strict=False)
+                            monster = loads_partial_json(monster_str)
 
                             # VALIDATION: Only include if it has monster-specific fields
                             # Actions/special abilities have "name" but not armor_class or hit_points
-                            has_monster_fields = (
-                                monster.get("armor_class") is not None
-                                or monster.get("hit_points") is not None
-                                or monster.get("size") is not None
-                                or monster.get("type") is not None
-                            )
-
-                            # Exclude if it looks like an action (has attack_bonus but no armor_class)
-                            is_action = (
-                                monster.get("attack_bonus") is not None
-                                and monster.get("armor_class") is None
-                                and monster.get("hit_points") is None
-                            )
-
-                            if monster.get("name") and has_monster_fields and not is_action:
+                            if monster.get("name") and _looks_like_monster(monster):
                                 monsters.append(monster)
                         except Exception:
                             # Try to extract at least the name and basic stats
-                            name_match = re.search(r'"name"\s*:\s*"([^"]+)"', monster_str)
+                            name_match = _NAME_RE.search(monster_str)
                             if name_match:
                                 # Create a minimal monster object
                                 monster = {"name": name_match.group(1)}
-                                # Try to extract other common fields
-                                for field in [
-                                    "size",
-                                    "type",
-                                    "alignment",
-                                    "armor_class",
-                                    "hit_points",
-                                    "challenge_rating",
-                                    "strength",
-                                    "dexterity",
-                                    "constitution",
-                                    "intelligence",
-                                    "wisdom",
-                                    "charisma",
-                                ]:
-                                    field_match = re.search(
-                                        f'"{field}"\\s*:\\s*([^,}}]+)', monster_str
-                                    )
-                                    if field_match:
-                                        value = field_match.group(1).strip().strip('"')
-                                        try:
-                                            if field in [
-                                                "armor_class",
-                                                "hit_points",
-                                                "strength",
-                                                "dexterity",
-                                                "constitution",
-                                                "intelligence",
-                                                "wisdom",
-                                                "charisma",
-                                            ]:
-                                                monster[field] = int(value)
-                                            else:
-                                                monster[field] = value
-                                        except Exception:
+                                # Try to extract other common fields in one scan of the
+                                # key/value pairs; the first occurrence of a field wins
+                                for key_value in _KEY_VALUE_RE.finditer(monster_str):
+                                    field, string_value, raw_value = key_value.groups()
+                                    if field not in _MONSTER_RECOVERED_FIELDS or field in monster:
+                                        continue
+                                    value = string_value if raw_value is None else raw_value.strip()
+                                    try:
+                                        if field in _MONSTER_INT_FIELDS:
+                                            monster[field] = int(value)
+                                        else:
                                             monster[field] = value
+                                    except Exception:
+                                        monster[field] = value
 
                                 # VALIDATION: Only add if it has monster-specific fields
                                 # Don't add actions/special abilities (they have attack_bonus but no armor_class/hit_points)
-                                has_monster_fields = (
-                                    monster.get("armor_class") is not None
-                                    or monster.get("hit_points") is not None
-                                    or monster.get("size") is not None
-                                    or monster.get("type") is not None
-                                )
+                                # The recovered fields never include attack_bonus, so the
+                                # raw text is checked for it instead
                                 is_action = (
                                     "attack_bonus" in monster_str
                                     and monster.get("armor_class") is None
                                     and monster.get("hit_points") is None
                                 )
 
-                                if monster.get("name") and has_monster_fields and not is_action:
+                                if _looks_like_monster(monster) and not is_action:
                                     monsters.append(monster)
                     if monsters:
                         print(
@@ -679,100 +964,23 @@ def parse_monster_result(response):
                         )
                         return monsters
 
-                # Last resort: try to extract just the monsters array
-                monsters_match = re.search(r'"monsters"\s*:\s*\[(.*?)\]', json_str, re.DOTALL)
-                if monsters_match:
-                    try:
-                        # Try to parse individual monster objects
-                        monsters_text = monsters_match.group(1)
-                        # Split by monster boundaries (look for opening braces)
-                        monster_objects = re.findall(r"\{[^{}]*\}", monsters_text, re.DOTALL)
-                        if monster_objects:
-                            print(f"Extracted {len(monster_objects)} monster(s) from partial JSON")
-                            monsters = []
-                            for monster_str in monster_objects:
-                                try:
-                                    monster = json.loads(monster_str)
-                                    # VALIDATION: Only include actual monsters, not actions/special abilities
-                                    has_monster_fields = (
-                                        monster.get("armor_class") is not None
-                                        or monster.get("hit_points") is not None
-                                        or monster.get("size") is not None
-                                        or monster.get("type") is not None
-                                    )
-                                    is_action = (
-                                        monster.get("attack_bonus") is not None
-                                        and monster.get("armor_class") is None
-                                        and monster.get("hit_points") is None
-                                    )
-                                    if has_monster_fields and not is_action:
-                                        monsters.append(monster)
-                                except Exception:
-                                    pass
-                            if monsters:
-                                return monsters
-                    except Exception:
-                        pass
-
         # Last resort: Try to extract partial monsters from incomplete JSON
         # Look for monster objects that are mostly complete even if JSON is truncated
         print("Attempting to extract partial monsters from incomplete JSON...")
 
-        # Try to find complete monster objects by looking for opening/closing braces
-        # Pattern: Find { followed by monster fields, ending with } or end of string
-        monster_objects_raw = []
-        brace_count = 0
-        current_obj_start = -1
-        for i, char in enumerate(json_str):
-            if char == "{":
-                if brace_count == 0:
-                    current_obj_start = i
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-                if brace_count == 0 and current_obj_start != -1:
-                    # Found a complete object
-                    monster_obj = json_str[current_obj_start : i + 1]
-                    monster_objects_raw.append(monster_obj)
-                    current_obj_start = -1
-
-        # Also check if there's an incomplete object at the end
-        if current_obj_start != -1 and brace_count > 0:
-            # Try to extract what we can from the incomplete object
-            incomplete_obj = json_str[current_obj_start:]
-            # Close it manually
-            incomplete_obj = incomplete_obj.rstrip()
-            if not incomplete_obj.endswith("}"):
-                # Close all open braces
-                incomplete_obj += "}" * brace_count
-                # Also close any unclosed strings
-                if incomplete_obj.count('"') % 2 == 1:
-                    incomplete_obj = incomplete_obj.rstrip("}") + '"}'
-                monster_objects_raw.append(incomplete_obj)
+        # Split out the top-level objects, ignoring braces inside string values; a truncated
+        # trailing object is closed by fix_incomplete_json below
+        monster_objects_raw = _split_json_objects(json_str)
 
         # Try to parse each extracted object
         extracted_monsters = []
         for obj_str in monster_objects_raw:
             try:
                 # Fix common issues in this object
-                fixed_obj = fix_incomplete_json(obj_str)
-                fixed_obj = sanitize_json_string(fixed_obj)
-                monster = json.loads(fixed_obj, strict=False)
+                monster = loads_partial_json(obj_str)
 
                 # Validate it's actually a monster (not an action)
-                has_monster_fields = (
-                    monster.get("armor_class") is not None
-                    or monster.get("hit_points") is not None
-                    or monster.get("size") is not None
-                    or monster.get("type") is not None
-                )
-                is_action = (
-                    monster.get("attack_bonus") is not None
-                    and monster.get("armor_class") is None
-                    and monster.get("hit_points") is None
-                )
-
-                if has_monster_fields and not is_action and monster.get("name"):
+                if monster.get("name") and _looks_like_monster(monster):
                     extracted_monsters.append(monster)
             except Exception:
                 # Skip this object if we can't parse it
@@ -799,50 +1007,82 @@ def parse_monster_result(response):
         return []
 
 
+# Ability modifier by score, for the scores 0-40 that stat blocks actually use
+_ABILITY_MODIFIERS = tuple((score - 10) // 2 for score in range(41))
+
+
 def get_ability_modifier(score: int) -> int:
     """Calculate ability modifier from ability score."""
+    if type(score) is int and 0 <= score < len(_ABILITY_MODIFIERS):
+        return _ABILITY_MODIFIERS[score]
     return (score - 10) // 2
 
 
+# XP by challenge rating: the fractional ratings, then whole ratings 0-30 indexed by value
+_FRACTIONAL_CR_XP = {"0": 0, "1/8": 25, "1/4": 50, "1/2": 100}
+_XP_BY_CR = (
+    0,
+    200,
+    450,
+    700,
+    1100,
+    1800,
+    2300,
+    2900,
+    3900,
+    5000,
+    5900,
+    7200,
+    8400,
+    10000,
+    11500,
+    13000,
+    15000,
+    18000,
+    20000,
+    22000,
+    25000,
+    33000,
+    41000,
+    50000,
+    62000,
+    75000,
+    90000,
+    105000,
+    120000,
+    135000,
+    155000,
+)
+
+
 def get_xp_value(cr: str) -> int:
     """Get XP value for a challenge rating."""
-    cr_to_xp = {
-        "0": 0,
-        "1/8": 25,
-        "1/4": 50,
-        "1/2": 100,
-        "1": 200,
-        "2": 450,
-        "3": 700,
-        "4": 1100,
-        "5": 1800,
-        "6": 2300,
-        "7": 2900,
-        "8": 3900,
-        "9": 5000,
-        "10": 5900,
-        "11": 7200,
-        "12": 8400,
-        "13": 10000,
-        "14": 11500,
-        "15": 13000,
-        "16": 15000,
-        "17": 18000,
-        "18": 20000,
-        "19": 22000,
-        "20": 25000,
-        "21": 33000,
-        "22": 41000,
-        "23": 50000,
-        "24": 62000,
-        "25": 75000,
-        "26": 90000,
-        "27": 105000,
-        "28": 120000,
-        "29": 135000,
-        "30": 155000,
-    }
-    return cr_to_xp.get(cr, 0)
+    xp = _FRACTIONAL_CR_XP.get(cr)
+    if xp is not None:
+        return xp
+    # Only canonical whole ratings ("7", not "07" or " 7") are in the table
+    if isinstance(cr, str) and cr.isascii() and cr.isdigit() and cr[0] != "0":
+        rating = int(cr)
+        if rating < len(_XP_BY_CR):
+            return _XP_BY_CR[rating]
+    return 0
+
+
+@lru_cache(maxsize=256)
+def _cr_to_float(cr_str: str) -> float:
+    """Numeric value of a challenge rating such as "1/4" or "5"; 0 if it cannot be parsed."""
+    try:
+        if "/" in cr_str:
+            num, denom = cr_str.split("/")
+            return float(num) / float(denom)
+        return float(cr_str)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+# Encounter difficulty bands and the upper bound of each, as a fraction of the party level
+_DIFFICULTY_LEVELS = ("Easy", "Medium", "Hard", "Deadly")
+_DIFFICULTY_CR_FRACTIONS = (0.5, 0.75, 1.25)
 
 
 def calculate_encounter_difficulty(
@@ -851,34 +1091,40 @@ def calculate_encounter_difficulty(
     """
     Calculate the difficulty of an encounter based on monsters and party.
     """
-    total_cr = 0
-    for monster in monsters:
-        cr_str = monster.get("challenge_rating", "0")
-        try:
-            if "/" in cr_str:
-                num, denom = cr_str.split("/")
-                cr_value = float(num) / float(denom)
-            else:
-                cr_value = float(cr_str)
-            total_cr += cr_value
-        except (ValueError, ZeroDivisionError):
-            total_cr += 0
+    total_cr = sum(_cr_to_float(monster.get("challenge_rating", "0")) for monster in monsters)
 
     adjusted_cr = total_cr * (party_size / 4.0)
 
-    if adjusted_cr <= party_level * 0.5:
-        return "Easy"
-    elif adjusted_cr <= party_level * 0.75:
-        return "Medium"
-    elif adjusted_cr <= party_level * 1.25:
-        return "Hard"
-    else:
-        return "Deadly"
+    # First band whose upper bound (a fraction of the party level) the adjusted CR stays within
+    bounds = [party_level * fraction for fraction in _DIFFICULTY_CR_FRACTIONS]
+    return _DIFFICULTY_LEVELS[bisect_left(bounds, adjusted_cr)]
+
+
+# Optional stat block lines, in display order: list fields are comma-joined, text fields as is
+_STAT_BLOCK_LIST_LINES = (
+    ("saving_throws", "Saving Throws"),
+    ("skills", "Skills"),
+    ("damage_resistances", "Damage Resistances"),
+    ("damage_immunities", "Damage Immunities"),
+    ("condition_immunities", "Condition Immunities"),
+)
+_STAT_BLOCK_TEXT_LINES = (("senses", "Senses"), ("languages", "Languages"))
 
 
 def get_monster_stat_block(monster: Dict[str, Any]) -> str:
     """Format a monster as a D&D stat block string."""
-    stat_block = f"""
+    # Each ability score is shown next to its modifier, so read it once
+    strength = monster.get("strength", 10)
+    dexterity = monster.get("dexterity", 10)
+    constitution = monster.get("constitution", 10)
+    intelligence = monster.get("intelligence", 10)
+    wisdom = monster.get("wisdom", 10)
+    charisma = monster.get("charisma", 10)
+    challenge_rating = monster.get("challenge_rating", "0")
+
+    parts = []
+    append = parts.append
+    append(f"""
 {monster.get('name', 'Unknown Monster')}
 {monster.get('size', 'Unknown')} {monster.get('type', 'unknown')}, {monster.get('alignment', 'unaligned')}
 
@@ -886,60 +1132,40 @@ Armor Class {monster.get('armor_class', 0)}
 Hit Points {monster.get('hit_points', 0)}
 Speed {monster.get('speed', '30 ft.')}
 
-STR {monster.get('strength', 10)} ({get_ability_modifier(monster.get('strength', 10)):+d})
-DEX {monster.get('dexterity', 10)} ({get_ability_modifier(monster.get('dexterity', 10)):+d})
-CON {monster.get('constitution', 10)} ({get_ability_modifier(monster.get('constitution', 10)):+d})
-INT {monster.get('intelligence', 10)} ({get_ability_modifier(monster.get('intelligence', 10)):+d})
-WIS {monster.get('wisdom', 10)} ({get_ability_modifier(monster.get('wisdom', 10)):+d})
-CHA {monster.get('charisma', 10)} ({get_ability_modifier(monster.get('charisma', 10)):+d})
+STR {strength} ({get_ability_modifier(strength):+d})
+DEX {dexterity} ({get_ability_modifier(dexterity):+d})
+CON {constitution} ({get_ability_modifier(constitution):+d})
+INT {intelligence} ({get_ability_modifier(intelligence):+d})
+WIS {wisdom} ({get_ability_modifier(wisdom):+d})
+CHA {charisma} ({get_ability_modifier(charisma):+d})
 
-Challenge {monster.get('challenge_rating', '0')} ({get_xp_value(monster.get('challenge_rating', '0'))} XP)
+Challenge {challenge_rating} ({get_xp_value(challenge_rating)} XP)
 Proficiency Bonus +{monster.get('proficiency_bonus', 0)}
-"""
+""")
 
-    saving_throws = monster.get("saving_throws", [])
-    if saving_throws:
-        stat_block += f"Saving Throws {', '.join(saving_throws)}\n"
+    for field, label in _STAT_BLOCK_LIST_LINES:
+        values = monster.get(field)
+        if values:
+            append(f"{label} {', '.join(values)}\n")
 
-    skills = monster.get("skills", [])
-    if skills:
-        stat_block += f"Skills {', '.join(skills)}\n"
+    for field, label in _STAT_BLOCK_TEXT_LINES:
+        value = monster.get(field)
+        if value:
+            append(f"{label} {value}\n")
 
-    resistances = monster.get("damage_resistances", [])
-    if resistances:
-        stat_block += f"Damage Resistances {', '.join(resistances)}\n"
-
-    immunities = monster.get("damage_immunities", [])
-    if immunities:
-        stat_block += f"Damage Immunities {', '.join(immunities)}\n"
-
-    condition_immunities = monster.get("condition_immunities", [])
-    if condition_immunities:
-        stat_block += f"Condition Immunities {', '.join(condition_immunities)}\n"
-
-    senses = monster.get("senses", "")
-    if senses:
-        stat_block += f"Senses {senses}\n"
-
-    languages = monster.get("languages", "")
-    if languages:
-        stat_block += f"Languages {languages}\n"
-
-    stat_block += "\n"
+    append("\n")
 
     special_abilities = monster.get("special_abilities", [])
     for ability in special_abilities:
-        stat_block += (
+        append(
             f"**{ability.get('name', 'Unknown Ability')}.** {ability.get('description', '')}\n\n"
         )
 
     actions = monster.get("actions", [])
     for action in actions:
-        stat_block += (
-            f"**{action.get('name', 'Unknown Action')}.** {action.get('description', '')}\n\n"
-        )
+        append(f"**{action.get('name', 'Unknown Action')}.** {action.get('description', '')}\n\n")
 
-    return stat_block
+    return "".join(parts)
 
 
 def load_monster_from_quest(
@@ -1139,7 +1365,7 @@ def get_player_stats_from_input() -> Dict[str, Any]:
     }
 
 
-def show_combat_menu(monsters_dict: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+def show_combat_menu(monsters_dict: Dict[str, List[Dict[str, Any]]]) -> List[Tuple[str, int]]:
     """
     Display combat menu and available quests.
 
@@ -1147,23 +1373,22 @@ def show_combat_menu(monsters_dict: Dict[str, List[Dict[str, Any]]]) -> List[str
         monsters_dict: Dictionary mapping quest names to lists of monsters
 
     Returns:
-        List of quest names
+        List of (quest name, monster count) pairs, in menu order
     """
-    print("\nWould you like to start a combat encounter?")
-    print("Available quests with monsters:")
+    out = ["\nWould you like to start a combat encounter?", "Available quests with monsters:"]
+    app = out.append
 
-    quest_list = []
-    for i, quest_name in enumerate(monsters_dict.keys(), 1):
-        num_monsters = len(monsters_dict[quest_name])
-        print(f"  {i}. {quest_name} ({num_monsters} monster(s))")
-        quest_list.append(quest_name)
+    quest_pairs = [(quest_name, len(monsters)) for quest_name, monsters in monsters_dict.items()]
+    for i, (quest_name, num_monsters) in enumerate(quest_pairs, 1):
+        app(f"  {i}. {quest_name} ({num_monsters} monster(s))")
 
-    print("\nOptions:")
-    print("  [y]es - Start combat with first available quest")
-    print("  [c]hoose - Choose a specific quest and monster")
-    print("  [n]o - Skip combat testing")
+    app("\nOptions:")
+    app("  [y]es - Start combat with first available quest")
+    app("  [c]hoose - Choose a specific quest and monster")
+    app("  [n]o - Skip combat testing")
+    sys.stdout.write("\n".join(out) + "\n")
 
-    return quest_list
+    return quest_pairs
 
 
 def handle_quick_combat(state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -1186,7 +1411,9 @@ def handle_quick_combat(state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
 
 def handle_choose_combat(
-    state: Dict[str, Any], monsters_dict: Dict[str, List[Dict[str, Any]]], quest_list: List[str]
+    state: Dict[str, Any],
+    monsters_dict: Dict[str, List[Dict[str, Any]]],
+    quest_pairs: List[Tuple[str, int]],
 ) -> Optional[Dict[str, Any]]:
     """
     Handle interactive combat selection (choose quest and monster).
@@ -1194,35 +1421,38 @@ def handle_choose_combat(
     Args:
         state: The game state containing monsters
         monsters_dict: Dictionary mapping quest names to lists of monsters
-        quest_list: List of available quest names
+        quest_pairs: (quest name, monster count) pairs from show_combat_menu
 
     Returns:
         Combat result dictionary or None
     """
-    if not quest_list:
+    if not quest_pairs:
         return None
 
-    print("\nSelect a quest:")
-    for i, quest_name in enumerate(quest_list, 1):
-        num_monsters = len(monsters_dict[quest_name])
-        print(f"  {i}. {quest_name} ({num_monsters} monster(s))")
+    out = ["\nSelect a quest:"]
+    app = out.append
+    for i, (quest_name, num_monsters) in enumerate(quest_pairs, 1):
+        app(f"  {i}. {quest_name} ({num_monsters} monster(s))")
+    sys.stdout.write("\n".join(out) + "\n")
 
     try:
-        quest_choice = int(input(f"\nEnter quest number (1-{len(quest_list)}): ").strip())
-        if not (1 <= quest_choice <= len(quest_list)):
+        quest_choice = int(input(f"\nEnter quest number (1-{len(quest_pairs)}): ").strip())
+        if not (1 <= quest_choice <= len(quest_pairs)):
             print("⚠️  Invalid quest selection.")
             return None
 
-        selected_quest = quest_list[quest_choice - 1]
+        selected_quest = quest_pairs[quest_choice - 1][0]
         selected_monsters = monsters_dict[selected_quest]
 
         # Show monsters in this quest
-        print(f"\nMonsters in '{selected_quest}':")
+        out = [f"\nMonsters in '{selected_quest}':"]
+        app = out.append
         for i, monster in enumerate(selected_monsters, 1):
             monster_name = monster.get("name", "Unknown")
             monster_hp = monster.get("hit_points", 0)
             monster_ac = monster.get("armor_class", 0)
-            print(f"  {i}. {monster_name} (HP: {monster_hp}, AC: {monster_ac})")
+            app(f"  {i}. {monster_name} (HP: {monster_hp}, AC: {monster_ac})")
+        sys.stdout.write("\n".join(out) + "\n")
 
         # Select monster
         monster_choice = int(
@@ -1294,8 +1524,8 @@ def interactive_combat_testing(state: Dict[str, Any]) -> Optional[Dict[str, Any]
     # Wait for user input
     input("\nPress Enter to continue to combat testing...")
 
-    # Show menu and get quest list
-    quest_list = show_combat_menu(monsters_dict)
+    # Show menu and get the quests with their monster counts
+    quest_pairs = show_combat_menu(monsters_dict)
 
     # Get user choice
     choice = input("\nYour choice (y/c/n): ").strip().lower()
@@ -1303,7 +1533,7 @@ def interactive_combat_testing(state: Dict[str, Any]) -> Optional[Dict[str, Any]
     if choice in ["y", "yes"]:
         return handle_quick_combat(state)
     elif choice in ["c", "choose"]:
-        return handle_choose_combat(state, monsters_dict, quest_list)
+        return handle_choose_combat(state, monsters_dict, quest_pairs)
     else:
         print("\nSkipping combat testing.")
         return None
@@ -1320,9 +1550,8 @@ def print_sample_monsters(
         total_monsters: Total number of monsters generated
         max_monsters_to_show: Maximum number of monsters to display (default: 3)
     """
-    print("\n" + "=" * 60)
-    print("SAMPLE MONSTERS (Verification)")
-    print("=" * 60)
+    out = ["\n" + "=" * 60, "SAMPLE MONSTERS (Verification)", "=" * 60]
+    app = out.append
 
     monsters_dict = state.get("monsters", {})
     if monsters_dict:
@@ -1332,58 +1561,62 @@ def print_sample_monsters(
             if not monsters:
                 continue
 
-            print(f"\n📜 Quest: {quest_name}")
-            print(f"   Monsters in this quest: {len(monsters)}")
+            app(f"\n📜 Quest: {quest_name}")
+            app(f"   Monsters in this quest: {len(monsters)}")
 
             # Print each monster from this quest (up to max)
             for i, monster in enumerate(monsters):
                 if monster_count >= max_monsters_to_show:
                     break
 
-                print(f"\n{'─' * 60}")
-                print(f"Monster {monster_count + 1}: {monster.get('name', 'Unknown')}")
-                print(f"{'─' * 60}")
+                # Read the fields shown below once
+                get = monster.get
+                name = get("name", "Unknown")
+                special_abilities = get("special_abilities", [])
+                actions = get("actions", [])
+
+                app(f"\n{'─' * 60}")
+                app(f"Monster {monster_count + 1}: {name}")
+                app(f"{'─' * 60}")
 
                 # Print key stats
-                print(f"  Name: {monster.get('name', 'Unknown')}")
-                print(f"  Size: {monster.get('size', 'Unknown')}")
-                print(f"  Type: {monster.get('type', 'Unknown')}")
-                print(f"  Alignment: {monster.get('alignment', 'Unknown')}")
-                print(f"  Armor Class: {monster.get('armor_class', 0)}")
-                print(f"  Hit Points: {monster.get('hit_points', 0)}")
-                print(f"  Challenge Rating: {monster.get('challenge_rating', 'Unknown')}")
-                print(f"  Speed: {monster.get('speed', 'Unknown')}")
+                app(f"  Name: {name}")
+                app(f"  Size: {get('size', 'Unknown')}")
+                app(f"  Type: {get('type', 'Unknown')}")
+                app(f"  Alignment: {get('alignment', 'Unknown')}")
+                app(f"  Armor Class: {get('armor_class', 0)}")
+                app(f"  Hit Points: {get('hit_points', 0)}")
+                app(f"  Challenge Rating: {get('challenge_rating', 'Unknown')}")
+                app(f"  Speed: {get('speed', 'Unknown')}")
 
                 # Ability scores
-                print("\n  Ability Scores:")
-                print(
-                    f"    STR: {monster.get('strength', 10)} | DEX: {monster.get('dexterity', 10)} | CON: {monster.get('constitution', 10)}"
+                app("\n  Ability Scores:")
+                app(
+                    f"    STR: {get('strength', 10)} | DEX: {get('dexterity', 10)} | CON: {get('constitution', 10)}"
                 )
-                print(
-                    f"    INT: {monster.get('intelligence', 10)} | WIS: {monster.get('wisdom', 10)} | CHA: {monster.get('charisma', 10)}"
+                app(
+                    f"    INT: {get('intelligence', 10)} | WIS: {get('wisdom', 10)} | CHA: {get('charisma', 10)}"
                 )
 
                 # Special abilities count
-                special_abilities = monster.get("special_abilities", [])
-                actions = monster.get("actions", [])
                 if special_abilities:
-                    print(f"\n  Special Abilities: {len(special_abilities)}")
+                    app(f"\n  Special Abilities: {len(special_abilities)}")
                     for ability in special_abilities[:2]:  # Show first 2
-                        print(f"    • {ability.get('name', 'Unknown')}")
+                        app(f"    • {ability.get('name', 'Unknown')}")
                 if actions:
-                    print(f"\n  Actions: {len(actions)}")
+                    app(f"\n  Actions: {len(actions)}")
                     for action in actions[:2]:  # Show first 2
-                        print(
+                        app(
                             f"    • {action.get('name', 'Unknown')}: {action.get('damage', 'N/A')} {action.get('damage_type', '')}"
                         )
 
                 # Description preview
-                description = monster.get("description", "")
+                description = get("description", "")
                 if description:
                     desc_preview = (
                         description[:100] + "..." if len(description) > 100 else description
                     )
-                    print(f"\n  Description: {desc_preview}")
+                    app(f"\n  Description: {desc_preview}")
 
                 monster_count += 1
 
@@ -1391,12 +1624,13 @@ def print_sample_monsters(
                 break
 
         if monster_count == 0:
-            print("\n⚠️  No monsters found in the generated data.")
+            app("\n⚠️  No monsters found in the generated data.")
         else:
             remaining = total_monsters - monster_count
             if remaining > 0:
-                print(f"\n... and {remaining} more monster(s) not shown here.")
+                app(f"\n... and {remaining} more monster(s) not shown here.")
     else:
-        print("\n⚠️  No monsters were generated for any quests.")
+        app("\n⚠️  No monsters were generated for any quests.")
 
-    print("\n" + "=" * 60)
+    app("\n" + "=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
@@ -2,9 +2,16 @@
 Unit tests for core/agents.py
 """
 
+from unittest.mock import Mock
+
 import pytest
 
-from core.agents import background_story, generate_game_plan, generate_quests_for_act
+from core.agents import (
+    _generate_rag_quest_batch,
+    background_story,
+    generate_game_plan,
+    generate_quests_for_act,
+)
 
 
 class TestBackgroundStory:
@@ -76,6 +83,23 @@ class TestGamePlan:
         generate_game_plan(mock_llm_with_acts, populated_game_state)
         mock_llm_with_acts.invoke.assert_called_once()
 
+    def test_generate_game_plan_retries_with_validation_errors(self, populated_game_state):
+        """Test that acts failing validation are sent back once and the fixed plan is kept"""
+        model = Mock()
+        model.invoke.side_effect = [
+            Mock(content='{"acts": [{"title": "Act I", "summary": "ok"}, {"summary": "x"}]}'),
+            Mock(
+                content='{"acts": [{"title": "Act I", "summary": "ok"}, '
+                '{"title": "Act II", "summary": "fixed"}]}'
+            ),
+        ]
+        generate_game_plan(model, populated_game_state)
+
+        assert [act["act_title"] for act in populated_game_state["acts"]] == ["Act I", "Act II"]
+        retry_messages = model.invoke.call_args_list[1].args[0]
+        assert retry_messages[-2]["role"] == "assistant"
+        assert "act 2, field act_title" in retry_messages[-1]["content"]
+
 
 class TestQuestGeneration:
     """Tests for generate_quests_for_act function"""
@@ -182,3 +206,31 @@ def mock_llm_with_quests():
     }
     ```"""
     return mock
+
+
+class TestRagQuestBatch:
+    """Tests for _generate_rag_quest_batch"""
+
+    def test_maps_quests_to_acts_and_skips_empty_milestones(self):
+        """Test that "Act II" style numbers map back to acts and no empty milestone line is sent"""
+        state = {
+            "acts": [
+                {"act_title": "Act I", "act_summary": "Start"},
+                {"act_title": "Act II", "act_summary": "Middle", "key_milestones": ["Gate"]},
+            ]
+        }
+        model = Mock()
+        model.invoke.return_value = Mock(
+            content='{"quests": [{"act": "Act I", "quest_title": "A"}, '
+            '{"act": "II", "quest_title": "B"}, {"act": 2, "quest_title": "C"}]}'
+        )
+        rag_service = Mock()
+        rag_service.retrieve_context.return_value = ""
+
+        quests_by_act = _generate_rag_quest_batch(model, state, [0, 1], rag_service, "rules")
+
+        assert [quest["quest_title"] for quest in quests_by_act[0]] == ["A"]
+        assert [quest["quest_title"] for quest in quests_by_act[1]] == ["B", "C"]
+        user_prompt = model.invoke.call_args.args[0][-1]["content"]
+        assert user_prompt.count("Key Milestones") == 1
+        assert "Key Milestones: Gate" in user_prompt
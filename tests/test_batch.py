@@ -0,0 +1,56 @@
+"""
+Unit tests for services/batch.py
+"""
+
+import asyncio
+
+import pytest
+from google.genai import types
+
+from services import batch
+from services.batch import GeminiBatchBackend, areap_batch, get_batch_backend, reap_batch
+
+MESSAGES = [
+    {"role": "system", "content": "You design quests."},
+    {"role": "user", "content": "Act I"},
+]
+
+
+class FakeBackend:
+    """Backend whose job finishes after a given number of polls"""
+
+    def __init__(self, polls_until_done):
+        self.polls_until_done = polls_until_done
+        self.polls = 0
+
+    def poll(self, batch_id):
+        self.polls += 1
+        if self.polls < self.polls_until_done:
+            return None
+        return {"campaign::0": '{"quests": []}'}
+
+
+class TestBatchBackends:
+    """Tests for the batch backend interface"""
+
+    def test_unknown_provider_is_rejected(self):
+        """Test that a provider without a batch backend fails clearly"""
+        with pytest.raises(ValueError, match="No batch backend for provider 'ANTHROPIC'"):
+            get_batch_backend("ANTHROPIC")
+
+    def test_gemini_request_carries_system_prompt_and_id(self):
+        """Test that chat messages become a valid inline Gemini request tagged with its id"""
+        request = GeminiBatchBackend._request("campaign::0", MESSAGES, 5000, 0.7)
+        inline = types.InlinedRequest.model_validate(request)
+        assert inline.config.system_instruction == "You design quests."
+        assert inline.config.max_output_tokens == 5000
+        assert [content.role for content in inline.contents] == ["user"]
+        assert inline.metadata == {"custom_id": "campaign::0"}
+
+    def test_reap_polls_until_finished(self, monkeypatch):
+        """Test that the blocking and async reapers poll until the job has results"""
+        for reap in (reap_batch, lambda *args: asyncio.run(areap_batch(*args))):
+            backend = FakeBackend(polls_until_done=3)
+            monkeypatch.setitem(batch._backends, "FAKE", backend)
+            assert reap("batch-1", "FAKE", 0) == {"campaign::0": '{"quests": []}'}
+            assert backend.polls == 3
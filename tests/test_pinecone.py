@@ -0,0 +1,50 @@
+"""
+Unit tests for services/pinecone.py
+"""
+
+import uuid
+from unittest import mock
+
+import pytest
+
+from services import pinecone
+from services.pinecone import EMBEDDING_MAX_INPUT_TOKENS, _pack_batches
+
+
+@pytest.fixture
+def no_tokenizer():
+    """Make the embedding tokenizer fail to load, as it does offline"""
+    pinecone._get_encoder.cache_clear()
+    with mock.patch.object(pinecone.tiktoken, "encoding_for_model", side_effect=OSError("offline")):
+        yield
+    pinecone._get_encoder.cache_clear()
+
+
+class TestPackBatches:
+    """Tests for _pack_batches"""
+
+    def test_packs_without_tokenizer(self, no_tokenizer):
+        """Test that texts are packed by byte length when the tokenizer cannot load"""
+        batches = _pack_batches(["é" * 5000, "abc", "def"], max_tokens=8192)
+        assert [len(batch) for batch in batches] == [1, 2]
+        assert len(batches[0][0].encode("utf-8")) <= EMBEDDING_MAX_INPUT_TOKENS
+
+    def test_respects_item_limit(self, no_tokenizer):
+        """Test that a batch never holds more than max_items texts"""
+        batches = _pack_batches([f"text {i}" for i in range(5)], max_items=2)
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+class TestCampaignRecords:
+    """Tests for the records built when storing a campaign"""
+
+    def test_quest_ids_use_dashed_uuids(self):
+        """Test that bulk-stored quests get ids in the same format as store_quest"""
+        service = pinecone.PineconeService()
+        campaign_doc = service._create_campaign_document(
+            {"title": "Test", "quests": {"Act I": [{"quest_name": "A"}, {"quest_name": "B"}]}}
+        )
+        quest_docs, texts, _ = service._prepare_campaign_records(campaign_doc)
+        assert len(texts) == 3
+        for quest_doc in quest_docs:
+            assert str(uuid.UUID(quest_doc.id)) == quest_doc.id
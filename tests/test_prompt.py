@@ -0,0 +1,33 @@
+"""
+Unit tests for core/prompt.py and core/rag_prompts.py
+"""
+
+import json
+
+from core.examples import STORYTELLER_EXAMPLE_FIELDS, STORYTELLER_EXAMPLE_OUTLINE
+from core.prompt import game_plan_prompt, quest_generation_prompt, storyteller_prompt
+from core.rag_prompts import rag_storyteller_prompt, rag_storyteller_prompt_no_ctx
+
+
+class TestSharedExamples:
+    """Tests that prompt variants share the same example blocks"""
+
+    def test_storyteller_examples_match(self):
+        """Test that the standard and RAG storyteller prompts show the same example"""
+        for prompt in (storyteller_prompt, rag_storyteller_prompt, rag_storyteller_prompt_no_ctx):
+            assert STORYTELLER_EXAMPLE_OUTLINE in prompt
+            for key, value in STORYTELLER_EXAMPLE_FIELDS.items():
+                assert f'"{key}": {json.dumps(value, ensure_ascii=False)}' in prompt
+
+    def test_rag_no_ctx_example_matches_storyteller(self):
+        """Test that the no-context RAG example differs from the standard one only by tone"""
+        example = storyteller_prompt[storyteller_prompt.index("# Example") :]
+        no_ctx_example = rag_storyteller_prompt_no_ctx[
+            rag_storyteller_prompt_no_ctx.index("# Example") :
+        ]
+        assert example.replace('  "tone": "mystical tragedy",\n', "") == no_ctx_example
+
+    def test_examples_are_filled(self):
+        """Test that no example placeholder is left in the system prompts"""
+        for prompt in (storyteller_prompt, game_plan_prompt, quest_generation_prompt):
+            assert "{{" not in prompt
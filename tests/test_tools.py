@@ -2,12 +2,29 @@
 Unit tests for tools/utils.py
 """
 
+import json
+import os
+
+import pytest
+
 from tools.utils import (
+    calculate_encounter_difficulty,
     dice_roll,
+    dice_roll_many,
+    dice_roll_total,
+    extract_json_from_response,
+    fix_incomplete_json,
+    get_cached_tokens,
     get_total_tokens,
+    get_xp_value,
+    iter_json_array_items,
+    load_player_character,
     parse_acts_result,
+    parse_dice,
+    parse_monster_result,
     parse_quests_result,
     parse_storyteller_result,
+    sanitize_json_string,
 )
 
 
@@ -51,6 +68,18 @@ class TestParseStorytellerResult:
         # Behavior depends on implementation
         assert result is None or result[1] is None
 
+    def test_parse_quotes_angle_placeholders(self):
+        """Test that bare <placeholder> values are quoted before parsing"""
+        response = '{"title": <Untitled>, "background_story": "Story", "key_themes": ["a"]}'
+        result = parse_storyteller_result(response)
+        assert result == ("Untitled", "Story", ["a"])
+
+    def test_parse_truncated_response_keeps_partial_string(self):
+        """Test that a response cut off inside a string still parses with the partial text"""
+        response = '{"title": "T", "key_themes": ["a", "b"], "background_story": "Long ago'
+        result = parse_storyteller_result(response)
+        assert result == ("T", "Long ago", ["a", "b"])
+
 
 class TestParseActsResult:
     """Tests for parse_acts_result function"""
@@ -81,6 +110,172 @@ class TestParseActsResult:
         acts = parse_acts_result(response)
         assert acts == []
 
+    def test_parse_act_without_title_returns_empty_list(self):
+        """Test that acts failing schema validation are rejected"""
+        response = '{"acts": [{"act_summary": "No title"}]}'
+        acts = parse_acts_result(response)
+        assert acts == []
+
+    def test_parse_keeps_valid_acts_with_loose_fields(self):
+        """Test that a string location list is accepted and only the invalid act is dropped"""
+        response = '{"acts": [{"title": "Act I", "locations": "one place"}, {"summary": "x"}]}'
+        acts = parse_acts_result(response)
+        assert acts == [{"act_title": "Act I", "key_locations": ["one place"]}]
+
+
+class TestParseMonsterResult:
+    """Tests for parse_monster_result function"""
+
+    def test_pretty_printed_string_arrays_are_kept(self):
+        """Test that valid multi-line string arrays are not rewritten as truncated ones"""
+        monster = {
+            "name": "Goblin",
+            "size": "Small",
+            "type": "humanoid",
+            "alignment": "neutral evil",
+            "armor_class": 15,
+            "hit_points": 7,
+            "speed": "30 ft.",
+            "strength": 8,
+            "dexterity": 14,
+            "constitution": 10,
+            "intelligence": 10,
+            "wisdom": 8,
+            "charisma": 8,
+            "challenge_rating": "1/4",
+            "proficiency_bonus": 2,
+            "saving_throws": ["DEX +4", "CON +2"],
+        }
+        response = json.dumps({"quest_name": "Q", "monsters": [monster]}, indent=2)
+        result = parse_monster_result(response)
+        assert len(result) == 1
+        assert result[0]["saving_throws"] == ["DEX +4", "CON +2"]
+
+    def test_broken_response_keeps_nested_actions(self):
+        """Test that monsters recovered from broken JSON keep their nested objects"""
+        response = (
+            '{"quest_name": "Q", "monsters": ['
+            '{"name": "Goblin", "size": "Small", "armor_class": 15, "hit_points": 7, '
+            '"actions": [{"name": "Scimitar", "attack_bonus": 4}]}, '
+            '{"name": "Wolf", "armor_class": 13 "hit_points": 11}]}'
+        )
+        result = parse_monster_result(response)
+        assert [monster["name"] for monster in result] == ["Goblin", "Wolf"]
+        assert result[0]["actions"] == [{"name": "Scimitar", "attack_bonus": 4}]
+
+    def test_truncated_response_with_escaped_quotes(self):
+        """Test that escaped quotes and backslashes do not confuse the truncation repair"""
+        response = (
+            '{"quest_name": "Q", "monsters": ['
+            '{"name": "Goblin", "size": "Small", "armor_class": 15, "hit_points": 7, '
+            '"description": "ends with \\\\"}, '
+            '{"name": "Wolf", "size": "Medium", "armor_class": 13, "hit_points": 11, '
+            '"description": "howls \\"awoo'
+        )
+        result = parse_monster_result(response)
+        assert [monster["name"] for monster in result] == ["Goblin", "Wolf"]
+        assert result[0]["description"] == "ends with \\"
+        assert result[1]["description"] == 'howls "awoo'
+
+
+class TestExtractJsonFromResponse:
+    """Tests for extract_json_from_response function"""
+
+    def test_extracts_balanced_object_after_prefix(self):
+        """Test that braces inside strings and after the object are ignored"""
+        response = 'Here you go: {"a": "}"} Let me know {if} you need more.'
+        assert extract_json_from_response(response) == '{"a": "}"}'
+
+    def test_extracts_from_json_code_block(self):
+        """Test extraction from a ```json fenced block"""
+        response = 'Sure!\n```json\n{"a": 1}\n```\nEnjoy.'
+        assert extract_json_from_response(response) == '{"a": 1}'
+
+    def test_bare_json_is_returned_whole(self):
+        """Test that bare JSON is returned as is, even if a string value contains a fence"""
+        response = '  {"code": "```json\\n{}\\n```"}\n'
+        assert extract_json_from_response(response) == '{"code": "```json\\n{}\\n```"}'
+
+
+class TestFixIncompleteJson:
+    """Tests for fix_incomplete_json function"""
+
+    def test_closes_truncated_nesting_in_order(self):
+        """Test that open strings, arrays and objects are closed innermost first"""
+        fixed = fix_incomplete_json('{"monsters": [{"name": "Orc"}, {"name": "Gob')
+        assert json.loads(fixed) == {"monsters": [{"name": "Orc"}, {"name": "Gob"}]}
+
+    def test_removes_trailing_commas_outside_strings(self):
+        """Test that trailing commas are dropped but commas inside strings are kept"""
+        fixed = fix_incomplete_json('{"a": [1, 2,], "b": "x,]",}')
+        assert json.loads(fixed) == {"a": [1, 2], "b": "x,]"}
+
+    def test_key_without_value_gets_null(self):
+        """Test that a key cut off before its value is completed with null"""
+        assert json.loads(fix_incomplete_json('{"a": "x", "b":')) == {"a": "x", "b": None}
+
+    def test_valid_json_is_unchanged(self):
+        """Test that valid JSON passes through untouched"""
+        assert fix_incomplete_json('{"a": [1, {"b": null}]}') == '{"a": [1, {"b": null}]}'
+
+
+class TestSanitizeJsonString:
+    """Tests for sanitize_json_string function"""
+
+    def test_escapes_control_chars_inside_strings(self):
+        """Test that raw control characters in values are escaped so strict parsers accept them"""
+        result = sanitize_json_string('{\n  "desc": "line one\nline\ttwo\x01"\n}')
+        assert result == '{\n  "desc": "line one\\nline\\ttwo\\u0001"\n}'
+        assert json.loads(result) == {"desc": "line one\nline\ttwo\x01"}
+
+    def test_leaves_escaped_quotes_intact(self):
+        """Test that escaped quotes do not end the string early"""
+        result = sanitize_json_string('{"desc": "say \\"hi\\"\n"}')
+        assert json.loads(result) == {"desc": 'say "hi"\n'}
+
+
+class TestLoadPlayerCharacter:
+    """Tests for load_player_character function"""
+
+    def test_loads_from_json_string(self):
+        """Test that in-memory JSON is used without reading the file"""
+        character = load_player_character('{"name": "Aria", "level": 3}')
+        assert character["name"] == "Aria"
+        assert character["level"] == 3
+
+    def test_keeps_fields_outside_the_record(self):
+        """Test that a character sheet with extra fields loads and behaves like a dict"""
+        character = load_player_character(
+            '{"name": "Aria", "class": "Wizard", "hit_points": 12, "level": 3}'
+        )
+        assert character["class"] == "Wizard"
+        assert dict(character) == {"name": "Aria", "level": 3, "class": "Wizard", "hit_points": 12}
+        character.update(level=4)
+        assert character.setdefault("inventory", []) == []
+        assert json.loads(json.dumps(character.to_dict()))["level"] == 4
+        assert {**character}["hit_points"] == 12
+
+    def test_reuses_file_until_modified(self, tmp_path, monkeypatch):
+        """Test that the file is cached by modification time and each call gets a fresh copy"""
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "player_character.json"
+        path.write_text('{"name": "Aria", "level": 3}')
+        first_mtime = path.stat().st_mtime_ns
+
+        first = load_player_character()
+        first["level"] = 10
+        first["inventory"] = ["Rope"]
+        path.write_text("not json")
+        os.utime(path, ns=(path.stat().st_atime_ns, first_mtime))
+        second = load_player_character()
+        assert second is not first
+        assert second["level"] == 3
+        assert "inventory" not in second
+
+        path.write_text('{"name": "Aria", "level": 4}')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        assert load_player_character()["level"] == 4
+
 
 class TestDiceRoll:
     """Tests for dice_roll function"""
@@ -122,6 +317,44 @@ class TestDiceRoll:
         # Should have most or all values from 1-6
         assert len(results) >= 5  # Allow for slight statistical variance
 
+    def test_dice_roll_many_in_range(self):
+        """Test that batched rolls return one in-range result per die"""
+        results = dice_roll_many(8, 200)
+        assert len(results) == 200
+        assert all(1 <= result <= 8 for result in results)
+        assert len(dice_roll_many(8, 0)) == 0
+
+    def test_dice_roll_total_in_range(self):
+        """Test that summed rolls stay within bounds for small and batched counts"""
+        for count in (0, 1, 2, 40, 500):
+            for _ in range(20):
+                total = dice_roll_total(6, count)
+                assert isinstance(total, int)
+                assert count <= total <= 6 * count
+
+    def test_dice_without_sides_are_rejected(self):
+        """Test that a die with no sides raises ValueError instead of rolling"""
+        for dice_type in (0, -3):
+            with pytest.raises(ValueError):
+                dice_roll(dice_type)
+            with pytest.raises(ValueError):
+                dice_roll_total(dice_type, 2)
+            with pytest.raises(ValueError):
+                dice_roll_total(dice_type, 40)
+
+
+class TestParseDice:
+    """Tests for parse_dice function"""
+
+    def test_parse_dice_counts_and_sides(self):
+        """Test that dice strings split into count and sides"""
+        assert parse_dice("2d6") == (2, 6)
+        assert parse_dice("1D8") == (1, 8)
+
+    def test_parse_dice_single_die(self):
+        """Test that a missing count means one die"""
+        assert parse_dice("d20") == (1, 20)
+
 
 class TestParseQuestsResult:
     """Tests for parse_quests_result function"""
@@ -136,6 +369,11 @@ class TestParseQuestsResult:
         assert "objectives" in quests[0]
         assert len(quests[0]["objectives"]) == 3
 
+    def test_parse_raw_bytes_response(self, sample_quests_response):
+        """Test that a raw bytes response parses the same as the decoded text"""
+        quests = parse_quests_result(sample_quests_response.encode("utf-8"))
+        assert quests == parse_quests_result(sample_quests_response)
+
     def test_parse_invalid_json_returns_empty_list(self, invalid_json_response):
         """Test that invalid JSON returns empty list"""
         quests = parse_quests_result(invalid_json_response)
@@ -153,6 +391,83 @@ class TestParseQuestsResult:
         quests = parse_quests_result(response)
         assert quests == []
 
+    def test_parse_short_keys_expand_to_full_names(self):
+        """Test that the short keys requested by the quest prompt map back to full names"""
+        response = '{"quests": [{"type": "Combat", "name": "Clear the Crypt", "npcs": ["Mira"]}]}'
+        quests = parse_quests_result(response)
+        assert quests == [
+            {"quest_type": "Combat", "quest_name": "Clear the Crypt", "key_npcs": ["Mira"]}
+        ]
+
+    def test_parse_interns_enumerated_fields(self):
+        """Test that short enumerated fields share one string object across quests"""
+        response = '{"quests": [{"quest_type": "Combat"}, {"quest_type": "Combat"}]}'
+        quests = parse_quests_result(response)
+        assert quests[0]["quest_type"] is quests[1]["quest_type"]
+
+    def test_parse_rag_quests_coerces_act_number(self):
+        """Test that RAG quests validate and keep only the fields the LLM returned"""
+        response = '{"quests": [{"act": "2", "quest_title": "Into the Dark"}]}'
+        quests = parse_quests_result(response)
+        assert quests == [{"act": 2, "quest_title": "Into the Dark"}]
+
+    def test_parse_coerces_loose_field_types(self):
+        """Test that lists, numbers and "Act N" strings are coerced instead of rejected"""
+        response = (
+            '{"quests": [{"name": "Crypt", "outcomes": ["a", "b"], "difficulty": 3, '
+            '"act": "Act II", "objectives": "Find the key"}]}'
+        )
+        quests = parse_quests_result(response)
+        assert quests == [
+            {
+                "quest_name": "Crypt",
+                "outcomes": "a, b",
+                "difficulty": "3",
+                "act": 2,
+                "objectives": ["Find the key"],
+            }
+        ]
+
+    def test_parse_skips_only_invalid_quests(self):
+        """Test that one invalid quest is skipped and its problem reported"""
+        response = '{"quests": [{"name": "Crypt"}, {"name": {"nested": true}}, "oops"]}'
+        errors = []
+        quests = parse_quests_result(response, errors)
+        assert quests == [{"quest_name": "Crypt"}]
+        assert len(errors) == 2
+        assert errors[0].startswith("quest 2, field name:")
+
+
+class TestGetXpValue:
+    """Tests for get_xp_value function"""
+
+    def test_fractional_and_whole_ratings(self):
+        """Test XP lookups across the fractional and whole challenge ratings"""
+        assert get_xp_value("0") == 0
+        assert get_xp_value("1/4") == 50
+        assert get_xp_value("1") == 200
+        assert get_xp_value("30") == 155000
+
+    def test_unknown_ratings_are_worth_nothing(self):
+        """Test that ratings outside the table give 0 XP"""
+        for cr in ("31", "-1", "07", "1/3", "", "high"):
+            assert get_xp_value(cr) == 0
+
+
+class TestCalculateEncounterDifficulty:
+    """Tests for calculate_encounter_difficulty function"""
+
+    def test_band_upper_bounds_are_inclusive(self):
+        """Test that an adjusted CR equal to a band's bound stays in that band"""
+        assert calculate_encounter_difficulty([{"challenge_rating": "2"}], 4, 4) == "Easy"
+        assert calculate_encounter_difficulty([{"challenge_rating": "3"}], 4, 4) == "Medium"
+        assert calculate_encounter_difficulty([{"challenge_rating": "5"}], 4, 4) == "Hard"
+        assert calculate_encounter_difficulty([{"challenge_rating": "6"}], 4, 4) == "Deadly"
+
+    def test_empty_encounter_at_level_zero(self):
+        """Test that a level 0 party does not divide by zero"""
+        assert calculate_encounter_difficulty([], 0, 4) == "Easy"
+
 
 class TestGetTotalTokens:
     """Tests for get_total_tokens function"""
@@ -186,3 +501,56 @@ class TestGetTotalTokens:
         resp = {}
         tokens = get_total_tokens(resp)
         assert tokens is None
+
+    def test_get_tokens_falls_back_to_next_usage_source(self):
+        """Test that a usage source without a total does not hide a later one"""
+        resp = {"usage_metadata": {"input_tokens": 10}, "usage": {"total_tokens": 42}}
+        assert get_total_tokens(resp) == 42
+
+
+class TestGetCachedTokens:
+    """Tests for get_cached_tokens function"""
+
+    def test_get_cached_tokens_from_usage_metadata(self):
+        """Test extracting cache reads from LangChain-style usage_metadata"""
+        resp = {"usage_metadata": {"input_token_details": {"cache_read": 1024}}}
+        assert get_cached_tokens(resp) == 1024
+
+    def test_get_cached_tokens_from_openai_usage(self):
+        """Test extracting cached tokens from raw OpenAI-style usage"""
+        resp = {"usage": {"prompt_tokens_details": {"cached_tokens": 512}}}
+        assert get_cached_tokens(resp) == 512
+
+    def test_get_cached_tokens_returns_none_for_missing_data(self):
+        """Test that missing cache data returns None"""
+        assert get_cached_tokens({"usage_metadata": {"total_tokens": 150}}) is None
+        assert get_cached_tokens({}) is None
+
+
+class TestIterJsonArrayItems:
+    """Tests for iter_json_array_items function"""
+
+    def test_yields_items_across_chunk_boundaries(self):
+        """Test that objects split across chunks are yielded once complete"""
+        chunks = [
+            '{"title": "T", "ac',
+            'ts": [{"act_title": "A", "n',
+            'otes": ["x}"]}, ',
+            '{"act_title": "B"}',
+            "]}",
+        ]
+        items = list(iter_json_array_items(chunks, "acts"))
+        assert items == [{"act_title": "A", "notes": ["x}"]}, {"act_title": "B"}]
+
+    def test_yields_first_item_before_stream_ends(self):
+        """Test that an item is available before later chunks are consumed"""
+
+        def chunks():
+            yield '{"acts": [{"act_title": "A"},'
+            raise AssertionError("stream consumed past the first item")
+
+        assert next(iter_json_array_items(chunks(), "acts")) == {"act_title": "A"}
+
+    def test_missing_key_yields_nothing(self):
+        """Test that a response without the array yields no items"""
+        assert list(iter_json_array_items(['{"title": "T"}'], "acts")) == []
@@ -0,0 +1,196 @@
+"""
+Unit tests for services/trajectory.py
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from services.trajectory import TrajectoryLogger
+
+SAMPLE_MONSTER = {
+    "name": "Goblin",
+    "size": "Small",
+    "type": "humanoid",
+    "challenge_rating": "1/4",
+    "hit_points": 7,
+    "armor_class": 15,
+}
+
+
+class TestTrajectoryLogger:
+    """Tests for TrajectoryLogger"""
+
+    def test_entries_are_written_in_order(self, tmp_path):
+        """Test that the header, generation entries and summary all reach the log file"""
+        logger = TrajectoryLogger(str(tmp_path))
+        logger.log_monster_generation(
+            quest_name="Goblin Ambush",
+            quest_data={"quest_type": "Combat", "difficulty": "Easy"},
+            response_content='{"monsters": []}',
+            monsters=[SAMPLE_MONSTER],
+            success=True,
+            tokens_used=120,
+            time_taken=1.5,
+        )
+        logger.log_monster_generation(
+            quest_name="Wolf Den",
+            quest_data={},
+            response_content="x" * 2500,
+            monsters=[],
+            success=False,
+            error="Empty response",
+        )
+        logger.log_campaign_summary("Test Campaign", 1, 2, 1, {"Goblin Ambush": [SAMPLE_MONSTER]})
+        logger.close()
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        assert log.startswith("=== AgenticTableTop Generation Trajectory ===\n")
+        assert "Quest: Goblin Ambush\nQuest Type: Combat\nDifficulty: Easy\nSuccess: True\n" in log
+        assert "    Type: Small humanoid\n    CR: 1/4\n    HP: 7\n    AC: 15\n" in log
+        assert "Error: Empty response\n" in log
+        assert "... (truncated, 2500 total chars)" in log
+        assert log.index("Goblin Ambush") < log.index("Wolf Den") < log.index("CAMPAIGN SUMMARY")
+        assert '"name": "Goblin"' in log
+
+    def test_summary_is_on_disk_before_close(self, tmp_path):
+        """Test that logging the campaign summary flushes everything queued before it"""
+        logger = TrajectoryLogger(str(tmp_path))
+        for i in range(50):
+            logger.log_monster_generation(f"Quest {i}", {}, "{}", [SAMPLE_MONSTER], True)
+        logger.log_campaign_summary("Test Campaign", 1, 50, 50, {})
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        logger.close()
+        assert log.count("MONSTER GENERATION") == 50
+        assert log.rstrip().endswith("{}")
+
+    def test_disabled_logger_writes_only_the_header(self, tmp_path):
+        """Test that log calls are no-ops while the logger is disabled"""
+        logger = TrajectoryLogger(str(tmp_path), enabled=False)
+        logger.log_monster_generation("Goblin Ambush", {}, "{}", [SAMPLE_MONSTER], True)
+        logger.log_campaign_summary("Test Campaign", 1, 1, 1, {})
+        logger.close()
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        assert "Goblin Ambush" not in log
+        assert "CAMPAIGN SUMMARY" not in log
+
+    def test_json_dump_and_short_responses_can_be_skipped(self, tmp_path):
+        """Test that dump_json and min_chars_response leave their blocks out"""
+        logger = TrajectoryLogger(str(tmp_path), dump_json=False, min_chars_response=10)
+        logger.log_monster_generation("Goblin Ambush", {}, "{}", [SAMPLE_MONSTER], True)
+        logger.close()
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        assert "Name: Goblin" in log
+        assert "Raw Response" not in log
+        assert "Parsed Monster Data" not in log
+
+    def test_jsonl_format_writes_one_record_per_event(self, tmp_path):
+        """Test that the jsonl format logs each event as one parseable JSON line"""
+        logger = TrajectoryLogger(str(tmp_path), log_format="jsonl")
+        logger.log_monster_generation("Goblin Ambush", {"quest_type": "Combat"}, "{}", [], False)
+        logger.log_campaign_summary("Test Campaign", 1, 1, 1, {"Goblin Ambush": [SAMPLE_MONSTER]})
+        logger.close()
+
+        assert logger.get_log_path().endswith(".jsonl")
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [record["event"] for record in records] == [
+            "session_start",
+            "monster_generation",
+            "campaign_summary",
+        ]
+        assert records[1]["quest_type"] == "Combat"
+        assert records[1]["success"] is False
+        assert records[2]["monsters_by_quest"] == {"Goblin Ambush": [SAMPLE_MONSTER]}
+
+    def test_unknown_format_is_rejected(self, tmp_path):
+        """Test that an unsupported log format raises ValueError"""
+        with pytest.raises(ValueError):
+            TrajectoryLogger(str(tmp_path), log_format="msgpack")
+
+    def test_entries_reach_disk_without_explicit_flush(self, tmp_path):
+        """Test that the writer flushes entries on its own shortly after they are logged"""
+        logger = TrajectoryLogger(str(tmp_path))
+        logger.log_monster_generation("Goblin Ambush", {}, "{}", [SAMPLE_MONSTER], True)
+
+        deadline = time.monotonic() + 5
+        log = ""
+        while "Goblin Ambush" not in log and time.monotonic() < deadline:
+            time.sleep(0.05)
+            with open(logger.get_log_path(), encoding="utf-8") as f:
+                log = f.read()
+        logger.close()
+        assert "Goblin Ambush" in log
+
+    def test_in_memory_logger_keeps_recent_entries(self, tmp_path):
+        """Test that an in-memory logger writes no file and dumps only its newest entries"""
+        logger = TrajectoryLogger(str(tmp_path / "unused"), in_memory=True, in_memory_capacity=2)
+        for name in ("First", "Second", "Third"):
+            logger.log_monster_generation(name, {}, "{}", [SAMPLE_MONSTER], True)
+        logger.close()
+        assert not (tmp_path / "unused").exists()
+
+        dump_path = tmp_path / "dump.log"
+        logger.dump_to_disk(str(dump_path))
+        log = dump_path.read_text(encoding="utf-8")
+        assert log.startswith("=== AgenticTableTop Generation Trajectory ===\n")
+        assert "Quest: First" not in log
+        assert "Quest: Second" in log and "Quest: Third" in log
+
+    def test_repeated_response_is_not_dumped_again(self, tmp_path):
+        """Test that a response identical to the previous entry's is logged as a back-reference"""
+        logger = TrajectoryLogger(str(tmp_path))
+        response = '{"monsters": [' + "x" * 100
+        for name in ("First try", "Retry", "Third try"):
+            logger.log_monster_generation(name, {}, response, [], False, error="Parse error")
+        logger.log_monster_generation("Other quest", {}, "{}", [], False, error="Parse error")
+        logger.close()
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        assert log.count(response) == 1
+        assert log.count("(response identical to previous entry)") == 2
+        assert "chars) ---\n{}\n" in log
+
+    def test_context_manager_releases_thread_and_file(self, tmp_path):
+        """Test that leaving the with block stops the writer thread and closes the file"""
+        with TrajectoryLogger(str(tmp_path)) as logger:
+            logger.log_monster_generation("Goblin Ambush", {}, "{}", [SAMPLE_MONSTER], True)
+        assert logger._fd is None
+        assert not any(thread.name == "trajectory-writer" for thread in threading.enumerate())
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            assert "Goblin Ambush" in f.read()
+
+    def test_writer_survives_a_failed_write(self, tmp_path, capsys):
+        """Test that a failed write is reported and later entries are still written"""
+        logger = TrajectoryLogger(str(tmp_path))
+        write_out = logger._write_out
+
+        def fail(data):
+            raise OSError(28, "No space left on device")
+
+        logger._write_out = fail
+        logger.log_monster_generation("Lost Quest", {}, "{}", [SAMPLE_MONSTER], True)
+        logger.flush()
+        assert "No space left on device" in capsys.readouterr().out
+
+        logger._write_out = write_out
+        logger.log_monster_generation("Goblin Ambush", {}, "{}", [SAMPLE_MONSTER], True)
+        logger.flush()
+        assert logger._writer.is_alive()
+        logger.close()
+        logger.log_monster_generation("After Close", {}, "{}", [], False)
+
+        with open(logger.get_log_path(), encoding="utf-8") as f:
+            log = f.read()
+        assert "Lost Quest" not in log
+        assert "Goblin Ambush" in log